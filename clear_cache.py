@@ -1,4 +1,5 @@
 import os
+import sys
 import logging
 from pathlib import Path
 
@@ -6,6 +7,47 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _delete_batch_windows(paths):
+    """
+    Deletes all the given files with a single IFileOperation batch (Windows only).
+    
+    Args:
+        paths (list): List of Path objects to delete
+        
+    Returns:
+        bool: True if the batch was submitted, False if pywin32 is unavailable
+    """
+    try:
+        import pythoncom
+        from win32com.shell import shell, shellcon
+    except ImportError:
+        return False
+    
+    pythoncom.CoInitialize()
+    try:
+        op = pythoncom.CoCreateInstance(
+            shell.CLSID_FileOperation, None, pythoncom.CLSCTX_ALL, shell.IID_IFileOperation
+        )
+        op.SetOperationFlags(shellcon.FOF_NO_UI)
+        
+        queued = 0
+        for file_path in paths:
+            if not file_path.exists():
+                logger.info(f"File not found, skipping: {file_path}")
+                continue
+            item = shell.SHCreateItemFromParsingName(str(file_path), None, shell.IID_IShellItem)
+            op.DeleteItem(item, None)
+            queued += 1
+        
+        # A single PerformOperations call for the whole batch
+        if queued:
+            op.PerformOperations()
+        logger.info(f"Deleted {queued} files in a single batch")
+    finally:
+        pythoncom.CoUninitialize()
+    
+    return True
+
 def clear_cache(data_dir):
     """
     Deletes cached files in the specified directory while preserving the source data file.
@@ -15,6 +57,9 @@ def clear_cache(data_dir):
     """
     # Define files to delete
     files_to_delete = [
+        "bitcoin_procesado.parquet",
+        "bitcoin_discretizado.parquet",
+        ".procesado.key",
         "bitcoin_procesado.csv",
         "bitcoin_discretizado.csv",
         "modelo_clustering.pkl",
@@ -29,16 +74,22 @@ def clear_cache(data_dir):
         logger.error(f"Directory does not exist: {data_path}")
         return
     
-    # Iterate through files to delete
-    for file_name in files_to_delete:
-        file_path = data_path / file_name
+    paths = [data_path / file_name for file_name in files_to_delete]
+    
+    if sys.platform == 'win32':
         try:
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"Deleted: {file_path}")
-            else:
-                logger.info(f"File not found, skipping: {file_path}")
+            if _delete_batch_windows(paths):
+                return
         except Exception as e:
+            logger.error(f"Batch delete failed, falling back to per-file delete: {str(e)}")
+    
+    # Iterate through files to delete
+    for file_path in paths:
+        try:
+            # EAFP: unlink directly instead of stat-ing first
+            file_path.unlink(missing_ok=True)
+            logger.info(f"Deleted or absent: {file_path}")
+        except OSError as e:
             logger.error(f"Error deleting {file_path}: {str(e)}")
 
 if __name__ == "__main__":
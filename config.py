@@ -8,24 +8,39 @@ API_URL = "https://basescan.org/api"
 API_RATE_LIMIT = 5  # Solicitudes por segundo (ajustar segun documentacion de Basescan)
 
 # Rutas de archivos y directorios
-import os
+from pathlib import Path
 
-# Obtenemos la ruta base del proyecto
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATOS_DIR = os.path.join(BASE_DIR, "datos")
-LOGS_DIR = os.path.join(BASE_DIR, "logs")
+# Obtenemos la ruta base del proyecto (se calcula una sola vez al importar)
+BASE_DIR = Path(__file__).resolve().parent
+DATOS_DIR = BASE_DIR / "datos"
+LOGS_DIR = BASE_DIR / "logs"
 
-# Asegurarse que existen los directorios
-os.makedirs(DATOS_DIR, exist_ok=True)
-os.makedirs(LOGS_DIR, exist_ok=True)
+# Asegurarse que existen los directorios (sin tocar el disco si ya existen)
+for _directorio in (DATOS_DIR, LOGS_DIR):
+    if not _directorio.is_dir():
+        _directorio.mkdir(parents=True, exist_ok=True)
 
 # Archivos de datos
-DATOS_CRUDOS = os.path.join(DATOS_DIR, "bitcoin_raw.csv")
-DATOS_PROCESADOS = os.path.join(DATOS_DIR, "bitcoin_procesado.csv")
-DATOS_DISCRETIZADOS = os.path.join(DATOS_DIR, "bitcoin_discretizado.csv")
-MODELO_CLUSTERING = os.path.join(DATOS_DIR, "modelo_clustering.pkl")
-MODELO_ANOMALIAS = os.path.join(DATOS_DIR, "modelo_anomalias.pkl")
-REGLAS_ASOCIACION = os.path.join(DATOS_DIR, "reglas_asociacion.csv")
+DATOS_CRUDOS = DATOS_DIR / "bitcoin_raw.parquet"
+DATOS_PROCESADOS = DATOS_DIR / "bitcoin_procesado.parquet"
+DATOS_DISCRETIZADOS = DATOS_DIR / "bitcoin_discretizado.parquet"
+MODELO_CLUSTERING = DATOS_DIR / "modelo_clustering.pkl"
+MODELO_ANOMALIAS = DATOS_DIR / "modelo_anomalias.pkl"
+REGLAS_ASOCIACION = DATOS_DIR / "reglas_asociacion.csv"
+REPORTE_JSON = DATOS_DIR / "reporte_resultados.json"
+
+# Cache del preprocesamiento indexada por el hash de los datos crudos: los archivos
+# procesados ya son Parquet, así que la cache son los mismos archivos más la clave
+CACHE_PROCESADO = DATOS_PROCESADOS
+CACHE_DISCRETIZADO = DATOS_DISCRETIZADOS
+CACHE_PROCESADO_CLAVE = DATOS_DIR / ".procesado.key"
+
+# Cache en disco de las paginas de klines (las velas cerradas no cambian)
+CACHE_KLINES_DIR = BASE_DIR / ".cache" / "klines"
+CACHE_KLINES_TTL_DIAS = 30
+
+# Cache en disco de las respuestas de la API en el extractor mejorado
+CACHE_BASESCAN_DIR = BASE_DIR / ".cache" / "basescan"
 
 # Parametros de los modelos
 PARAMETROS = {
@@ -36,11 +51,13 @@ PARAMETROS = {
     # Parametros para clustering
     "clustering_num_clusters": 4,
     "clustering_random_state": 42,
+    "silhouette_sample": 5000,  # Maximo de filas para el coeficiente de silueta
     
     # Parametros para random forest
     "rf_num_arboles": 100,
     "rf_max_depth": 10,
     "rf_random_state": 42,
+    "rf_compilar_treelite": False,  # Compilar el bosque con Treelite al guardarlo (requiere compilador de C)
     
     # Parametros para reglas de asociacion
     "reglas_soporte_min": 0.1,
@@ -64,7 +81,7 @@ PARAMETROS = {
 import logging
 
 # Configuracion de logging
-LOG_FILE = os.path.join(LOGS_DIR, "mineria_trading.log")
+LOG_FILE = LOGS_DIR / "mineria_trading.log"
 LOG_LEVEL = logging.INFO
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
@@ -88,9 +105,31 @@ GUI_CONFIG = {
 
 # Fechas para la extraccion de datos
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def get_fecha_fin():
+    """Fecha final de extraccion (se calcula al primer uso, no al importar)"""
+    return datetime.now()
 
-FECHA_FIN = datetime.now()
-FECHA_INICIO = FECHA_FIN - timedelta(days=365*5)  # 5 años de datos
+def get_fecha_inicio():
+    """Fecha inicial de extraccion: 5 años antes de la fecha final"""
+    return get_fecha_fin() - timedelta(days=365*5)
+
+@lru_cache(maxsize=1)
+def get_fecha_fin_ts():
+    """Fecha final de extraccion como timestamp UNIX (segundos)"""
+    return int(get_fecha_fin().timestamp())
+
+def get_fecha_inicio_ts():
+    """Fecha inicial de extraccion como timestamp UNIX (segundos)"""
+    return get_fecha_fin_ts() - 5 * 365 * 86400
 
 # Modo debug (para desarrollo)
-DEBUG = True
\ No newline at end of file
+DEBUG = True
+
+# Congelar diccionarios de configuracion (solo lectura, forma estable)
+import types
+
+PARAMETROS = types.MappingProxyType(PARAMETROS)
+GUI_CONFIG = types.MappingProxyType(GUI_CONFIG)
@@ -6,7 +6,9 @@ import sys
 import os
 
 # Añadir el directorio raiz al path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 # Intentar importaciones
 try:
@@ -24,25 +26,23 @@ try:
         print("Primeras 100 caracteres:")
         print(content[:100])
     
-    # Intentar diagnosticar el problema
+    # Intentar diagnosticar el problema sin ejecutar el módulo
     import ast
     try:
-        ast.parse(content)
+        tree = ast.parse(content)
         print("El archivo es Python válido!")
-    except SyntaxError as e:
-        print(f"Error de sintaxis en línea {e.lineno}, columna {e.offset}: {e.text}")
         
-    # Intentar ejecutar el código manualmente
-    namespace = {}
-    try:
-        exec(content, namespace)
-        print("Ejecutado correctamente")
-        if "ModeloAnomalias" in namespace:
+        # Buscar la definición de la clase en el AST
+        definida = any(
+            isinstance(nodo, ast.ClassDef) and nodo.name == "ModeloAnomalias"
+            for nodo in ast.walk(tree)
+        )
+        if definida:
             print("La clase ModeloAnomalias está definida correctamente!")
         else:
-            print("Error: ModeloAnomalias no está definida en el espacio de nombres")
-    except Exception as e:
-        print(f"Error al ejecutar: {str(e)}")
+            print("Error: ModeloAnomalias no está definida en el archivo")
+    except SyntaxError as e:
+        print(f"Error de sintaxis en línea {e.lineno}, columna {e.offset}: {e.text}")
         
 except Exception as e:
     print(f"Error al leer archivos: {str(e)}")
@@ -5,40 +5,51 @@ Este script orquesta la ejecucion de todos los modulos del proyecto
 
 import os
 import sys
+import atexit
 import logging
+import logging.handlers
 import argparse
+import functools
 from datetime import datetime
 
 # Añadir el directorio raíz al path para importar módulos
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 # Importar configuración
 import config
 
-# Configurar logging
+# Configurar logging (una sola vez por proceso)
+@functools.lru_cache(maxsize=1)
 def configurar_logging():
     """Configura el sistema de logs"""
+    # El archivo se escribe por lotes: los registros se acumulan en memoria y
+    # solo los ERROR (o el buffer lleno, o el cierre) fuerzan la escritura
+    file_handler = logging.FileHandler(config.LOG_FILE, delay=True)
+    file_handler.setFormatter(logging.Formatter(config.LOG_FORMAT))
+    memory_handler = logging.handlers.MemoryHandler(
+        1024, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+    )
+    atexit.register(memory_handler.flush)
+    
     logging.basicConfig(
         level=config.LOG_LEVEL,
         format=config.LOG_FORMAT,
         handlers=[
-            logging.FileHandler(config.LOG_FILE),
+            memory_handler,
             logging.StreamHandler()
         ]
     )
     return logging.getLogger(__name__)
 
-# Importar módulos del proyecto
-from src.extraccion_datos.extractor import Extractor
-from src.preprocesamiento.preprocesador import Preprocesador
-from src.modelos.clustering import ModeloClustering
-from src.modelos.anomalias import ModeloAnomalias
-from src.modelos.reglas_asociacion import MineroReglas
-from src.evaluacion.evaluador import Evaluador
-from src.interfaz.gui import iniciar_interfaz
+def iniciar_interfaz(datos=None):
+    """Inicia la interfaz gráfica importando tkinter/matplotlib solo cuando se pide"""
+    from src.interfaz.gui import iniciar_interfaz as _iniciar_interfaz
+    return _iniciar_interfaz(datos)
 
-def procesar_argumentos():
-    """Procesa los argumentos de línea de comandos"""
+def _crear_parser():
+    """Construye el parser de argumentos de línea de comandos"""
     parser = argparse.ArgumentParser(description="Sistema de Mineria de Datos para Trading de Criptomonedas")
     parser.add_argument('--modo', choices=['completo', 'extraccion', 'preprocesamiento', 'modelado', 'evaluacion', 'interfaz'], 
                       default='completo', help='Modo de ejecución')
@@ -47,62 +58,63 @@ def procesar_argumentos():
     parser.add_argument('--debug', action='store_true', 
                       help='Ejecutar en modo debug (más información en los logs)')
     
-    return parser.parse_args()
+    return parser
+
+# El parser no cambia entre llamadas: se construye una sola vez por proceso
+_PARSER = _crear_parser()
+
+def procesar_argumentos():
+    """Procesa los argumentos de línea de comandos"""
+    return _PARSER.parse_args()
+
+def formatear_resultados(resultados):
+    """Formatea los resultados de evaluación en un solo texto (una línea por modelo)"""
+    return "\n".join(
+        f"{modelo}: " + ", ".join(f"{metrica}={valor}" for metrica, valor in metricas.items())
+        for modelo, metricas in resultados.items()
+    )
 
 def ejecutar_flujo_completo(args, logger):
     """Ejecuta el flujo completo del proceso de minería de datos"""
+    # Importaciones diferidas: solo este flujo necesita sklearn/mlxtend
+    from src.extraccion_datos.extractor import Extractor
+    from src.preprocesamiento.preprocesador import Preprocesador
+    from src.evaluacion.evaluador import Evaluador
+    from src.pipeline.modeling import run_modeling_stages
+    from src.pipeline.preprocessing import preprocesar_con_cache
+    
     logger.info("Iniciando ejecución del flujo completo")
     
     # 1. Extracción de datos
-    extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT)
+    extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT,
+                          cache_dir=config.CACHE_KLINES_DIR, cache_ttl_dias=config.CACHE_KLINES_TTL_DIAS)
     
-    if args.forzar_extraccion or not os.path.exists(config.DATOS_CRUDOS):
+    def _extraer():
         logger.info("Extrayendo datos de la API...")
-        df_raw = extractor.extraer_datos_historicos(config.FECHA_INICIO, config.FECHA_FIN)
-        extractor.guardar_datos(df_raw, config.DATOS_CRUDOS)
+        df = extractor.extraer_datos_historicos(config.get_fecha_inicio_ts(), config.get_fecha_fin_ts())
+        extractor.guardar_datos(df, config.DATOS_CRUDOS)
         logger.info(f"Datos guardados en {config.DATOS_CRUDOS}")
+        return df
+    
+    if args.forzar_extraccion:
+        df_raw = _extraer()
     else:
-        logger.info(f"Usando datos existentes de {config.DATOS_CRUDOS}")
-        df_raw = extractor.cargar_datos(config.DATOS_CRUDOS)
+        # EAFP: intentar cargar directamente y extraer solo si no existe el archivo
+        try:
+            df_raw = extractor.cargar_datos(config.DATOS_CRUDOS)
+            logger.info(f"Usando datos existentes de {config.DATOS_CRUDOS}")
+        except FileNotFoundError:
+            df_raw = _extraer()
     
     # 2. Preprocesamiento
     logger.info("Preprocesando datos...")
     preprocesador = Preprocesador(config.PARAMETROS)
-    df_procesado = preprocesador.procesar(df_raw)
-    df_discretizado = preprocesador.discretizar(df_procesado)
-    
-    preprocesador.guardar_datos(df_procesado, config.DATOS_PROCESADOS)
-    preprocesador.guardar_datos(df_discretizado, config.DATOS_DISCRETIZADOS)
-    logger.info(f"Datos procesados guardados en {config.DATOS_PROCESADOS}")
-    
-    # 3. Modelado - Clustering
-    logger.info("Aplicando clustering...")
-    modelo_clustering = ModeloClustering(
-        n_clusters=config.PARAMETROS['clustering_num_clusters'],
-        random_state=config.PARAMETROS['clustering_random_state']
-    )
-    df_clusters = modelo_clustering.entrenar_y_predecir(df_procesado)
-    modelo_clustering.guardar_modelo(config.MODELO_CLUSTERING)
+    df_procesado, df_discretizado = preprocesar_con_cache(preprocesador, df_raw)
     
-    # 4. Modelado - Detección de anomalías
-    logger.info("Entrenando detector de anomalías...")
-    modelo_anomalias = ModeloAnomalias(
-        n_estimators=config.PARAMETROS['rf_num_arboles'],
-        max_depth=config.PARAMETROS['rf_max_depth'],
-        random_state=config.PARAMETROS['rf_random_state']
+    # 3-5. Modelado: clustering, anomalías y reglas (en paralelo)
+    df_clusters, df_anomalias, reglas = run_modeling_stages(
+        df_procesado, df_discretizado, config.PARAMETROS, mejorado=False
     )
-    df_anomalias = modelo_anomalias.entrenar_y_predecir(df_procesado)
-    modelo_anomalias.guardar_modelo(config.MODELO_ANOMALIAS)
-    
-    # 5. Minería de reglas de asociación
-    logger.info("Extrayendo reglas de asociación...")
-    minero_reglas = MineroReglas(
-        soporte_min=config.PARAMETROS['reglas_soporte_min'],
-        confianza_min=config.PARAMETROS['reglas_confianza_min'],
-        lift_min=config.PARAMETROS['reglas_lift_min']
-    )
-    reglas = minero_reglas.extraer_reglas(df_discretizado)
-    minero_reglas.guardar_reglas(reglas, config.REGLAS_ASOCIACION)
     
     # 6. Evaluación
     logger.info("Evaluando modelos...")
@@ -110,10 +122,7 @@ def ejecutar_flujo_completo(args, logger):
     resultados = evaluador.evaluar_modelos(df_procesado, df_clusters, df_anomalias, reglas)
     
     # 7. Mostrar resultados por consola
-    for modelo, metricas in resultados.items():
-        logger.info(f"Resultados de {modelo}:")
-        for metrica, valor in metricas.items():
-            logger.info(f"  {metrica}: {valor}")
+    logger.info("Resultados:\n%s", formatear_resultados(resultados))
     
     return {
         'df_raw': df_raw,
@@ -128,12 +137,18 @@ def ejecutar_flujo_completo(args, logger):
 def ejecutar_modo_especifico(args, logger):
     """Ejecuta solo una parte específica del proceso"""
     if args.modo == 'extraccion':
-        extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT)
-        df_raw = extractor.extraer_datos_historicos(config.FECHA_INICIO, config.FECHA_FIN)
+        from src.extraccion_datos.extractor import Extractor
+        
+        extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT,
+                              cache_dir=config.CACHE_KLINES_DIR, cache_ttl_dias=config.CACHE_KLINES_TTL_DIAS)
+        df_raw = extractor.extraer_datos_historicos(config.get_fecha_inicio_ts(), config.get_fecha_fin_ts())
         extractor.guardar_datos(df_raw, config.DATOS_CRUDOS)
         logger.info(f"Extracción completada. Datos guardados en {config.DATOS_CRUDOS}")
         
     elif args.modo == 'preprocesamiento':
+        from src.extraccion_datos.extractor import Extractor
+        from src.preprocesamiento.preprocesador import Preprocesador
+        
         extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT)
         df_raw = extractor.cargar_datos(config.DATOS_CRUDOS)
         
@@ -146,39 +161,26 @@ def ejecutar_modo_especifico(args, logger):
         logger.info(f"Preprocesamiento completado. Datos guardados.")
         
     elif args.modo == 'modelado':
+        from src.preprocesamiento.preprocesador import Preprocesador
+        from src.pipeline.modeling import run_modeling_stages
+        
         preprocesador = Preprocesador(config.PARAMETROS)
         df_procesado = preprocesador.cargar_datos(config.DATOS_PROCESADOS)
         df_discretizado = preprocesador.cargar_datos(config.DATOS_DISCRETIZADOS)
         
-        # Clustering
-        modelo_clustering = ModeloClustering(
-            n_clusters=config.PARAMETROS['clustering_num_clusters'],
-            random_state=config.PARAMETROS['clustering_random_state']
+        df_clusters, df_anomalias, reglas = run_modeling_stages(
+            df_procesado, df_discretizado, config.PARAMETROS, mejorado=False
         )
-        df_clusters = modelo_clustering.entrenar_y_predecir(df_procesado)
-        modelo_clustering.guardar_modelo(config.MODELO_CLUSTERING)
-        
-        # Anomalías
-        modelo_anomalias = ModeloAnomalias(
-            n_estimators=config.PARAMETROS['rf_num_arboles'],
-            max_depth=config.PARAMETROS['rf_max_depth'],
-            random_state=config.PARAMETROS['rf_random_state']
-        )
-        df_anomalias = modelo_anomalias.entrenar_y_predecir(df_procesado)
-        modelo_anomalias.guardar_modelo(config.MODELO_ANOMALIAS)
-        
-        # Reglas
-        minero_reglas = MineroReglas(
-            soporte_min=config.PARAMETROS['reglas_soporte_min'],
-            confianza_min=config.PARAMETROS['reglas_confianza_min'],
-            lift_min=config.PARAMETROS['reglas_lift_min']
-        )
-        reglas = minero_reglas.extraer_reglas(df_discretizado)
-        minero_reglas.guardar_reglas(reglas, config.REGLAS_ASOCIACION)
         
         logger.info(f"Modelado completado. Modelos guardados.")
         
     elif args.modo == 'evaluacion':
+        from src.preprocesamiento.preprocesador import Preprocesador
+        from src.modelos.clustering import ModeloClustering
+        from src.modelos.anomalias import ModeloAnomalias
+        from src.modelos.reglas_asociacion import MineroReglas
+        from src.evaluacion.evaluador import Evaluador
+        
         preprocesador = Preprocesador(config.PARAMETROS)
         df_procesado = preprocesador.cargar_datos(config.DATOS_PROCESADOS)
         
@@ -196,10 +198,7 @@ def ejecutar_modo_especifico(args, logger):
         evaluador = Evaluador(config.PARAMETROS)
         resultados = evaluador.evaluar_modelos(df_procesado, df_clusters, df_anomalias, reglas)
         
-        for modelo, metricas in resultados.items():
-            logger.info(f"Resultados de {modelo}:")
-            for metrica, valor in metricas.items():
-                logger.info(f"  {metrica}: {valor}")
+        logger.info("Resultados:\n%s", formatear_resultados(resultados))
                 
     elif args.modo == 'interfaz':
         logger.info("Iniciando interfaz grafica...")
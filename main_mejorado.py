@@ -5,12 +5,23 @@ Este script orquesta la ejecucion de todos los modulos del proyecto
 
 import os
 import sys
+import json
+import atexit
 import logging
+import logging.handlers
 import argparse
+import functools
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional, se usa json estándar como respaldo
+    orjson = None
+
 # Añadir el directorio raíz al path para importar módulos
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 # Importar configuración
 import config
@@ -18,31 +29,36 @@ import config
 # Importar utilidades personalizadas para JSON
 from src.utils.json_utils import NumpyEncoder, format_eval_results
 
-# Configurar logging
+# Configurar logging (una sola vez por proceso)
+@functools.lru_cache(maxsize=1)
 def configurar_logging():
     """Configura el sistema de logs"""
+    # El archivo se escribe por lotes: los registros se acumulan en memoria y
+    # solo los ERROR (o el buffer lleno, o el cierre) fuerzan la escritura
+    file_handler = logging.FileHandler(config.LOG_FILE, delay=True)
+    file_handler.setFormatter(logging.Formatter(config.LOG_FORMAT))
+    memory_handler = logging.handlers.MemoryHandler(
+        1024, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+    )
+    atexit.register(memory_handler.flush)
+    
     logging.basicConfig(
         level=config.LOG_LEVEL,
         format=config.LOG_FORMAT,
         handlers=[
-            logging.FileHandler(config.LOG_FILE),
+            memory_handler,
             logging.StreamHandler()
         ]
     )
     return logging.getLogger(__name__)
 
-# Importar módulos del proyecto
-# Uso de módulos mejorados para corregir problemas
-from src.extraccion_datos.extractor_mejorado import Extractor
-from src.preprocesamiento.preprocesador import Preprocesador
-from src.modelos.clustering import ModeloClustering
-from src.modelos.anomalias_mejorado import ModeloAnomalias
-from src.modelos.reglas_asociacion_mejorado import MineroReglas
-from src.evaluacion.evaluador import Evaluador
-from src.interfaz.gui import iniciar_interfaz
+def iniciar_interfaz(datos=None):
+    """Inicia la interfaz gráfica importando tkinter/matplotlib solo cuando se pide"""
+    from src.interfaz.gui import iniciar_interfaz as _iniciar_interfaz
+    return _iniciar_interfaz(datos)
 
-def procesar_argumentos():
-    """Procesa los argumentos de línea de comandos"""
+def _crear_parser():
+    """Construye el parser de argumentos de línea de comandos"""
     parser = argparse.ArgumentParser(description="Sistema de Mineria de Datos para Trading de Criptomonedas")
     parser.add_argument('--modo', choices=['completo', 'extraccion', 'preprocesamiento', 'modelado', 'evaluacion', 'interfaz', 'test-api'], 
                       default='completo', help='Modo de ejecución')
@@ -52,8 +68,17 @@ def procesar_argumentos():
                       help='Ejecutar en modo debug (más información en los logs)')
     parser.add_argument('--sin-api', action='store_true',
                       help='Ejecutar sin intentar conexión a API (usar datos sintéticos)')
+    parser.add_argument('--iniciar-gui', action='store_true',
+                      help='Abrir la interfaz gráfica con los datos generados al terminar un modo específico')
     
-    return parser.parse_args()
+    return parser
+
+# El parser no cambia entre llamadas: se construye una sola vez por proceso
+_PARSER = _crear_parser()
+
+def procesar_argumentos():
+    """Procesa los argumentos de línea de comandos"""
+    return _PARSER.parse_args()
 
 def ejecutar_test_api(logger):
     """Ejecuta la prueba de conexión a la API"""
@@ -69,61 +94,69 @@ def ejecutar_test_api(logger):
     
     return {}
 
+def guardar_reporte_json(reporte, debug=False):
+    """Guarda el reporte en JSON (compacto salvo en modo debug)"""
+    if orjson is not None:
+        # orjson serializa numpy de forma nativa; NumpyEncoder queda para otros tipos
+        opciones = orjson.OPT_SERIALIZE_NUMPY
+        if debug:
+            opciones |= orjson.OPT_INDENT_2
+        config.REPORTE_JSON.write_bytes(
+            orjson.dumps(reporte, default=NumpyEncoder().default, option=opciones)
+        )
+        return
+    
+    if debug:
+        opciones = {'indent': 4}
+    else:
+        opciones = {'indent': None, 'separators': (',', ':')}
+    
+    # json.dump escribe muchos fragmentos pequeños: un buffer de 1 MiB los agrupa
+    with open(config.REPORTE_JSON, "w", encoding="utf-8", buffering=1 << 20) as f:
+        json.dump(reporte, f, cls=NumpyEncoder, **opciones)
+
 def ejecutar_flujo_completo(args, logger):
     """Ejecuta el flujo completo del proceso de minería de datos"""
+    # Importaciones diferidas: solo este flujo necesita sklearn/mlxtend
+    from src.extraccion_datos.extractor_mejorado import Extractor
+    from src.preprocesamiento.preprocesador import Preprocesador
+    from src.evaluacion.evaluador import Evaluador
+    from src.pipeline.modeling import run_modeling_stages
+    from src.pipeline.preprocessing import preprocesar_con_cache
+    
     logger.info("Iniciando ejecución del flujo completo")
     
     # 1. Extracción de datos
     api_key = None if args.sin_api else config.API_KEY
-    extractor = Extractor(api_key, config.API_URL, config.API_RATE_LIMIT)
+    extractor = Extractor(api_key, config.API_URL, config.API_RATE_LIMIT,
+                          cache_dir=config.CACHE_BASESCAN_DIR)
     
-    if args.forzar_extraccion or not os.path.exists(config.DATOS_CRUDOS):
+    def _extraer():
         logger.info("Extrayendo datos de la API...")
-        df_raw = extractor.extraer_datos_historicos(config.FECHA_INICIO, config.FECHA_FIN)
-        extractor.guardar_datos(df_raw, config.DATOS_CRUDOS)
+        df = extractor.extraer_datos_historicos(config.get_fecha_inicio_ts(), config.get_fecha_fin_ts())
+        extractor.guardar_datos(df, config.DATOS_CRUDOS)
         logger.info(f"Datos guardados en {config.DATOS_CRUDOS}")
+        return df
+    
+    if args.forzar_extraccion:
+        df_raw = _extraer()
     else:
-        logger.info(f"Usando datos existentes de {config.DATOS_CRUDOS}")
-        df_raw = extractor.cargar_datos(config.DATOS_CRUDOS)
+        # EAFP: intentar cargar directamente y extraer solo si no existe el archivo
+        try:
+            df_raw = extractor.cargar_datos(config.DATOS_CRUDOS)
+            logger.info(f"Usando datos existentes de {config.DATOS_CRUDOS}")
+        except FileNotFoundError:
+            df_raw = _extraer()
     
     # 2. Preprocesamiento
     logger.info("Preprocesando datos...")
     preprocesador = Preprocesador(config.PARAMETROS)
-    df_procesado = preprocesador.procesar(df_raw)
-    df_discretizado = preprocesador.discretizar(df_procesado)
-    
-    preprocesador.guardar_datos(df_procesado, config.DATOS_PROCESADOS)
-    preprocesador.guardar_datos(df_discretizado, config.DATOS_DISCRETIZADOS)
-    logger.info(f"Datos procesados guardados en {config.DATOS_PROCESADOS}")
-    
-    # 3. Modelado - Clustering
-    logger.info("Aplicando clustering...")
-    modelo_clustering = ModeloClustering(
-        n_clusters=config.PARAMETROS['clustering_num_clusters'],
-        random_state=config.PARAMETROS['clustering_random_state']
-    )
-    df_clusters = modelo_clustering.entrenar_y_predecir(df_procesado)
-    modelo_clustering.guardar_modelo(config.MODELO_CLUSTERING)
-    
-    # 4. Modelado - Detección de anomalías
-    logger.info("Entrenando detector de anomalías...")
-    modelo_anomalias = ModeloAnomalias(
-        n_estimators=config.PARAMETROS['rf_num_arboles'],
-        max_depth=config.PARAMETROS['rf_max_depth'],
-        random_state=config.PARAMETROS['rf_random_state']
-    )
-    df_anomalias = modelo_anomalias.entrenar_y_predecir(df_procesado)
-    modelo_anomalias.guardar_modelo(config.MODELO_ANOMALIAS)
+    df_procesado, df_discretizado = preprocesar_con_cache(preprocesador, df_raw)
     
-    # 5. Minería de reglas de asociación
-    logger.info("Extrayendo reglas de asociación...")
-    minero_reglas = MineroReglas(
-        soporte_min=config.PARAMETROS['reglas_soporte_min'],
-        confianza_min=config.PARAMETROS['reglas_confianza_min'],
-        lift_min=config.PARAMETROS['reglas_lift_min']
+    # 3-5. Modelado: clustering, anomalías y reglas (en paralelo)
+    df_clusters, df_anomalias, reglas = run_modeling_stages(
+        df_procesado, df_discretizado, config.PARAMETROS, mejorado=True
     )
-    reglas = minero_reglas.extraer_reglas(df_discretizado)
-    minero_reglas.guardar_reglas(reglas, config.REGLAS_ASOCIACION)
     
     # 6. Evaluación
     logger.info("Evaluando modelos...")
@@ -135,10 +168,7 @@ def ejecutar_flujo_completo(args, logger):
         reporte = evaluador.generar_reporte(resultados)
         
         # Guardar reporte en un archivo
-        import json
-        from src.utils.json_utils import NumpyEncoder
-        with open(os.path.join(config.DATOS_DIR, "reporte_resultados.json"), "w") as f:
-            json.dump(reporte, f, indent=4, cls=NumpyEncoder)
+        guardar_reporte_json(reporte, args.debug)
         
         logger.info("Reporte de resultados guardado")
     except Exception as e:
@@ -161,14 +191,20 @@ def ejecutar_flujo_completo(args, logger):
 def ejecutar_modo_especifico(args, logger):
     """Ejecuta solo una parte específica del proceso"""
     if args.modo == 'extraccion':
+        from src.extraccion_datos.extractor_mejorado import Extractor
+        
         api_key = None if args.sin_api else config.API_KEY
-        extractor = Extractor(api_key, config.API_URL, config.API_RATE_LIMIT)
-        df_raw = extractor.extraer_datos_historicos(config.FECHA_INICIO, config.FECHA_FIN)
+        extractor = Extractor(api_key, config.API_URL, config.API_RATE_LIMIT,
+                              cache_dir=config.CACHE_BASESCAN_DIR)
+        df_raw = extractor.extraer_datos_historicos(config.get_fecha_inicio_ts(), config.get_fecha_fin_ts())
         extractor.guardar_datos(df_raw, config.DATOS_CRUDOS)
         logger.info(f"Extracción completada. Datos guardados en {config.DATOS_CRUDOS}")
         return {'df_raw': df_raw}
         
     elif args.modo == 'preprocesamiento':
+        from src.extraccion_datos.extractor_mejorado import Extractor
+        from src.preprocesamiento.preprocesador import Preprocesador
+        
         api_key = None if args.sin_api else config.API_KEY
         extractor = Extractor(api_key, config.API_URL, config.API_RATE_LIMIT)
         df_raw = extractor.cargar_datos(config.DATOS_CRUDOS)
@@ -183,40 +219,27 @@ def ejecutar_modo_especifico(args, logger):
         return {'df_procesado': df_procesado, 'df_discretizado': df_discretizado}
         
     elif args.modo == 'modelado':
+        from src.preprocesamiento.preprocesador import Preprocesador
+        from src.pipeline.modeling import run_modeling_stages
+        
         preprocesador = Preprocesador(config.PARAMETROS)
         df_procesado = preprocesador.cargar_datos(config.DATOS_PROCESADOS)
         df_discretizado = preprocesador.cargar_datos(config.DATOS_DISCRETIZADOS)
         
-        # Clustering
-        modelo_clustering = ModeloClustering(
-            n_clusters=config.PARAMETROS['clustering_num_clusters'],
-            random_state=config.PARAMETROS['clustering_random_state']
-        )
-        df_clusters = modelo_clustering.entrenar_y_predecir(df_procesado)
-        modelo_clustering.guardar_modelo(config.MODELO_CLUSTERING)
-        
-        # Anomalías
-        modelo_anomalias = ModeloAnomalias(
-            n_estimators=config.PARAMETROS['rf_num_arboles'],
-            max_depth=config.PARAMETROS['rf_max_depth'],
-            random_state=config.PARAMETROS['rf_random_state']
-        )
-        df_anomalias = modelo_anomalias.entrenar_y_predecir(df_procesado)
-        modelo_anomalias.guardar_modelo(config.MODELO_ANOMALIAS)
-        
-        # Reglas
-        minero_reglas = MineroReglas(
-            soporte_min=config.PARAMETROS['reglas_soporte_min'],
-            confianza_min=config.PARAMETROS['reglas_confianza_min'],
-            lift_min=config.PARAMETROS['reglas_lift_min']
+        df_clusters, df_anomalias, reglas = run_modeling_stages(
+            df_procesado, df_discretizado, config.PARAMETROS, mejorado=True
         )
-        reglas = minero_reglas.extraer_reglas(df_discretizado)
-        minero_reglas.guardar_reglas(reglas, config.REGLAS_ASOCIACION)
         
         logger.info(f"Modelado completado. Modelos guardados.")
         return {'df_clusters': df_clusters, 'df_anomalias': df_anomalias, 'reglas': reglas}
         
     elif args.modo == 'evaluacion':
+        from src.preprocesamiento.preprocesador import Preprocesador
+        from src.modelos.clustering import ModeloClustering
+        from src.modelos.anomalias_mejorado import ModeloAnomalias
+        from src.modelos.reglas_asociacion_mejorado import MineroReglas
+        from src.evaluacion.evaluador import Evaluador
+        
         preprocesador = Preprocesador(config.PARAMETROS)
         df_procesado = preprocesador.cargar_datos(config.DATOS_PROCESADOS)
         
@@ -241,10 +264,7 @@ def ejecutar_modo_especifico(args, logger):
             reporte = evaluador.generar_reporte(resultados)
             
             # Guardar reporte en un archivo
-            import json
-            from src.utils.json_utils import NumpyEncoder
-            with open(os.path.join(config.DATOS_DIR, "reporte_resultados.json"), "w") as f:
-                json.dump(reporte, f, indent=4, cls=NumpyEncoder)
+            guardar_reporte_json(reporte, args.debug)
             
             logger.info("Reporte de resultados guardado")
         except Exception as e:
@@ -290,13 +310,10 @@ def main():
             datos = ejecutar_modo_especifico(args, logger)
             
             # Si es un modo que genera datos y se pide iniciar la GUI
-            if args.modo in ['extraccion', 'preprocesamiento', 'modelado', 'evaluacion']:
-                # Preguntar si se desea iniciar la interfaz gráfica
+            if args.iniciar_gui and args.modo in ['extraccion', 'preprocesamiento', 'modelado', 'evaluacion']:
                 try:
-                    respuesta = input("¿Desea iniciar la interfaz gráfica con los datos generados? (s/n): ")
-                    if respuesta.lower() in ['s', 'si', 'y', 'yes']:
-                        logger.info("Iniciando interfaz gráfica con datos generados...")
-                        iniciar_interfaz(datos)
+                    logger.info("Iniciando interfaz gráfica con datos generados...")
+                    iniciar_interfaz(datos)
                 except Exception as e:
                     logger.error(f"Error al iniciar interfaz: {str(e)}")
             
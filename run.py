@@ -7,24 +7,40 @@ Este script organiza y facilita la ejecución del flujo de trabajo
 import os
 import sys
 import argparse
+import atexit
 import logging
+import logging.handlers
+import functools
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Añadir directorio raíz al path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 # Importar configuración
 import config
 
-# Configurar logging
+# Configurar logging (una sola vez por proceso)
+@functools.lru_cache(maxsize=1)
 def configurar_logging():
     """Configura el sistema de logs"""
+    # El archivo se escribe por lotes: los registros se acumulan en memoria y
+    # solo los ERROR (o el buffer lleno, o el cierre) fuerzan la escritura
+    file_handler = logging.FileHandler(config.LOG_FILE, delay=True)
+    file_handler.setFormatter(logging.Formatter(config.LOG_FORMAT))
+    memory_handler = logging.handlers.MemoryHandler(
+        1024, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+    )
+    atexit.register(memory_handler.flush)
+    
     logging.basicConfig(
         level=config.LOG_LEVEL,
         format=config.LOG_FORMAT,
         handlers=[
-            logging.FileHandler(config.LOG_FILE),
+            memory_handler,
             logging.StreamHandler()
         ]
     )
@@ -70,8 +86,17 @@ def procesar_argumentos():
         help='Limpiar archivos de caché (__pycache__) antes de ejecutar'
     )
     
+    parser.add_argument(
+        '--iniciar-gui', 
+        action='store_true',
+        help='Abrir la interfaz gráfica con los datos generados al terminar un modo específico'
+    )
+    
     return parser.parse_args()
 
+# Directorios que nunca contienen caché del proyecto y no merece la pena recorrer
+_DIRECTORIOS_OMITIDOS = frozenset({'.git', 'venv', '.venv', 'env', 'node_modules', 'datos', 'logs', '.cache'})
+
 def limpiar_cache():
     """Limpia archivos de caché del proyecto"""
     logger = logging.getLogger(__name__)
@@ -79,22 +104,92 @@ def limpiar_cache():
     
     directorios_cache = []
     
-    # Buscar directorios __pycache__
-    for root, dirs, files in os.walk(os.path.dirname(os.path.abspath(__file__))):
-        for dir in dirs:
-            if dir == "__pycache__":
-                directorios_cache.append(os.path.join(root, dir))
-    
-    # Eliminar cada directorio de caché
-    for directorio in directorios_cache:
+    # Buscar directorios __pycache__ (recorrido con scandir: sin stat por archivo,
+    # sin entrar en los __pycache__ encontrados ni en directorios pesados)
+    pendientes = [_ROOT]
+    while pendientes:
+        try:
+            with os.scandir(pendientes.pop()) as entradas:
+                for entrada in entradas:
+                    if not entrada.is_dir(follow_symlinks=False):
+                        continue
+                    if entrada.name == "__pycache__":
+                        directorios_cache.append(entrada.path)
+                    elif entrada.name not in _DIRECTORIOS_OMITIDOS:
+                        pendientes.append(entrada.path)
+        except OSError as e:
+            logger.warning(f"No se pudo recorrer un directorio: {str(e)}")
+    
+    # Eliminar los directorios de caché en paralelo (cada borrado es independiente y limitado por E/S)
+    def _eliminar(directorio):
         try:
             shutil.rmtree(directorio)
-            logger.info(f"Directorio eliminado: {directorio}")
-        except Exception as e:
-            logger.error(f"Error al eliminar {directorio}: {str(e)}")
+            return None
+        except OSError as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for directorio, error in zip(directorios_cache, executor.map(_eliminar, directorios_cache)):
+            if error is None:
+                logger.info(f"Directorio eliminado: {directorio}")
+            else:
+                logger.error(f"Error al eliminar {directorio}: {str(error)}")
     
     logger.info(f"Se eliminaron {len(directorios_cache)} directorios de caché")
 
+def _modo_limpiar(args, logger):
+    """Modo limpiar: elimina los directorios de caché"""
+    limpiar_cache()
+    logger.info("Limpieza de caché completada")
+
+def _modo_test_api(args, logger):
+    """Modo test-api: diagnostica la conexión con la API"""
+    import test_basescan_api
+    test_basescan_api.main()
+    logger.info("Prueba de API completada. Ver api_test.log para detalles")
+
+def _modo_completo(args, logger):
+    """Modo completo: ejecuta todo el flujo y abre la interfaz con los resultados"""
+    from main_mejorado import ejecutar_flujo_completo, iniciar_interfaz
+    
+    datos = ejecutar_flujo_completo(args, logger)
+    logger.info("Flujo completo ejecutado con éxito")
+    logger.info("Iniciando interfaz gráfica...")
+    iniciar_interfaz(datos)
+
+def _modo_interfaz(args, logger):
+    """Modo interfaz: solo abre la interfaz gráfica"""
+    from src.interfaz.gui import iniciar_interfaz
+    
+    logger.info("Iniciando interfaz gráfica...")
+    iniciar_interfaz()
+
+def _modo_especifico(args, logger):
+    """Modos extraccion/preprocesamiento/modelado/evaluacion"""
+    from main_mejorado import ejecutar_modo_especifico, iniciar_interfaz
+    
+    datos = ejecutar_modo_especifico(args, logger)
+    
+    # Iniciar la interfaz gráfica solo si se pidió con --iniciar-gui
+    if args.iniciar_gui:
+        try:
+            logger.info("Iniciando interfaz gráfica con datos generados...")
+            iniciar_interfaz(datos)
+        except Exception as e:
+            logger.error(f"Error al iniciar interfaz: {str(e)}")
+
+# Tabla de modos: cada función importa solo lo que necesita
+_MODOS = {
+    'limpiar': _modo_limpiar,
+    'test-api': _modo_test_api,
+    'completo': _modo_completo,
+    'interfaz': _modo_interfaz,
+    'extraccion': _modo_especifico,
+    'preprocesamiento': _modo_especifico,
+    'modelado': _modo_especifico,
+    'evaluacion': _modo_especifico,
+}
+
 def ejecutar():
     """Función principal que ejecuta el programa según los argumentos"""
     # Procesar argumentos
@@ -119,39 +214,7 @@ def ejecutar():
     
     try:
         # Ejecutar el modo seleccionado
-        if args.modo == 'limpiar':
-            limpiar_cache()
-            logger.info("Limpieza de caché completada")
-        elif args.modo == 'test-api':
-            import test_basescan_api
-            test_basescan_api.main()
-            logger.info("Prueba de API completada. Ver api_test.log para detalles")
-        else:
-            # Importar el archivo principal mejorado
-            from main_mejorado import ejecutar_flujo_completo, ejecutar_modo_especifico, iniciar_interfaz
-            
-            if args.modo == 'completo':
-                datos = ejecutar_flujo_completo(args, logger)
-                logger.info("Flujo completo ejecutado con éxito")
-                logger.info("Iniciando interfaz gráfica...")
-                iniciar_interfaz(datos)
-            elif args.modo == 'interfaz':
-                from src.interfaz.gui import iniciar_interfaz
-                logger.info("Iniciando interfaz gráfica...")
-                iniciar_interfaz()
-            else:
-                datos = ejecutar_modo_especifico(args, logger)
-                
-                # Preguntar si se desea iniciar la interfaz gráfica
-                if args.modo in ['extraccion', 'preprocesamiento', 'modelado', 'evaluacion']:
-                    try:
-                        respuesta = input("¿Desea iniciar la interfaz gráfica con los datos generados? (s/n): ")
-                        if respuesta.lower() in ['s', 'si', 'y', 'yes']:
-                            logger.info("Iniciando interfaz gráfica con datos generados...")
-                            from src.interfaz.gui import iniciar_interfaz
-                            iniciar_interfaz(datos)
-                    except Exception as e:
-                        logger.error(f"Error al iniciar interfaz: {str(e)}")
+        _MODOS[args.modo](args, logger)
     
     except Exception as e:
         logger.error(f"Error durante la ejecución: {str(e)}", exc_info=True)
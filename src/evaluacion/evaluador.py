@@ -4,12 +4,84 @@ Modulo para evaluacion de modelos de mineria de datos para criptomonedas
 
 import os
 import logging
-import pandas as pd
+import functools
 import numpy as np
-from sklearn.metrics import (
-    f1_score, precision_score, recall_score, 
-    silhouette_score, confusion_matrix
-)
+
+try:
+    import bottleneck as bn
+except ImportError:  # bottleneck es opcional, se usa rolling de pandas como respaldo
+    bn = None
+
+# Bits de la etiqueta de cada consecuente. Es una máscara y no una categoría única
+# porque un consecuente puede contener varias subcadenas (p. ej. "volatilidad_cat_baja,
+# proximo_retorno_cat_neutral" cuenta tanto para "baja" como para "neutral")
+_BIT_PREDICTIVA = 8
+_BITS_RESULTADO = {'sube': 1, 'baja': 2, 'neutral': 4}
+
+def _etiquetar_consecuentes(consecuentes):
+    """
+    Calcula la etiqueta (máscara de bits int8) de cada consecuente
+    
+    Args:
+        consecuentes (pd.Series): Consecuentes de las reglas como texto
+        
+    Returns:
+        np.ndarray: Máscara de bits por regla
+    """
+    textos = consecuentes.astype(str).to_numpy(dtype=str)
+    etiquetas = np.where(np.char.find(textos, 'proximo_retorno') >= 0, _BIT_PREDICTIVA, 0).astype(np.int8)
+    for resultado, bit in _BITS_RESULTADO.items():
+        etiquetas |= np.where(np.char.find(textos, resultado) >= 0, bit, 0).astype(np.int8)
+    return etiquetas
+
+def _simular_anomalias(close, senales, dias, comision):
+    """
+    Simula la estrategia de anomalías: comprar en la primera señal disponible,
+    vender `dias` después y buscar la siguiente señal tras la venta
+    
+    Args:
+        close (np.ndarray): Precios de cierre (float64)
+        senales (np.ndarray): Índices ordenados de las filas con señal de compra
+        dias (int): Días de mantenimiento de cada posición
+        comision (float): Comisión por operación (fracción)
+        
+    Returns:
+        tuple: (factor de capital final, número de operaciones)
+    """
+    n = close.shape[0]
+    factor = 1.0
+    operaciones = 0
+    pos = 0
+    while pos < senales.shape[0]:
+        compra = senales[pos]
+        venta = compra + dias
+        if venta >= n:
+            # Posición abierta al final: se cierra al último precio sin contar como operación
+            factor *= close[n - 1] / close[compra] * (1 - comision) ** 2
+            operaciones += 1
+            break
+        factor *= close[venta] / close[compra] * (1 - comision) ** 2
+        operaciones += 2
+        pos = np.searchsorted(senales, venta, side='right')
+    return factor, operaciones
+
+@functools.lru_cache(maxsize=None)
+def _compilar(nucleo):
+    """
+    Compila un núcleo con numba la primera vez que se usa (numba es opcional
+    y se importa tarde para no penalizar el arranque)
+    
+    Args:
+        nucleo (callable): Función escalar sobre arrays de NumPy
+        
+    Returns:
+        callable: Versión compilada, o la función original si numba no está disponible
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return nucleo
+    return njit(cache=True)(nucleo)
 
 class Evaluador:
     """
@@ -88,42 +160,60 @@ class Evaluador:
         # Verificar qué características están disponibles
         caracteristicas_disp = [c for c in caracteristicas if c in df.columns]
         
-        # Filtrar filas con valores válidos y cluster asignado
-        df_val = df[df['cluster'] >= 0].dropna(subset=caracteristicas_disp)
+        # Trabajar sobre arrays de NumPy: una sola extracción de columnas, sin copias por filtro
+        etiquetas = df['cluster'].to_numpy()
+        valores = df[caracteristicas_disp].to_numpy(dtype=np.float64)
+        asignados = etiquetas >= 0
+        
+        # Filas con valores válidos y cluster asignado
+        validas = asignados & ~np.isnan(valores).any(axis=1)
         
         # Calcular coeficiente de silueta si hay suficientes muestras
-        if len(df_val) > 1 and len(df_val['cluster'].unique()) > 1:
+        if np.count_nonzero(validas) > 1 and len(np.unique(etiquetas[validas])) > 1:
             try:
+                from sklearn.metrics import silhouette_score
+                
+                # La silueta es O(N²): se calcula sobre una muestra de tamaño acotado
+                tam_muestra = min(int(np.count_nonzero(validas)), self.parametros.get('silhouette_sample', 5000))
                 silueta = silhouette_score(
-                    df_val[caracteristicas_disp], 
-                    df_val['cluster']
+                    valores[validas].astype(np.float32), 
+                    etiquetas[validas],
+                    sample_size=tam_muestra,
+                    random_state=42
                 )
                 resultados['silhouette_score'] = silueta
             except Exception as e:
                 self.logger.error(f"Error al calcular silueta: {str(e)}")
                 resultados['silhouette_score'] = None
         
-        # Calcular estadísticas por cluster
-        cluster_stats = {}
-        for cluster in sorted(df['cluster'].unique()):
-            if cluster < 0:  # Saltar puntos no asignados
-                continue
-                
-            cluster_data = df[df['cluster'] == cluster]
-            
-            # Tamaño y porcentaje
-            cluster_stats[f'cluster_{cluster}_tamaño'] = len(cluster_data)
-            cluster_stats[f'cluster_{cluster}_porcentaje'] = len(cluster_data) / len(df) * 100
-            
-            # Características promedio
-            for caract in caracteristicas_disp:
-                cluster_stats[f'cluster_{cluster}_{caract}_promedio'] = cluster_data[caract].mean()
-            
-            # Anomalías en el cluster
+        # Calcular estadísticas por cluster con bincount (una pasada por columna, sin agrupar DataFrames)
+        ids_cluster, grupo = np.unique(etiquetas[asignados], return_inverse=True)
+        tamaños = np.bincount(grupo, minlength=len(ids_cluster))
+        valores_asignados = valores[asignados]
+        promedios = np.full((len(ids_cluster), len(caracteristicas_disp)), np.nan)
+        for j in range(len(caracteristicas_disp)):
+            columna = valores_asignados[:, j]
+            no_nulo = ~np.isnan(columna)
+            suma = np.bincount(grupo[no_nulo], weights=columna[no_nulo], minlength=len(ids_cluster))
+            cuenta = np.bincount(grupo[no_nulo], minlength=len(ids_cluster))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                promedios[:, j] = suma / cuenta
+        if 'anomalia' in df.columns:
+            es_anomalia = df['anomalia'].to_numpy()[asignados] > 0
+            porc_anomalias = np.bincount(grupo, weights=es_anomalia, minlength=len(ids_cluster)) / tamaños * 100
+        
+        # Estadísticas anidadas por cluster: {id_cluster: {métrica: valor}}
+        clusters = {}
+        for i, cluster in enumerate(ids_cluster):
+            estadisticas = clusters[int(cluster)] = {}
+            estadisticas['tamaño'] = int(tamaños[i])
+            estadisticas['porcentaje'] = float(tamaños[i] / len(df) * 100)
+            for j, caract in enumerate(caracteristicas_disp):
+                estadisticas[f'{caract}_promedio'] = float(promedios[i, j])
             if 'anomalia' in df.columns:
-                cluster_stats[f'cluster_{cluster}_porc_anomalias'] = (cluster_data['anomalia'] > 0).mean() * 100
+                estadisticas['porc_anomalias'] = float(porc_anomalias[i])
         
-        resultados.update(cluster_stats)
+        resultados['clusters'] = clusters
         
         # Calcular inercia (suma de distancias al cuadrado a los centros)
         # Esto requeriría acceso al objeto KMeans directamente, así que lo omitimos aquí
@@ -153,19 +243,36 @@ class Evaluador:
         df_val = df.dropna(subset=['anomalia', 'anomalia_pred'])
         
         # Convertir a enteros (asegurar que son 0 y 1)
-        y_true = df_val['anomalia'].astype(int)
-        y_pred = df_val['anomalia_pred'].astype(int)
-        
-        # Calcular métricas
-        resultados['precision'] = precision_score(y_true, y_pred, zero_division=0)
-        resultados['recall'] = recall_score(y_true, y_pred, zero_division=0)
-        resultados['f1_score'] = f1_score(y_true, y_pred, zero_division=0)
-        
-        # Matriz de confusión
-        cm = confusion_matrix(y_true, y_pred)
-        
-        if cm.shape == (2, 2):
-            resultados['tn'], resultados['fp'], resultados['fn'], resultados['tp'] = cm.ravel()
+        y_true = df_val['anomalia'].to_numpy(dtype=np.int8)
+        y_pred = df_val['anomalia_pred'].to_numpy(dtype=np.int8)
+        
+        if np.isin(y_true, (0, 1)).all() and np.isin(y_pred, (0, 1)).all():
+            # Matriz de confusión en una sola pasada; el resto de métricas se derivan de ella
+            tp = int(np.count_nonzero(y_true & y_pred))
+            fp = int(np.count_nonzero(y_pred)) - tp
+            fn = int(np.count_nonzero(y_true)) - tp
+            tn = len(y_true) - tp - fp - fn
+            
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            resultados['precision'] = precision
+            resultados['recall'] = recall
+            resultados['f1_score'] = 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+            
+            # Igual que confusion_matrix: solo hay matriz 2x2 si aparecen ambas clases
+            if tn + fp + fn and tp + fp + fn:
+                resultados['tn'], resultados['fp'], resultados['fn'], resultados['tp'] = tn, fp, fn, tp
+        else:
+            # Etiquetas fuera de {0, 1}: se mantiene el cálculo de sklearn
+            from sklearn.metrics import f1_score, precision_score, recall_score, confusion_matrix
+            
+            resultados['precision'] = precision_score(y_true, y_pred, zero_division=0)
+            resultados['recall'] = recall_score(y_true, y_pred, zero_division=0)
+            resultados['f1_score'] = f1_score(y_true, y_pred, zero_division=0)
+            
+            cm = confusion_matrix(y_true, y_pred)
+            if cm.shape == (2, 2):
+                resultados['tn'], resultados['fp'], resultados['fn'], resultados['tp'] = cm.ravel()
         
         # Porcentaje de anomalías detectadas
         num_anomalias_reales = y_true.sum()
@@ -203,21 +310,26 @@ class Evaluador:
         resultados['lift_promedio'] = reglas['lift'].mean()
         resultados['soporte_promedio'] = reglas['soporte'].mean()
         
-        # Estadísticas para reglas predictivas
-        reglas_pred = reglas[reglas['consecuentes'].str.contains('proximo_retorno')]
-        
-        if not reglas_pred.empty:
-            resultados['num_reglas_pred'] = len(reglas_pred)
-            resultados['confianza_promedio_pred'] = reglas_pred['confianza'].mean()
-            resultados['lift_promedio_pred'] = reglas_pred['lift'].mean()
+        # Estadísticas para reglas predictivas: etiquetas de los consecuentes en un array
+        # local, sin añadir columnas a la tabla de reglas del llamador
+        etiquetas = _etiquetar_consecuentes(reglas['consecuentes'])
+        confianza = reglas['confianza'].to_numpy(dtype=float)
+        lift = reglas['lift'].to_numpy(dtype=float)
+        mascara_pred = (etiquetas & _BIT_PREDICTIVA) != 0
+        
+        if mascara_pred.any():
+            resultados['num_reglas_pred'] = int(np.count_nonzero(mascara_pred))
+            resultados['confianza_promedio_pred'] = confianza[mascara_pred].mean()
+            resultados['lift_promedio_pred'] = lift[mascara_pred].mean()
             
             # Número de reglas para "sube", "baja", "neutral"
-            for resultado in ['sube', 'baja', 'neutral']:
-                mask = reglas_pred['consecuentes'].str.contains(resultado)
-                resultados[f'num_reglas_{resultado}'] = mask.sum()
-                if mask.sum() > 0:
-                    resultados[f'confianza_promedio_{resultado}'] = reglas_pred[mask]['confianza'].mean()
-                    resultados[f'lift_promedio_{resultado}'] = reglas_pred[mask]['lift'].mean()
+            for resultado, bit in _BITS_RESULTADO.items():
+                mascara = mascara_pred & ((etiquetas & bit) != 0)
+                num_reglas = int(np.count_nonzero(mascara))
+                resultados[f'num_reglas_{resultado}'] = num_reglas
+                if num_reglas > 0:
+                    resultados[f'confianza_promedio_{resultado}'] = confianza[mascara].mean()
+                    resultados[f'lift_promedio_{resultado}'] = lift[mascara].mean()
         
         return resultados
     
@@ -288,10 +400,28 @@ class Evaluador:
         Returns:
             float: Rentabilidad porcentual
         """
-        precio_inicio = df['close'].iloc[0]
-        precio_fin = df['close'].iloc[-1]
+        precios = df['close'].to_numpy()
         
-        return (precio_fin / precio_inicio - 1) * 100
+        return (precios[-1] / precios[0] - 1) * 100.0
+    
+    def _media_movil(self, df, close, ventana):
+        """
+        Devuelve la media móvil simple de cierre sin modificar el DataFrame
+        
+        Args:
+            df (pd.DataFrame): DataFrame con precios
+            close (np.ndarray): Precios de cierre
+            ventana (int): Tamaño de la ventana
+            
+        Returns:
+            np.ndarray: Media móvil (NaN hasta completar la primera ventana)
+        """
+        if f'sma_{ventana}' in df.columns:
+            return df[f'sma_{ventana}'].to_numpy(dtype=np.float64)
+        if bn is not None:
+            return bn.move_mean(close, window=ventana, min_count=ventana)
+        import pandas as pd
+        return pd.Series(close).rolling(window=ventana).mean().to_numpy()
     
     def _calcular_estrategia_sma(self, df, ventana_corta=20, ventana_larga=50):
         """
@@ -305,55 +435,48 @@ class Evaluador:
         Returns:
             tuple: (rentabilidad, número de operaciones)
         """
-        # Calcular medias móviles si no existen
-        if f'sma_{ventana_corta}' not in df.columns:
-            df[f'sma_{ventana_corta}'] = df['close'].rolling(window=ventana_corta).mean()
+        comision = self.parametros['comision'] / 100
         
-        if f'sma_{ventana_larga}' not in df.columns:
-            df[f'sma_{ventana_larga}'] = df['close'].rolling(window=ventana_larga).mean()
+        # Medias móviles (se reutilizan las del preprocesamiento si existen)
+        close = df['close'].to_numpy(dtype=np.float64)
+        if len(close) == 0:
+            return 0.0, 0
         
-        # Crear señales: 1 = comprar, -1 = vender, 0 = mantener
-        df['señal'] = 0
-        df.loc[df[f'sma_{ventana_corta}'] > df[f'sma_{ventana_larga}'], 'señal'] = 1
-        df.loc[df[f'sma_{ventana_corta}'] <= df[f'sma_{ventana_larga}'], 'señal'] = -1
+        sma_corta = self._media_movil(df, close, ventana_corta)
+        sma_larga = self._media_movil(df, close, ventana_larga)
         
-        # Detectar cambios en la señal (cruces)
-        df['cambio_señal'] = df['señal'].diff().fillna(0)
+        # Señales: 1 = comprar, -1 = vender, 0 = sin dato (medias aún no definidas)
+        senal = np.where(sma_corta > sma_larga, 1, np.where(sma_corta <= sma_larga, -1, 0))
         
-        # Simular operaciones
-        capital = self.parametros['capital_inicial']
-        comision = self.parametros['comision'] / 100
+        # Cruces: índices donde cambia la señal
+        cambio = np.diff(senal, prepend=senal[0])
+        eventos = np.flatnonzero(cambio)
+        signos = np.sign(cambio[eventos])
         
-        posicion = 0  # 0 = sin posición, 1 = comprado
-        precio_compra = 0
-        operaciones = 0
-        
-        for idx, row in df.iterrows():
-            if posicion == 0 and row['cambio_señal'] > 0:
-                # Comprar
-                precio_compra = row['close']
-                posicion = 1
-                capital -= capital * comision  # Comisión de compra
-                operaciones += 1
-                
-            elif posicion == 1 and row['cambio_señal'] < 0:
-                # Vender
-                precio_venta = row['close']
-                retorno = precio_venta / precio_compra - 1
-                capital *= (1 + retorno)
-                capital -= capital * comision  # Comisión de venta
-                posicion = 0
-                operaciones += 1
+        # Sin posición solo cuenta la primera compra, comprado solo la primera venta:
+        # equivale a quedarse con el primer evento de cada racha del mismo signo
+        # y descartar una venta inicial
+        primero_de_racha = np.ones(len(eventos), dtype=bool)
+        primero_de_racha[1:] = signos[1:] != signos[:-1]
+        eventos, signos = eventos[primero_de_racha], signos[primero_de_racha]
+        if len(signos) and signos[0] < 0:
+            eventos = eventos[1:]
+        
+        compras = eventos[0::2]
+        ventas = eventos[1::2]
+        operaciones = len(compras) + len(ventas)
         
         # Si terminamos con posición abierta, cerrar al último precio
-        if posicion == 1:
-            precio_venta = df['close'].iloc[-1]
-            retorno = precio_venta / precio_compra - 1
-            capital *= (1 + retorno)
-            capital -= capital * comision
+        if len(ventas) < len(compras):
+            ventas = np.append(ventas, len(close) - 1)
+        
+        # Crecimiento por operación, con la comisión de compra y de venta incluidas
+        # en el mismo factor; el capital final es un único producto vectorizado
+        retornos = close[ventas] / close[compras] - 1
+        factor = np.prod((1 + retornos) * (1 - comision) ** 2)
         
         # Calcular rentabilidad respecto al capital inicial
-        rentabilidad = (capital / self.parametros['capital_inicial'] - 1) * 100
+        rentabilidad = (factor - 1) * 100
         
         return rentabilidad, operaciones
     
@@ -369,57 +492,22 @@ class Evaluador:
         Returns:
             tuple: (rentabilidad, número de operaciones)
         """
-        # Asegurarse que están en el mismo índice
-        df_comun = df.merge(
-            df_anomalias[['anomalia_pred', 'prob_anomalia']], 
-            left_index=True, 
-            right_index=True,
-            how='left'
-        )
-        
         # Estrategia: Comprar cuando se detecta anomalía, vender después de N días
         dias_mantenimiento = 5
-        
-        # Inicializar variables
-        capital = self.parametros['capital_inicial']
         comision = self.parametros['comision'] / 100
         
-        posicion = 0  # 0 = sin posición, 1 = comprado
-        precio_compra = 0
-        dias_desde_compra = 0
-        operaciones = 0
-        
-        for idx, row in df_comun.iterrows():
-            if posicion == 0 and row.get('prob_anomalia', 0) > umbral_prob:
-                # Comprar en anomalía
-                precio_compra = row['close']
-                posicion = 1
-                capital -= capital * comision  # Comisión de compra
-                dias_desde_compra = 0
-                operaciones += 1
-                
-            elif posicion == 1:
-                # Incrementar contador
-                dias_desde_compra += 1
-                
-                # Vender después de N días
-                if dias_desde_compra >= dias_mantenimiento:
-                    precio_venta = row['close']
-                    retorno = precio_venta / precio_compra - 1
-                    capital *= (1 + retorno)
-                    capital -= capital * comision  # Comisión de venta
-                    posicion = 0
-                    operaciones += 1
+        # Alinear las probabilidades con el índice de precios uniendo solo las dos columnas
+        # necesarias (un join y no reindex, que falla con etiquetas duplicadas en el índice)
+        df_comun = df[['close']].join(df_anomalias['prob_anomalia'], how='left')
+        close = df_comun['close'].to_numpy(dtype=float)
+        prob = df_comun['prob_anomalia'].fillna(0).to_numpy(dtype=float)
         
-        # Si terminamos con posición abierta, cerrar al último precio
-        if posicion == 1:
-            precio_venta = df_comun['close'].iloc[-1]
-            retorno = precio_venta / precio_compra - 1
-            capital *= (1 + retorno)
-            capital -= capital * comision
+        # Recorrido voraz por operaciones en un núcleo compilado (si numba está disponible)
+        senales = np.flatnonzero(prob > umbral_prob)
+        factor, operaciones = _compilar(_simular_anomalias)(close, senales, dias_mantenimiento, comision)
         
         # Calcular rentabilidad respecto al capital inicial
-        rentabilidad = (capital / self.parametros['capital_inicial'] - 1) * 100
+        rentabilidad = (factor - 1) * 100
         
         return rentabilidad, operaciones
     
@@ -439,21 +527,23 @@ class Evaluador:
         
         # Incluir métricas de clustering
         if 'clustering' in resultados:
+            clusters = resultados['clustering'].get('clusters', {})
             reporte['clustering'] = {
                 'calidad_clusters': resultados['clustering'].get('silhouette_score', 0),
-                'num_clusters': len([k for k in resultados['clustering'].keys() if k.startswith('cluster_')]),
+                'num_clusters': len(clusters),
                 'distribucion': {}
             }
             
             # Extraer información de cada cluster
-            for k, v in resultados['clustering'].items():
-                if k.startswith('cluster_') and k.endswith('_tamaño'):
-                    cluster_id = k.split('_')[1]
-                    reporte['clustering']['distribucion'][f'Cluster {cluster_id}'] = {
-                        'tamaño': resultados['clustering'].get(f'cluster_{cluster_id}_tamaño', 0),
-                        'porcentaje': resultados['clustering'].get(f'cluster_{cluster_id}_porcentaje', 0),
-                        'retorno_promedio': resultados['clustering'].get(f'cluster_{cluster_id}_retorno_promedio', 0)
-                    }
+            for cluster_id, estadisticas in clusters.items():
+                distribucion = {
+                    'tamaño': estadisticas.get('tamaño', 0),
+                    'porcentaje': estadisticas.get('porcentaje', 0),
+                    'retorno_promedio': estadisticas.get('retorno_promedio', 0)
+                }
+                if 'porc_anomalias' in estadisticas:
+                    distribucion['porc_anomalias'] = estadisticas['porc_anomalias']
+                reporte['clustering']['distribucion'][f'Cluster {cluster_id}'] = distribucion
         
         # Incluir métricas de anomalías
         if 'anomalias' in resultados:
@@ -3,18 +3,137 @@ Modulo para la extraccion de datos historicos de criptomonedas desde API de Base
 """
 
 import os
+import json
 import time
+import random
+import hashlib
 import logging
+import threading
 import requests
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional, se usa el decodificador de requests como respaldo
+    orjson = None
+
+# Duración de una vela por intervalo (ms) y máximo de velas por página de la API
+_INTERVALOS_MS = {'1d': 86_400_000}
+_LIMITE_VELAS = 1000
+
+# Columnas numéricas de los archivos de datos, con tipo fijo al cargarlos
+_COLUMNAS_PRECIO = ('open', 'high', 'low', 'close', 'volume', 'market_cap')
+
+def _normalizar_fecha(fecha):
+    """
+    Normaliza una fecha recibida como datetime o como timestamp UNIX
+    
+    Args:
+        fecha (datetime | int): Fecha o timestamp en segundos
+        
+    Returns:
+        tuple: (timestamp en segundos, datetime)
+    """
+    if isinstance(fecha, datetime):
+        return int(fecha.timestamp()), fecha
+    return int(fecha), datetime.fromtimestamp(fecha)
+
+def _ventanas_paginacion(inicio_ms, fin_ms, intervalo_ms, limite=_LIMITE_VELAS):
+    """
+    Divide el rango [inicio_ms, fin_ms] en ventanas de como máximo `limite` velas
+    
+    Args:
+        inicio_ms (int): Inicio del rango en milisegundos
+        fin_ms (int): Fin del rango en milisegundos
+        intervalo_ms (int): Duración de una vela en milisegundos
+        limite (int): Número máximo de velas por ventana
+        
+    Returns:
+        list: Lista de tuplas (startTime, endTime) en orden cronológico
+    """
+    paso = intervalo_ms * limite
+    return [(inicio, min(inicio + paso - 1, fin_ms)) for inicio in range(inicio_ms, fin_ms, paso)]
+
+def _leer_json(response):
+    """
+    Decodifica el cuerpo JSON de una respuesta, con orjson si está disponible
+    
+    Args:
+        response (requests.Response): Respuesta HTTP
+        
+    Returns:
+        dict | list: Contenido decodificado
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+class _RetryConJitter(Retry):
+    """
+    Política de reintentos con espera exponencial y jitter completo
+    
+    Si el servidor envía Retry-After, urllib3 respeta esa espera antes que el backoff.
+    """
+    
+    def get_backoff_time(self):
+        return random.uniform(0, super().get_backoff_time())
+
+class _FileCache:
+    """
+    Cache en disco de respuestas JSON con caducidad (TTL)
+    """
+    
+    def __init__(self, directorio, ttl_segundos):
+        """
+        Args:
+            directorio (str | Path): Directorio donde se guardan las entradas
+            ttl_segundos (float): Tiempo de vida de cada entrada en segundos
+        """
+        self.directorio = directorio
+        self.ttl = ttl_segundos
+        os.makedirs(directorio, exist_ok=True)
+    
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.json")
+    
+    def get(self, clave):
+        """
+        Devuelve los datos guardados para la clave, o None si no existen o han caducado
+        """
+        try:
+            with open(self._ruta(clave), encoding='utf-8') as f:
+                entrada = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entrada.get('ts', 0) > self.ttl:
+            return None
+        return entrada.get('data')
+    
+    def set(self, clave, datos):
+        """
+        Guarda los datos para la clave (escritura atómica mediante archivo temporal)
+        """
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'ts': time.time(), 'data': datos}, f)
+        os.replace(temporal, ruta)
+
 class Extractor:
     """
     Clase para la extraccion de datos historicos de criptomonedas
     """
     
-    def __init__(self, api_key, api_url, rate_limit=5):
+    # Directorios de salida ya creados en este proceso
+    _mkdir_cache = set()
+    
+    def __init__(self, api_key, api_url, rate_limit=5, cache_dir=None, cache_ttl_dias=30,
+                 rt_ttl=60.0):
         """
         Inicializa el extractor de datos
         
@@ -22,29 +141,88 @@ class Extractor:
             api_key (str): Clave de API para Basescan
             api_url (str): URL base de la API
             rate_limit (int): Límite de solicitudes por segundo
+            cache_dir (str | Path, optional): Directorio de la caché de klines (None la desactiva)
+            cache_ttl_dias (float): Días de validez de las páginas cacheadas
+            rt_ttl (float): Segundos durante los que se reutilizan los datos en tiempo real
         """
         self.api_key = api_key
         self.api_url = api_url
         self.rate_limit = rate_limit
         self.logger = logging.getLogger(__name__)
+        # Generador aleatorio propio (PCG64) y con semilla fija, para datos ficticios reproducibles
+        self._rng = np.random.default_rng(42)
+        self._cache = _FileCache(cache_dir, cache_ttl_dias * 86400) if cache_dir else None
+        
+        # Limitación de tasa: instante a partir del cual se puede lanzar la siguiente solicitud
+        self._rl_intervalo = 1.0 / rate_limit
+        self._rl_siguiente = time.monotonic()
+        self._rl_lock = threading.Lock()
+        
+        # Caché en memoria de datos en tiempo real: divisa -> (instante monotónico, datos)
+        self._rt_cache = {}
+        self._rt_ttl = rt_ttl
+        
+        # Sesión persistente: reutiliza conexiones (keep-alive) entre páginas y consultas
+        self._session = requests.Session()
+        adaptador = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(8, rate_limit * 2),
+            max_retries=_RetryConJitter(
+                total=6,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                allowed_methods=frozenset({'GET'})
+            )
+        )
+        self._session.mount('http://', adaptador)
+        self._session.mount('https://', adaptador)
+    
+    def _throttle(self):
+        """
+        Espera solo lo necesario para respetar el límite de solicitudes por segundo
+        
+        Cada llamada reserva el siguiente hueco libre; si la solicitud anterior ya tardó
+        más que el intervalo, no se duerme. Es seguro entre hilos.
+        """
+        with self._rl_lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._rl_siguiente)
+            self._rl_siguiente = turno + self._rl_intervalo
+        
+        espera = turno - ahora
+        if espera > 0:
+            time.sleep(espera)
+    
+    def close(self):
+        """
+        Cierra la sesión HTTP y libera sus conexiones
+        """
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
     def extraer_datos_historicos(self, fecha_inicio, fecha_fin, divisa="BTC"):
         """
         Extrae datos historicos de precio y volumen para una criptomoneda
         
         Args:
-            fecha_inicio (datetime): Fecha de inicio para los datos
-            fecha_fin (datetime): Fecha final para los datos
+            fecha_inicio (datetime | int): Fecha de inicio (o timestamp UNIX en segundos)
+            fecha_fin (datetime | int): Fecha final (o timestamp UNIX en segundos)
             divisa (str): Simbolo de la criptomoneda (default: "BTC")
             
         Returns:
             pd.DataFrame: DataFrame con los datos historicos
         """
-        self.logger.info(f"Extrayendo datos históricos para {divisa} desde {fecha_inicio} hasta {fecha_fin}")
+        # Se prefieren timestamps UNIX ya calculados; las fechas se convierten una sola vez
+        inicio_ts, fecha_inicio = _normalizar_fecha(fecha_inicio)
+        fin_ts, fecha_fin = _normalizar_fecha(fecha_fin)
         
-        # Convertir fechas a formato timestamp para la API
-        inicio_ts = int(fecha_inicio.timestamp())
-        fin_ts = int(fecha_fin.timestamp())
+        self.logger.info(f"Extrayendo datos históricos para {divisa} desde {fecha_inicio} hasta {fecha_fin}")
         
         try:
             # Usar la API real de Basescan si hay una clave API válida
@@ -52,63 +230,38 @@ class Extractor:
                 # Endpoint para datos historicos
                 endpoint = f"{self.api_url}/v1/klines"
                 
+                intervalo = '1d'
                 params = {
                     'apikey': self.api_key,
                     'symbol': f"{divisa}USDT",
-                    'interval': '1d',
-                    'startTime': inicio_ts * 1000,  # Basescan usa milisegundos
-                    'endTime': fin_ts * 1000,
-                    'limit': 1000  # Máximo número de registros
+                    'interval': intervalo,
+                    'limit': _LIMITE_VELAS  # Máximo número de registros
                 }
                 
-                self.logger.debug(f"Realizando solicitud a {endpoint}")
+                # Las ventanas de paginación se conocen de antemano, así que se piden en paralelo
+                ventanas = _ventanas_paginacion(inicio_ts * 1000, fin_ts * 1000, _INTERVALOS_MS[intervalo])
+                self.logger.debug(f"Realizando {len(ventanas)} solicitudes a {endpoint}")
                 
-                data = []
-                current_start = inicio_ts * 1000
+                paginas_params = [dict(params, startTime=inicio, endTime=fin) for inicio, fin in ventanas]
+                with ThreadPoolExecutor(max_workers=max(1, min(self.rate_limit, len(ventanas)))) as executor:
+                    paginas = list(executor.map(lambda p: self._obtener_pagina_cacheada(endpoint, p), paginas_params))
                 
-                # Hacer múltiples llamadas si el período es grande (paginación)
-                while current_start < fin_ts * 1000:
-                    params['startTime'] = current_start
-                      # Implementar limitación de tasa
-                    time.sleep(1.0 / self.rate_limit)
-                    
-                    try:
-                        response = requests.get(endpoint, params=params, timeout=10)
-                        response.raise_for_status()
-                        batch_data = response.json()
-                        
-                        if not batch_data:
-                            self.logger.warning(f"No se obtuvieron datos para el periodo {datetime.fromtimestamp(current_start/1000)}")
-                            break
-                    
-                    except requests.exceptions.RequestException as e:
-                        self.logger.error(f"Error en la solicitud a la API de Basescan: {str(e)}")
-                        # Intentar de nuevo con un retraso
-                        time.sleep(5)
-                        continue
-                    except (IndexError, ValueError) as e:
-                        self.logger.error(f"Error procesando datos de la API: {str(e)}")
-                        break
-                    
-                    # Convertir datos de la API a nuestro formato
-                    for item in batch_data:
-                        timestamp_ms, open_price, high, low, close, volume, close_time, *_ = item
-                        
-                        data.append({
-                            'timestamp': timestamp_ms // 1000,  # Convertir a segundos
-                            'open': float(open_price),
-                            'high': float(high),
-                            'low': float(low),
-                            'close': float(close),
-                            'volume': float(volume),
-                            'market_cap': float(close) * float(volume)  # Estimación
-                        })
-                    
-                    if len(batch_data) < 1000:
-                        break
-                    
-                    # Establecer siguiente punto de inicio
-                    current_start = batch_data[-1][0] + 1
+                # Convertir cada página a una matriz numérica de una vez, respetando el orden de las ventanas
+                # [timestamp_ms, open, high, low, close, volume]
+                matrices = [np.asarray([fila[:6] for fila in batch_data], dtype=np.float64)
+                            for batch_data in paginas if batch_data]
+                velas = np.concatenate(matrices) if matrices else np.empty((0, 6))
+                
+                data = pd.DataFrame({
+                    'timestamp': velas[:, 0].astype(np.int64) // 1000,  # Convertir a segundos
+                    'open': velas[:, 1],
+                    'high': velas[:, 2],
+                    'low': velas[:, 3],
+                    'close': velas[:, 4],
+                    'volume': velas[:, 5]
+                })
+                # Estimación de la capitalización: un único producto vectorial sobre las columnas ya contiguas
+                data['market_cap'] = data['close'].to_numpy() * data['volume'].to_numpy()
                 
                 self.logger.info(f"Datos extraídos de la API: {len(data)} registros")
             else:
@@ -116,12 +269,14 @@ class Extractor:
                 self.logger.warning("Clave API no válida, generando datos sintéticos")
                 data = self._generar_datos_sinteticos(fecha_inicio, fecha_fin)
             
-            # Crear DataFrame a partir de los datos
-            df = pd.DataFrame(data)
+            # Ambas ramas ya devuelven un DataFrame columnar
+            df = data
             
-            # Convertir la columna de timestamp a datetime
-            df['fecha'] = pd.to_datetime(df['timestamp'], unit='s')
-            df = df.set_index('fecha')
+            # Índice de fechas reinterpretando los segundos UNIX como datetime64, sin el parser genérico
+            df.index = pd.DatetimeIndex(
+                df['timestamp'].to_numpy().astype('datetime64[s]').astype('datetime64[ns]'),
+                name='fecha'
+            )
             
             self.logger.info(f"Datos extraídos con éxito: {len(df)} registros")
             
@@ -131,6 +286,65 @@ class Extractor:
             self.logger.error(f"Error al extraer datos: {str(e)}")
             raise
     
+    def _obtener_pagina_cacheada(self, endpoint, params):
+        """
+        Obtiene una ventana de velas consultando antes la caché en disco
+        
+        Args:
+            endpoint (str): URL del endpoint de klines
+            params (dict): Parámetros de la solicitud, incluida la ventana temporal
+            
+        Returns:
+            list: Velas de la ventana
+        """
+        if self._cache is None:
+            return self._obtener_pagina(endpoint, params)
+        
+        clave = hashlib.md5(
+            f"{params['symbol']}|{params['interval']}|{params['startTime']}|{params['endTime']}".encode()
+        ).hexdigest()
+        batch_data = self._cache.get(clave)
+        if batch_data is not None:
+            self.logger.debug(f"Página de klines servida desde caché: {clave}")
+            return batch_data
+        
+        batch_data = self._obtener_pagina(endpoint, params)
+        # Solo se guardan páginas completas o cuyas velas ya están cerradas
+        if batch_data and (len(batch_data) == _LIMITE_VELAS
+                           or batch_data[-1][6] < (time.time() - 86400) * 1000):
+            self._cache.set(clave, batch_data)
+        return batch_data
+    
+    def _obtener_pagina(self, endpoint, params):
+        """
+        Descarga una ventana de velas de la API
+        
+        Args:
+            endpoint (str): URL del endpoint de klines
+            params (dict): Parámetros de la solicitud, incluida la ventana temporal
+            
+        Returns:
+            list: Velas devueltas por la API (vacía si la ventana no tiene datos)
+        """
+        # Implementar limitación de tasa; los reintentos con espera los gestiona la sesión
+        self._throttle()
+        
+        try:
+            response = self._session.get(endpoint, params=params, timeout=10)
+            response.raise_for_status()
+            batch_data = _leer_json(response)
+        except (IndexError, ValueError) as e:
+            self.logger.error(f"Error procesando datos de la API: {str(e)}")
+            return []
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error en la solicitud a la API de Basescan: {str(e)}")
+            raise
+        
+        if not batch_data:
+            self.logger.warning(f"No se obtuvieron datos para el periodo {datetime.fromtimestamp(params['startTime']/1000)}")
+            return []
+        return batch_data
+    
     def _generar_datos_sinteticos(self, fecha_inicio, fecha_fin):
         """
         Genera datos sinteticos para desarrollo y pruebas
@@ -140,25 +354,26 @@ class Extractor:
             fecha_fin (datetime): Fecha fin
             
         Returns:
-            list: Lista de diccionarios con datos sintéticos
+            pd.DataFrame: DataFrame con los datos sintéticos
         """
-        import numpy as np
-        
         self.logger.warning("Generando datos sintéticos. En producción, use la API real.")
         
         # Crear rango de fechas
         dias = (fecha_fin - fecha_inicio).days + 1
-        fechas = [fecha_inicio + timedelta(days=i) for i in range(dias)]
-        timestamps = [int(fecha.timestamp()) for fecha in fechas]
+        # Un único array de tamaño conocido, sin listas intermedias que crecen
+        timestamps = np.fromiter(
+            (int((fecha_inicio + timedelta(days=i)).timestamp()) for i in range(dias)),
+            dtype=np.int64, count=dias
+        )
         
         # Precio inicial
         precio_base = 40000  # BTC precio base
         
         # Generar precios con tendencia alcista y volatilidad realista
-        np.random.seed(42)  # Para reproducibilidad
+        rng = self._rng
         
         # Simular cambios diarios con volatilidad del 3% (realista para BTC)
-        cambios_diarios = np.random.normal(0.001, 0.03, dias)  # Media ligeramente positiva
+        cambios_diarios = rng.normal(0.001, 0.03, dias)  # Media ligeramente positiva
         
         # Simular algunas tendencias y volatilidad estacional
         tendencia = np.linspace(0, 0.3, dias)  # Tendencia alcista general
@@ -171,33 +386,30 @@ class Extractor:
         precios_relativos = np.cumprod(1 + cambios)
         precios = precio_base * precios_relativos
         
-        # Generar datos simulados para cada día
-        data = []
-        for i, ts in enumerate(timestamps):
-            precio = precios[i]
-            high = precio * (1 + abs(np.random.normal(0, 0.01)))
-            low = precio * (1 - abs(np.random.normal(0, 0.01)))
-            open_price = precio * (1 + np.random.normal(0, 0.005))
-            
-            # Volumen correlacionado con la volatilidad
-            volumen = 1000 + 5000 * abs(cambios_diarios[i]) * (1 + np.random.normal(0, 0.5))
-            
-            # Simular algunas anomalías
-            if np.random.random() < 0.05:  # 5% de probabilidad de anomalía
-                precio *= (1 + np.random.choice([-1, 1]) * np.random.uniform(0.05, 0.15))
-                volumen *= np.random.uniform(2, 5)
-            
-            data.append({
-                'timestamp': ts,
-                'open': round(open_price, 2),
-                'high': round(high, 2),
-                'low': round(low, 2),
-                'close': round(precio, 2),
-                'volume': round(volumen, 2),
-                'market_cap': round(precio * volumen, 2)
-            })
-        
-        return data
+        # Ruido diario de todas las columnas, generado de una vez para todo el rango
+        high = precios * (1 + np.abs(rng.normal(0, 0.01, dias)))
+        low = precios * (1 - np.abs(rng.normal(0, 0.01, dias)))
+        open_price = precios * (1 + rng.normal(0, 0.005, dias))
+        
+        # Volumen correlacionado con la volatilidad
+        volumen = 1000 + 5000 * np.abs(cambios_diarios) * (1 + rng.normal(0, 0.5, dias))
+        
+        # Simular algunas anomalías (5% de probabilidad por día)
+        anomalias = rng.random(dias) < 0.05
+        signo = rng.choice([-1, 1], dias)
+        magnitud = rng.uniform(0.05, 0.15, dias)
+        precios = np.where(anomalias, precios * (1 + signo * magnitud), precios)
+        volumen = np.where(anomalias, volumen * rng.uniform(2, 5, dias), volumen)
+        
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'open': open_price.round(2),
+            'high': high.round(2),
+            'low': low.round(2),
+            'close': precios.round(2),
+            'volume': volumen.round(2),
+            'market_cap': (precios * volumen).round(2)
+        })
 
     def extraer_datos_tiempo_real(self, divisa="BTC"):
         """
@@ -209,84 +421,116 @@ class Extractor:
         Returns:
             dict: Datos en tiempo real
         """
-        self.logger.info(f"Extrayendo datos en tiempo real para {divisa}")
-        
+        # Una única consulta a /ticker/24hr (que ya incluye el último precio), con caché y respaldo
         try:
-            # Verificar si hay clave API válida
-            if self.api_key and self.api_key != "TU_CLAVE_API_AQUI":
-                # Endpoint para datos en tiempo real (últimos precios)
-                endpoint = f"{self.api_url}/v1/ticker/price"
-                
-                params = {
-                    'apikey': self.api_key,
-                    'symbol': f"{divisa}USDT"
-                }
-                
-                # También consultamos datos de volumen de las últimas 24h
-                endpoint_stats = f"{self.api_url}/v1/ticker/24hr"
-                
-                # Implementar limitación de tasa
-                time.sleep(1.0 / self.rate_limit)
+            return self.extraer_datos_tiempo_real_batch([divisa])[divisa]
+        except Exception as e:
+            self.logger.error(f"Error al extraer datos en tiempo real: {str(e)}", exc_info=True)
+            return self._generar_datos_tiempo_real(divisa)
+    
+    def extraer_datos_tiempo_real_batch(self, divisas):
+        """
+        Extrae datos en tiempo real de varias criptomonedas con una sola solicitud
+        
+        Args:
+            divisas (list): Símbolos de las criptomonedas
+            
+        Returns:
+            dict: Datos en tiempo real por divisa
+        """
+        ahora = time.monotonic()
+        resultados = {}
+        pendientes = []
+        for divisa in divisas:
+            entrada = self._rt_cache.get(divisa)
+            if entrada and ahora - entrada[0] < self._rt_ttl:
+                resultados[divisa] = entrada[1]
+            else:
+                pendientes.append(divisa)
+        
+        if not pendientes:
+            return resultados
+        
+        self.logger.info(f"Extrayendo datos en tiempo real para {', '.join(pendientes)}")
+        
+        if self.api_key and self.api_key != "TU_CLAVE_API_AQUI":
+            # El endpoint de 24h admite una lista de símbolos y ya incluye el último precio
+            endpoint_stats = f"{self.api_url}/v1/ticker/24hr"
+            params = {
+                'apikey': self.api_key,
+                'symbols': json.dumps([f"{divisa}USDT" for divisa in pendientes], separators=(',', ':'))
+            }
+            
+            # Implementar limitación de tasa
+            self._throttle()
+            
+            try:
+                response = self._session.get(endpoint_stats, params=params, timeout=5)
+                response.raise_for_status()
+                stats_por_simbolo = {item['symbol']: item for item in _leer_json(response)}
                 
-                try:
-                    response = requests.get(endpoint, params=params, timeout=5)
-                    response.raise_for_status()
-                    price_data = response.json()
-                    
-                    time.sleep(1.0 / self.rate_limit)
-                    
-                    response_stats = requests.get(endpoint_stats, params=params, timeout=5)
-                    response_stats.raise_for_status()
-                    stats_data = response_stats.json()
-                    
-                    # Combinar datos de ambos endpoints
-                    return {
+                timestamp = int(datetime.now().timestamp())
+                for divisa in pendientes:
+                    stats_data = stats_por_simbolo.get(f"{divisa}USDT")
+                    if stats_data is None:
+                        continue
+                    resultado = {
                         'symbol': divisa,
-                        'price': float(price_data['price']),
+                        'price': float(stats_data['lastPrice']),
                         'volume_24h': float(stats_data['volume']),
                         'change_24h': float(stats_data['priceChangePercent']),
-                        'timestamp': int(datetime.now().timestamp())
+                        'timestamp': timestamp
                     }
-                except (requests.exceptions.RequestException, KeyError, ValueError) as e:
-                    self.logger.error(f"Error obteniendo datos en tiempo real: {str(e)}")
-                    # En caso de error, generar datos ficticios
-                    return self._generar_datos_tiempo_real(divisa)
-            else:
-                return self._generar_datos_tiempo_real(divisa)
-                
-        except Exception as e:
-            self.logger.error(f"Error al extraer datos en tiempo real: {str(e)}", exc_info=True)
-            return self._generar_datos_tiempo_real(divisa)
+                    self._rt_cache[divisa] = (time.monotonic(), resultado)
+                    resultados[divisa] = resultado
+            except (requests.exceptions.RequestException, KeyError, TypeError, ValueError) as e:
+                self.logger.error(f"Error obteniendo datos en tiempo real: {str(e)}")
+        
+        # Las divisas sin respuesta válida reciben datos ficticios
+        for divisa in pendientes:
+            if divisa not in resultados:
+                resultados[divisa] = self._generar_datos_tiempo_real(divisa)
+        
+        return resultados
     
     def _generar_datos_tiempo_real(self, divisa):
         """
         Genera datos ficticios en tiempo real para desarrollo
         """
         self.logger.warning("Generando datos en tiempo real ficticios")
-        import random
-        precio_actual = 40000 + random.uniform(-2000, 2000)
+        precio_actual = 40000 + self._rng.uniform(-2000, 2000)
         
         return {
             'symbol': divisa,
             'price': precio_actual,
-            'volume_24h': 1000000000 + random.uniform(-100000000, 100000000),
+            'volume_24h': 1000000000 + self._rng.uniform(-100000000, 100000000),
             'timestamp': int(datetime.now().timestamp())
         }
 
     def guardar_datos(self, df, ruta_archivo):
         """
-        Guarda los datos en un archivo CSV
+        Guarda los datos en un archivo Parquet, Feather o CSV según la extensión
         
         Args:
             df (pd.DataFrame): DataFrame con los datos
             ruta_archivo (str): Ruta donde guardar el archivo
         """
-        # Asegurarse de que el directorio existe
-        os.makedirs(os.path.dirname(ruta_archivo), exist_ok=True)
+        # Asegurarse de que el directorio existe (una sola vez por directorio; '' es el actual)
+        directorio = os.path.dirname(ruta_archivo)
+        if directorio and directorio not in self._mkdir_cache:
+            os.makedirs(directorio, exist_ok=True)
+            self._mkdir_cache.add(directorio)
         
         try:
             # Guardar el DataFrame
-            df.to_csv(ruta_archivo)
+            ruta = str(ruta_archivo)
+            if ruta.endswith('.parquet'):
+                df.to_parquet(ruta_archivo, engine='pyarrow', compression='zstd')
+            elif ruta.endswith('.feather'):
+                # Feather no admite índices no triviales: la fecha se guarda como columna
+                df.reset_index().to_feather(ruta_archivo)
+            else:
+                df.to_csv(ruta_archivo)
             self.logger.info(f"Datos guardados en {ruta_archivo}")
         except Exception as e:
             self.logger.error(f"Error al guardar datos en {ruta_archivo}: {str(e)}")
@@ -294,31 +538,43 @@ class Extractor:
 
     def cargar_datos(self, ruta_archivo):
         """
-        Carga datos desde un archivo CSV
+        Carga datos desde un archivo Parquet, Feather o CSV según la extensión
         
         Args:
             ruta_archivo (str): Ruta del archivo a cargar
-            ruta_archivo (str): Ruta del archivo a cargar
             
         Returns:
             pd.DataFrame: DataFrame con los datos cargados
         """
-        if not os.path.exists(ruta_archivo):
-            self.logger.error(f"El archivo {ruta_archivo} no existe")
-            raise FileNotFoundError(f"El archivo {ruta_archivo} no existe")
-        
         try:
             self.logger.info(f"Cargando datos desde {ruta_archivo}")
-            df = pd.read_csv(ruta_archivo)
+            ruta = str(ruta_archivo)
+            if ruta.endswith('.parquet'):
+                # Parquet conserva tipos e índice: no hace falta reconvertir nada
+                return pd.read_parquet(ruta_archivo, engine='pyarrow')
+            if ruta.endswith('.feather'):
+                df = pd.read_feather(ruta_archivo)
+                return df.set_index('fecha') if 'fecha' in df.columns else df
             
-            # Si hay una columna fecha, convertirla a datetime y establecerla como índice
-            if 'fecha' in df.columns:
-                df['fecha'] = pd.to_datetime(df['fecha'])
+            # Leer solo la cabecera para decidir índice y tipos antes de la carga completa
+            columnas = pd.read_csv(ruta_archivo, nrows=0).columns
+            tiene_fecha = 'fecha' in columnas
+            
+            # Lector CSV multihilo de Arrow; la columna fecha se pasa a índice después porque
+            # este motor no admite index_col junto con dtype
+            df = pd.read_csv(
+                ruta_archivo,
+                engine='pyarrow',
+                dtype={col: np.float64 for col in _COLUMNAS_PRECIO if col in columnas}
+            )
+            if tiene_fecha:
+                df['fecha'] = pd.to_datetime(df['fecha']).astype('datetime64[ns]')
                 df = df.set_index('fecha')
-            elif df.index.name == 'fecha':
-                df.index = pd.to_datetime(df.index)
                 
             return df
+        except FileNotFoundError:
+            self.logger.error(f"El archivo {ruta_archivo} no existe")
+            raise
         except Exception as e:
             self.logger.error(f"Error al cargar datos desde {ruta_archivo}: {str(e)}")
             raise
@@ -4,18 +4,138 @@ Modulo mejorado para la extraccion de datos historicos de criptomonedas desde AP
 
 import os
 import time
+import random
+import hashlib
+import functools
 import logging
+import threading
 import requests
+import numpy as np
 import pandas as pd
 import json
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional, se usa el decodificador de requests como respaldo
+    orjson = None
+
+# Errores de decodificación de JSON (requests.JSONDecodeError deriva de json.JSONDecodeError)
+_ERRORES_JSON = (json.JSONDecodeError,) + ((orjson.JSONDecodeError,) if orjson is not None else ())
+
+# Duración de una vela por intervalo (ms) y máximo de velas por página de la API
+_INTERVALOS_MS = {'1d': 86_400_000}
+_LIMITE_VELAS = 1000
+
+# Validez de las respuestas cacheadas por prefijo de endpoint (segundos)
+_TTL_CACHE = (('/v1/klines', 90 * 86400), ('/v1/ticker', 60))
+
+def _normalizar_fecha(fecha):
+    """
+    Normaliza una fecha recibida como datetime o como timestamp UNIX
+    
+    Args:
+        fecha (datetime | int): Fecha o timestamp en segundos
+        
+    Returns:
+        tuple: (timestamp en segundos, datetime)
+    """
+    if isinstance(fecha, datetime):
+        return int(fecha.timestamp()), fecha
+    return int(fecha), datetime.fromtimestamp(fecha)
+
+def _ventanas_paginacion(inicio_ms, fin_ms, intervalo_ms, limite=_LIMITE_VELAS):
+    """
+    Divide el rango [inicio_ms, fin_ms] en ventanas de como máximo `limite` velas
+    
+    Args:
+        inicio_ms (int): Inicio del rango en milisegundos
+        fin_ms (int): Fin del rango en milisegundos
+        intervalo_ms (int): Duración de una vela en milisegundos
+        limite (int): Número máximo de velas por ventana
+        
+    Returns:
+        list: Lista de tuplas (startTime, endTime) en orden cronológico
+    """
+    paso = intervalo_ms * limite
+    return [(inicio, min(inicio + paso - 1, fin_ms)) for inicio in range(inicio_ms, fin_ms, paso)]
+
+def _leer_json(response):
+    """
+    Decodifica el cuerpo JSON de una respuesta, con orjson si está disponible
+    
+    Args:
+        response (requests.Response): Respuesta HTTP
+        
+    Returns:
+        dict | list: Contenido decodificado
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+class _FileCache:
+    """
+    Cache de respuestas JSON en disco con caducidad, con una capa en memoria delante
+    
+    Cada entrada se guarda en {directorio}/{slug del endpoint}/{clave}.json junto con
+    el instante de escritura, de modo que la validez se decide al leer.
+    """
+    
+    def __init__(self, directorio):
+        """
+        Args:
+            directorio (str | Path): Directorio raíz de la caché
+        """
+        self.directorio = directorio
+        self._memoria = {}  # clave -> (instante de escritura, datos)
+    
+    def _ruta(self, endpoint, clave):
+        slug = endpoint.strip('/').replace('/', '_') or 'raiz'
+        return os.path.join(self.directorio, slug, f"{clave}.json")
+    
+    def get(self, endpoint, clave, ttl):
+        """
+        Devuelve los datos cacheados, o None si no existen o tienen más de `ttl` segundos
+        """
+        entrada = self._memoria.get(clave)
+        if entrada is None:
+            try:
+                with open(self._ruta(endpoint, clave), encoding='utf-8') as f:
+                    guardado = json.load(f)
+            except (OSError, ValueError):
+                return None
+            entrada = (guardado.get('ts', 0), guardado.get('data'))
+            self._memoria[clave] = entrada
+        
+        if time.time() - entrada[0] > ttl:
+            return None
+        return entrada[1]
+    
+    def set(self, endpoint, clave, datos):
+        """
+        Guarda los datos en memoria y en disco (escritura atómica mediante archivo temporal)
+        """
+        entrada = (time.time(), datos)
+        self._memoria[clave] = entrada
+        
+        ruta = self._ruta(endpoint, clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'ts': entrada[0], 'data': datos}, f)
+        os.replace(temporal, ruta)
 
 class Extractor:
     """
     Clase para la extraccion de datos historicos de criptomonedas
     """
     
-    def __init__(self, api_key, api_url, rate_limit=5, timeout=30, max_retries=3):
+    def __init__(self, api_key, api_url, rate_limit=5, timeout=30, max_retries=3, cache_dir=None,
+                 rt_ttl=5):
         """
         Inicializa el extractor de datos
         
@@ -25,14 +145,33 @@ class Extractor:
             rate_limit (int): Límite de solicitudes por segundo
             timeout (int): Tiempo máximo de espera para solicitudes en segundos
             max_retries (int): Número máximo de reintentos para solicitudes fallidas
+            cache_dir (str | Path, optional): Directorio de la caché de respuestas (None la desactiva)
+            rt_ttl (float): Segundos durante los que se reutilizan los datos en tiempo real
         """
         self.api_key = api_key
         self.api_url = api_url
         self.rate_limit = rate_limit
         self.timeout = timeout
         self.max_retries = max_retries
+        self._cache = _FileCache(cache_dir) if cache_dir else None
         self.session = requests.Session()  # Usar una sesión para mejor rendimiento
         
+        # Pool de conexiones amplio y reintentos de urllib3 para errores de red y 5xx;
+        # los 429 se gestionan solo en _make_api_request (Retry-After con jitter): sin
+        # respect_retry_after_header=False urllib3 también reintentaría cualquier 429
+        # con Retry-After, fuera de status_forcelist y sin límite de espera
+        reintentos = Retry(
+            total=max_retries,
+            backoff_factor=0.1,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=frozenset({'GET'}),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adaptador = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=reintentos)
+        self.session.mount('https://', adaptador)
+        self.session.mount('http://', adaptador)
+        
         # Configurar headers comunes para las solicitudes
         self.session.headers.update({
             'User-Agent': 'MineriaDatosApp/1.0',
@@ -40,149 +179,215 @@ class Extractor:
         })
         
         self.logger = logging.getLogger(__name__)
+        
+        # Memoización por instancia de los datos en tiempo real, por ventanas de rt_ttl segundos
+        self.rt_ttl = rt_ttl
+        self._tiempo_real_cacheado = functools.lru_cache(maxsize=64)(self._extraer_tiempo_real_api)
+        
+        # Limitación de tasa: instante a partir del cual se puede lanzar la siguiente solicitud
+        self._next_allowed = 0.0
+        self._bucket_lock = threading.Lock()
     
-    def _make_api_request(self, endpoint, params, retry_count=0):
+    def _throttle(self):
+        """
+        Espera solo lo que falte para respetar el límite de solicitudes por segundo
+        
+        Si la solicitud anterior ya tardó más que el intervalo, no se duerme. Es seguro
+        entre los hilos que descargan páginas en paralelo.
+        """
+        with self._bucket_lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + 1.0 / self.rate_limit
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _make_api_request(self, endpoint, params):
         """
         Realiza una solicitud a la API con manejo de errores y reintentos
         
         Args:
             endpoint (str): Endpoint de la API
             params (dict): Parámetros para la solicitud
-            retry_count (int): Contador de reintentos
             
         Returns:
             dict or list: Datos de respuesta de la API
         """
         full_url = f"{self.api_url}{endpoint}"
-        params['apikey'] = self.api_key
         
-        try:
-            # Aplicar limitación de tasa
-            time.sleep(1.0 / self.rate_limit)
-            
-            # Realizar la solicitud
-            self.logger.debug(f"Solicitando {full_url} con parámetros: {params}")
-            response = self.session.get(full_url, params=params, timeout=self.timeout)
-            
-            # Registrar detalles de la respuesta para diagnóstico
-            self.logger.debug(f"Estado de respuesta: {response.status_code}, Longitud: {len(response.content)}")
-            
-            # Verificar si la respuesta es exitosa
-            response.raise_for_status()
-            
-            # Intentar decodificar la respuesta como JSON
-            data = response.json()
-            return data
-            
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if hasattr(e, 'response') else "desconocido"
-            
-            # Registrar información detallada sobre el error
-            self.logger.error(f"Error HTTP {status_code} en solicitud a {full_url}")
-            self.logger.error(f"Parámetros: {params}")
-            
-            if hasattr(e, 'response'):
-                self.logger.error(f"Respuesta de error: {e.response.text[:1000]}")
-            
-            # Errores específicos
-            if status_code == 403:
-                self.logger.error("Error 403 Forbidden: Problemas con la autenticación de la API key")
-                self.logger.info("Sugerencias: 1) Verificar que la API key es correcta, 2) Revisar permisos, 3) Comprobar restricciones IP")
-            elif status_code == 429:
-                self.logger.warning("Error 429 Too Many Requests: Límite de tasa excedido")
-                if retry_count < self.max_retries:
-                    wait_time = min(30, 2 ** retry_count)  # Espera exponencial
-                    self.logger.info(f"Esperando {wait_time} segundos antes de reintentar...")
-                    time.sleep(wait_time)
-                    return self._make_api_request(endpoint, params, retry_count + 1)
-            
-            # Reintentar con errores 5xx
-            if status_code >= 500 and retry_count < self.max_retries:
-                wait_time = min(30, 2 ** retry_count)
-                self.logger.info(f"Error del servidor, reintentando en {wait_time} segundos...")
-                time.sleep(wait_time)
-                return self._make_api_request(endpoint, params, retry_count + 1)
+        # Consultar la caché (la clave no incluye la API key, que solo va en la copia de la solicitud)
+        clave_cache = ttl_cache = None
+        if self._cache is not None:
+            ttl_cache = next((ttl for prefijo, ttl in _TTL_CACHE if endpoint.startswith(prefijo)), None)
+            if ttl_cache is not None:
+                clave_cache = hashlib.md5(
+                    json.dumps(
+                        {'endpoint': endpoint, 'params': params},
+                        sort_keys=True
+                    ).encode()
+                ).hexdigest()
+                data = self._cache.get(endpoint, clave_cache, ttl_cache)
+                if data is not None:
+                    self.logger.debug("Respuesta servida desde caché para %s", endpoint)
+                    return data
+        
+        # Copia con la API key: el diccionario del llamador no se modifica (seguro entre hilos)
+        req_params = {**params, 'apikey': self.api_key}
+        
+        # Reintentos iterativos: cada rama de error decide si hay espera antes del siguiente intento
+        for retry_count in range(self.max_retries + 1):
+            espera = None
+            try:
+                # Aplicar limitación de tasa
+                self._throttle()
+                
+                # Realizar la solicitud (los mensajes de depuración solo se formatean si se van a emitir)
+                depurando = self.logger.isEnabledFor(logging.DEBUG)
+                if depurando:
+                    self.logger.debug("Solicitando %s con parámetros: %s", full_url, params)
+                response = self.session.get(full_url, params=req_params, timeout=self.timeout)
+                
+                # Registrar detalles de la respuesta para diagnóstico
+                if depurando:
+                    self.logger.debug("Estado de respuesta: %s, Longitud: %d", response.status_code, len(response.content))
                 
-        except requests.exceptions.ConnectionError as e:
-            self.logger.error(f"Error de conexión: {str(e)}")
-            if retry_count < self.max_retries:
-                wait_time = min(30, 2 ** retry_count)
-                self.logger.info(f"Problema de conexión, reintentando en {wait_time} segundos...")
-                time.sleep(wait_time)
-                return self._make_api_request(endpoint, params, retry_count + 1)
+                # Verificar si la respuesta es exitosa
+                response.raise_for_status()
+                
+                # Intentar decodificar la respuesta como JSON
+                data = _leer_json(response)
+                if clave_cache is not None and self._es_cacheable(endpoint, data):
+                    self._cache.set(endpoint, clave_cache, data)
+                return data
                 
-        except requests.exceptions.Timeout as e:
-            self.logger.error(f"Timeout en la solicitud: {str(e)}")
-            if retry_count < self.max_retries:
-                wait_time = min(30, 2 ** retry_count)
-                self.logger.info(f"Tiempo de espera agotado, reintentando en {wait_time} segundos...")
-                time.sleep(wait_time)
-                return self._make_api_request(endpoint, params, retry_count + 1)
+            except requests.exceptions.HTTPError as e:
+                status_code = e.response.status_code if e.response is not None else "desconocido"
                 
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Error al decodificar respuesta JSON: {str(e)}")
-            self.logger.error(f"Respuesta recibida: {response.text[:200]}...")
+                # Registrar información detallada sobre el error
+                self.logger.error(f"Error HTTP {status_code} en solicitud a {full_url}")
+                self.logger.error(f"Parámetros: {params}")
+                
+                if e.response is not None:
+                    self.logger.error(f"Respuesta de error: {e.response.text[:1000]}")
+                
+                # Errores específicos
+                if status_code == 403:
+                    self.logger.error("Error 403 Forbidden: Problemas con la autenticación de la API key")
+                    self.logger.info("Sugerencias: 1) Verificar que la API key es correcta, 2) Revisar permisos, 3) Comprobar restricciones IP")
+                elif status_code == 429:
+                    self.logger.warning("Error 429 Too Many Requests: Límite de tasa excedido")
+                    # Si el servidor indica cuánto esperar, no se reintenta antes
+                    espera = max(self._retry_after(e.response), self._espera_reintento(retry_count))
+                    
+            except requests.exceptions.ConnectionError as e:
+                # urllib3 ya ha agotado sus reintentos de conexión
+                self.logger.error(f"Error de conexión: {str(e)}")
+                    
+            except requests.exceptions.Timeout as e:
+                self.logger.error(f"Timeout en la solicitud: {str(e)}")
+                    
+            except _ERRORES_JSON as e:
+                # Solo errores de decodificación: la respuesta ya existe (MissingSchema o
+                # InvalidURL también derivan de ValueError pero se lanzan antes de tenerla)
+                self.logger.error(f"Error al decodificar respuesta JSON: {str(e)}")
+                self.logger.error(f"Respuesta recibida: {response.text[:200]}...")
+                
+            except Exception as e:
+                self.logger.error(f"Error inesperado: {str(e)}", exc_info=True)
             
-        except Exception as e:
-            self.logger.error(f"Error inesperado: {str(e)}", exc_info=True)
+            # Errores no recuperables o reintentos agotados
+            if espera is None or retry_count >= self.max_retries:
+                break
             
+            self.logger.info(f"Reintentando en {espera:.2f} segundos...")
+            time.sleep(espera)
+        
         # Si llegamos aquí, todos los intentos fallaron
         if retry_count >= self.max_retries:
             self.logger.error(f"Se alcanzó el número máximo de reintentos ({self.max_retries})")
         
         return None
+    
+    @staticmethod
+    def _espera_reintento(retry_count):
+        """
+        Espera exponencial con jitter (desde 100 ms, máximo 30 s) para el reintento indicado
+        """
+        base = min(30, 0.1 * 2 ** retry_count)
+        return base * (0.5 + random.random())
+    
+    @staticmethod
+    def _retry_after(response):
+        """
+        Segundos indicados por la cabecera Retry-After (0 si no hay o no es numérica)
+        """
+        try:
+            return float(response.headers.get('Retry-After', 0))
+        except (AttributeError, TypeError, ValueError):
+            return 0.0
+    
+    @staticmethod
+    def _es_cacheable(endpoint, data):
+        """
+        Indica si una respuesta puede guardarse en caché
         
+        Las páginas de klines solo se guardan si todas sus velas están cerradas,
+        porque la última vela del día en curso todavía cambia.
+        """
+        if not data:
+            return False
+        if endpoint.startswith('/v1/klines'):
+            return data[-1][6] < time.time() * 1000
+        return True
+    
     def extraer_datos_historicos(self, fecha_inicio, fecha_fin, divisa="BTC"):
         """
         Extrae datos historicos de precio y volumen para una criptomoneda
         
         Args:
-            fecha_inicio (datetime): Fecha de inicio para los datos
-            fecha_fin (datetime): Fecha final para los datos
+            fecha_inicio (datetime | int): Fecha de inicio (o timestamp UNIX en segundos)
+            fecha_fin (datetime | int): Fecha final (o timestamp UNIX en segundos)
             divisa (str): Simbolo de la criptomoneda (default: "BTC")
             
         Returns:
             pd.DataFrame: DataFrame con los datos historicos
         """
+        # Se prefieren timestamps UNIX ya calculados; las fechas se convierten una sola vez
+        inicio_ts, fecha_inicio = _normalizar_fecha(fecha_inicio)
+        fin_ts, fecha_fin = _normalizar_fecha(fecha_fin)
+        
         self.logger.info(f"Extrayendo datos históricos para {divisa} desde {fecha_inicio} hasta {fecha_fin}")
         
-        # Convertir fechas a formato timestamp para la API
-        inicio_ts = int(fecha_inicio.timestamp())
-        fin_ts = int(fecha_fin.timestamp())
+        # Sin clave API válida no hay nada que consultar: datos sintéticos directamente
+        if not self.api_key or self.api_key == "TU_CLAVE_API_AQUI":
+            self.logger.warning("Clave API no válida o no proporcionada, generando datos sintéticos")
+            return self._crear_dataframe(self._generar_datos_sinteticos(fecha_inicio, fecha_fin))
         
         try:
-            # Verificar si hay una clave API válida
-            if self.api_key and self.api_key != "TU_CLAVE_API_AQUI":
-                # Intentar primero con Basescan.org
-                datos_basescan = self._extraer_datos_basescan(inicio_ts, fin_ts, divisa)
-                
-                if datos_basescan and len(datos_basescan) > 0:
-                    self.logger.info(f"Datos extraídos con éxito de Basescan: {len(datos_basescan)} registros")
-                    return self._crear_dataframe(datos_basescan)
-                
-                # Si Basescan falla, intentar con API alternativa
-                datos_alternativos = self._extraer_datos_alternativos(inicio_ts, fin_ts, divisa)
-                
-                if datos_alternativos and len(datos_alternativos) > 0:
-                    self.logger.info(f"Datos extraídos de API alternativa: {len(datos_alternativos)} registros")
-                    return self._crear_dataframe(datos_alternativos)
-                    
-                # Si ambas APIs fallan, generar datos sintéticos
-                self.logger.warning("Todas las APIs fallaron, generando datos sintéticos")
-                datos_sinteticos = self._generar_datos_sinteticos(fecha_inicio, fecha_fin)
-                return self._crear_dataframe(datos_sinteticos)
-            else:
-                # Si no hay clave API válida, usar datos sintéticos
-                self.logger.warning("Clave API no válida o no proporcionada, generando datos sintéticos")
-                datos_sinteticos = self._generar_datos_sinteticos(fecha_inicio, fecha_fin)
-                return self._crear_dataframe(datos_sinteticos)
+            # Intentar primero con Basescan.org
+            datos_basescan = self._extraer_datos_basescan(inicio_ts, fin_ts, divisa)
+            
+            if datos_basescan is not None and not datos_basescan.empty:
+                self.logger.info(f"Datos extraídos con éxito de Basescan: {len(datos_basescan)} registros")
+                return self._crear_dataframe(datos_basescan)
+            
+            # Si Basescan falla, intentar con API alternativa
+            datos_alternativos = self._extraer_datos_alternativos(inicio_ts, fin_ts, divisa)
+            
+            if datos_alternativos is not None and not datos_alternativos.empty:
+                self.logger.info(f"Datos extraídos de API alternativa: {len(datos_alternativos)} registros")
+                return self._crear_dataframe(datos_alternativos)
                 
         except Exception as e:
             self.logger.error(f"Error al extraer datos: {str(e)}", exc_info=True)
             # En caso de error, generar datos sintéticos
             self.logger.warning("Generando datos sintéticos debido a errores")
-            datos_sinteticos = self._generar_datos_sinteticos(fecha_inicio, fecha_fin)
-            return self._crear_dataframe(datos_sinteticos)
+            return self._crear_dataframe(self._generar_datos_sinteticos(fecha_inicio, fecha_fin))
+        
+        # Si ambas APIs fallan, generar datos sintéticos
+        self.logger.warning("Todas las APIs fallaron, generando datos sintéticos")
+        return self._crear_dataframe(self._generar_datos_sinteticos(fecha_inicio, fecha_fin))
     
     def _extraer_datos_basescan(self, inicio_ts, fin_ts, divisa):
         """
@@ -194,55 +399,57 @@ class Extractor:
             divisa (str): Símbolo de la criptomoneda
             
         Returns:
-            list: Lista de datos históricos
+            pd.DataFrame: Datos históricos, o None si no se obtuvo ninguna página
         """
         self.logger.info(f"Intentando extracción de datos desde Basescan para {divisa}")
         
         endpoint = "/v1/klines"
+        intervalo = '1d'
         
-        data = []
-        current_start = inicio_ts * 1000
-        
-        # Hacer múltiples llamadas si el período es grande (paginación)
-        while current_start < fin_ts * 1000:
-            params = {
+        # Las ventanas de paginación se conocen de antemano, así que se piden en paralelo
+        ventanas = _ventanas_paginacion(inicio_ts * 1000, fin_ts * 1000, _INTERVALOS_MS[intervalo])
+        paginas_params = [
+            {
                 'symbol': f"{divisa}USDT",
-                'interval': '1d',
-                'startTime': current_start,
-                'endTime': fin_ts * 1000,
-                'limit': 1000  # Máximo número de registros
+                'interval': intervalo,
+                'startTime': inicio,
+                'endTime': fin,
+                'limit': _LIMITE_VELAS  # Máximo número de registros
             }
-            
-            batch_data = self._make_api_request(endpoint, params)
-            
+            for inicio, fin in ventanas
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.rate_limit, len(ventanas)))) as executor:
+            paginas = list(executor.map(lambda p: self._make_api_request(endpoint, p), paginas_params))
+        
+        # Procesar las páginas en el orden original de las ventanas
+        lotes = []
+        for params, batch_data in zip(paginas_params, paginas):
             if not batch_data:
-                self.logger.warning(f"No se obtuvieron datos para el período {datetime.fromtimestamp(current_start/1000)}")
-                break
-            
-            # Convertir datos de la API a nuestro formato
-            for item in batch_data:
-                try:
-                    timestamp_ms, open_price, high, low, close, volume, close_time, *_ = item
-                    
-                    data.append({
-                        'timestamp': timestamp_ms // 1000,  # Convertir a segundos
-                        'open': float(open_price),
-                        'high': float(high),
-                        'low': float(low),
-                        'close': float(close),
-                        'volume': float(volume),
-                        'market_cap': float(close) * float(volume)  # Estimación
-                    })
-                except (ValueError, IndexError) as e:
-                    self.logger.error(f"Error procesando item de datos: {str(e)} - Item: {item}")
-            
-            if len(batch_data) < 1000:
-                break
-            
-            # Establecer siguiente punto de inicio
-            current_start = batch_data[-1][0] + 1
+                # Timestamp en bruto (ms): no se crea ningún datetime si el aviso no se emite
+                self.logger.warning("No se obtuvieron datos para el período %s", params['startTime'])
+                continue
+            
+            # Convertir la página a una matriz numérica de una vez:
+            # [timestamp_ms, open, high, low, close, volume, close_time]
+            try:
+                lotes.append(np.array([fila[:7] for fila in batch_data], dtype=np.float64))
+            except (ValueError, IndexError, TypeError) as e:
+                self.logger.error(f"Error procesando página de datos: {str(e)}")
+        
+        if not lotes:
+            return None
         
-        return data
+        # Una sola concatenación de matrices y un único DataFrame para todas las páginas
+        arr = np.concatenate(lotes)
+        return pd.DataFrame({
+            'timestamp': (arr[:, 0] // 1000).astype(np.int64),  # Convertir a segundos
+            'open': arr[:, 1],
+            'high': arr[:, 2],
+            'low': arr[:, 3],
+            'close': arr[:, 4],
+            'volume': arr[:, 5],
+            'market_cap': arr[:, 4] * arr[:, 5]  # Estimación
+        })
     
     def _extraer_datos_alternativos(self, inicio_ts, fin_ts, divisa):
         """
@@ -254,17 +461,13 @@ class Extractor:
             divisa (str): Símbolo de la criptomoneda
             
         Returns:
-            list: Lista de datos históricos o None si falla
+            pd.DataFrame: Datos históricos o None si falla
         """
         # Ejemplo: Usar CoinGecko como alternativa (no requiere API key)
         # Nota: Implementación simplificada, debe adaptarse según la API alternativa
         self.logger.info(f"Intentando extracción de datos desde API alternativa para {divisa}")
         
         try:
-            # Convertir timestamps a formato para API alternativa
-            from_date = datetime.fromtimestamp(inicio_ts).strftime('%d-%m-%Y')
-            to_date = datetime.fromtimestamp(fin_ts).strftime('%d-%m-%Y')
-            
             # URL de ejemplo para API alternativa (CoinGecko)
             url = f"https://api.coingecko.com/api/v3/coins/{divisa.lower()}/market_chart"
             params = {
@@ -274,55 +477,62 @@ class Extractor:
                 'interval': 'daily'
             }
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
-            json_data = response.json()
+            json_data = _leer_json(response)
             
             # Procesar datos según formato API alternativa
             if 'prices' in json_data and len(json_data['prices']) > 0:
-                data = []
+                # Ejemplo de procesamiento para CoinGecko: pares [timestamp_ms, valor]
+                precios = np.asarray(json_data['prices'], dtype=np.float64)
+                volumenes_api = np.asarray(json_data.get('total_volumes') or [], dtype=np.float64).reshape(-1, 2)
                 
-                # Ejemplo de procesamiento para CoinGecko
-                for i, (timestamp_ms, price) in enumerate(json_data['prices']):
-                    volume = json_data['total_volumes'][i][1] if i < len(json_data['total_volumes']) else 0
-                    
-                    data.append({
-                        'timestamp': timestamp_ms // 1000,  # ms a segundos
-                        'open': price,  # Aproximación
-                        'high': price,  # Aproximación
-                        'low': price,  # Aproximación
-                        'close': price,
-                        'volume': volume,
-                        'market_cap': price * volume  # Estimación
-                    })
+                # Volumen alineado por posición con los precios (0 si falta)
+                volumen = np.zeros(len(precios))
+                n_vol = min(len(precios), len(volumenes_api))
+                volumen[:n_vol] = volumenes_api[:n_vol, 1]
                 
-                return data
+                precio = precios[:, 1]
+                return pd.DataFrame({
+                    'timestamp': (precios[:, 0] // 1000).astype(np.int64),  # ms a segundos
+                    'open': precio,  # Aproximación
+                    'high': precio,  # Aproximación
+                    'low': precio,  # Aproximación
+                    'close': precio,
+                    'volume': volumen,
+                    'market_cap': precio * volumen  # Estimación
+                })
             
         except Exception as e:
             self.logger.error(f"Error al extraer datos desde API alternativa: {str(e)}")
         
         return None
     
-    def _crear_dataframe(self, datos):
+    @staticmethod
+    def _crear_dataframe(datos):
         """
-        Convierte los datos en un DataFrame estructurado
+        Convierte los datos en un DataFrame indexado por fecha
         
         Args:
-            datos (list): Lista de diccionarios con datos
+            datos (pd.DataFrame | dict | list): DataFrame, diccionario de arrays o lista de diccionarios
             
         Returns:
             pd.DataFrame: DataFrame con los datos procesados
         """
-        # Crear DataFrame a partir de los datos
-        df = pd.DataFrame(datos)
+        # Las extracciones ya devuelven un DataFrame; el resto se construye en una sola llamada
+        df = datos if isinstance(datos, pd.DataFrame) else pd.DataFrame(datos)
         
-        # Convertir la columna de timestamp a datetime
-        df['fecha'] = pd.to_datetime(df['timestamp'], unit='s')
-        df = df.set_index('fecha')
+        # Índice de fechas reinterpretando los segundos UNIX como datetime64 (salvo que ya exista)
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df.index = pd.DatetimeIndex(
+                df['timestamp'].to_numpy(dtype=np.int64).astype('datetime64[s]').astype('datetime64[ns]'),
+                name='fecha'
+            )
         
-        # Ordenar por fecha ascendente
-        df = df.sort_index()
+        # Los lotes llegan en orden cronológico: solo se ordena si no lo están
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
         
         return df
     
@@ -335,25 +545,24 @@ class Extractor:
             fecha_fin (datetime): Fecha fin
             
         Returns:
-            list: Lista de diccionarios con datos sintéticos
+            pd.DataFrame: DataFrame con los datos sintéticos
         """
-        import numpy as np
-        
         self.logger.warning("Generando datos sintéticos. En producción, use la API real.")
         
-        # Crear rango de fechas
+        # Crear rango de timestamps UNIX (las fechas naive son hora local) y el índice
+        # en UTC a partir de ellos, igual que el construido a partir de la API
         dias = (fecha_fin - fecha_inicio).days + 1
-        fechas = [fecha_inicio + timedelta(days=i) for i in range(dias)]
-        timestamps = [int(fecha.timestamp()) for fecha in fechas]
+        timestamps = int(fecha_inicio.timestamp()) + 86400 * np.arange(dias, dtype=np.int64)
+        idx = pd.DatetimeIndex(pd.to_datetime(timestamps, unit='s'), name='fecha')
         
         # Precio inicial
         precio_base = 40000  # BTC precio base
         
         # Generar precios con tendencia alcista y volatilidad realista
-        np.random.seed(42)  # Para reproducibilidad
+        rng = np.random.default_rng(42)  # Para reproducibilidad
         
         # Simular cambios diarios con volatilidad del 3% (realista para BTC)
-        cambios_diarios = np.random.normal(0.001, 0.03, dias)  # Media ligeramente positiva
+        cambios_diarios = rng.normal(0.001, 0.03, dias)  # Media ligeramente positiva
         
         # Simular algunas tendencias y volatilidad estacional
         tendencia = np.linspace(0, 0.3, dias)  # Tendencia alcista general
@@ -366,33 +575,29 @@ class Extractor:
         precios_relativos = np.cumprod(1 + cambios)
         precios = precio_base * precios_relativos
         
-        # Generar datos simulados para cada día
-        data = []
-        for i, ts in enumerate(timestamps):
-            precio = precios[i]
-            high = precio * (1 + abs(np.random.normal(0, 0.01)))
-            low = precio * (1 - abs(np.random.normal(0, 0.01)))
-            open_price = precio * (1 + np.random.normal(0, 0.005))
-            
-            # Volumen correlacionado con la volatilidad
-            volumen = 1000 + 5000 * abs(cambios_diarios[i]) * (1 + np.random.normal(0, 0.5))
-            
-            # Simular algunas anomalías
-            if np.random.random() < 0.05:  # 5% de probabilidad de anomalía
-                precio *= (1 + np.random.choice([-1, 1]) * np.random.uniform(0.05, 0.15))
-                volumen *= np.random.uniform(2, 5)
-            
-            data.append({
-                'timestamp': ts,
-                'open': round(open_price, 2),
-                'high': round(high, 2),
-                'low': round(low, 2),
-                'close': round(precio, 2),
-                'volume': round(volumen, 2),
-                'market_cap': round(precio * volumen, 2)
-            })
-        
-        return data
+        # Ruido diario de todas las columnas, generado de una vez para todo el rango
+        highs = precios * (1 + np.abs(rng.normal(0, 0.01, dias)))
+        lows = precios * (1 - np.abs(rng.normal(0, 0.01, dias)))
+        opens = precios * (1 + rng.normal(0, 0.005, dias))
+        
+        # Volumen correlacionado con la volatilidad
+        volumenes = 1000 + 5000 * np.abs(cambios_diarios) * (1 + rng.normal(0, 0.5, dias))
+        
+        # Simular algunas anomalías (5% de probabilidad por día)
+        mascara = rng.random(dias) < 0.05
+        n_anomalias = int(mascara.sum())
+        precios[mascara] *= 1 + rng.choice([-1, 1], n_anomalias) * rng.uniform(0.05, 0.15, n_anomalias)
+        volumenes[mascara] *= rng.uniform(2, 5, n_anomalias)
+        
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'open': np.round(opens, 2),
+            'high': np.round(highs, 2),
+            'low': np.round(lows, 2),
+            'close': np.round(precios, 2),
+            'volume': np.round(volumenes, 2),
+            'market_cap': np.round(precios * volumenes, 2)
+        }, index=idx)
     
     def extraer_datos_tiempo_real(self, divisa="BTC"):
         """
@@ -406,29 +611,37 @@ class Extractor:
         """
         self.logger.info(f"Extrayendo datos en tiempo real para {divisa}")
         
+        if not self.api_key or self.api_key == "TU_CLAVE_API_AQUI":
+            return self._generar_datos_tiempo_real(divisa)
+        
         try:
-            # Verificar si hay clave API válida
-            if self.api_key and self.api_key != "TU_CLAVE_API_AQUI":
-                # Intentar Basescan
-                datos_basescan = self._extraer_tiempo_real_basescan(divisa)
-                
-                if datos_basescan:
-                    return datos_basescan
-                    
-                # Si falla, intentar API alternativa
-                datos_alternativos = self._extraer_tiempo_real_alternativos(divisa)
-                
-                if datos_alternativos:
-                    return datos_alternativos
-                    
-                # Si ambos fallan, usar datos ficticios
-                return self._generar_datos_tiempo_real(divisa)
-            else:
-                return self._generar_datos_tiempo_real(divisa)
+            # Las llamadas dentro de la misma ventana de rt_ttl segundos comparten resultado
+            datos_api = self._tiempo_real_cacheado(divisa, int(time.time() // self.rt_ttl))
+            
+            if datos_api:
+                return datos_api
                 
         except Exception as e:
             self.logger.error(f"Error al extraer datos en tiempo real: {str(e)}", exc_info=True)
-            return self._generar_datos_tiempo_real(divisa)
+        
+        # Si ambos fallan, usar datos ficticios
+        return self._generar_datos_tiempo_real(divisa)
+    
+    def _extraer_tiempo_real_api(self, divisa, ventana):
+        """
+        Consulta Basescan y, si falla, la API alternativa
+        
+        Se memoriza por (divisa, ventana) en `_tiempo_real_cacheado`; la ventana solo
+        sirve como parte de la clave y hace que el resultado caduque al avanzar el tiempo.
+        
+        Args:
+            divisa (str): Símbolo de la criptomoneda
+            ventana (int): Índice de la ventana temporal de rt_ttl segundos
+            
+        Returns:
+            dict: Datos en tiempo real o None si ambas fuentes fallan
+        """
+        return self._extraer_tiempo_real_basescan(divisa) or self._extraer_tiempo_real_alternativos(divisa)
     
     def _extraer_tiempo_real_basescan(self, divisa):
         """
@@ -440,22 +653,17 @@ class Extractor:
         Returns:
             dict: Datos en tiempo real o None si falla
         """
-        # Endpoint para datos en tiempo real (últimos precios)
+        # Último precio y estadísticas de 24h: se consultan a la vez, no una tras otra
         endpoint_price = "/v1/ticker/price"
-        params_price = {'symbol': f"{divisa}USDT"}
-        
-        price_data = self._make_api_request(endpoint_price, params_price)
-        
-        if not price_data:
-            return None
-            
-        # También consultamos datos de volumen de las últimas 24h
         endpoint_stats = "/v1/ticker/24hr"
-        params_stats = {'symbol': f"{divisa}USDT"}
         
-        stats_data = self._make_api_request(endpoint_stats, params_stats)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futuro_price = executor.submit(self._make_api_request, endpoint_price, {'symbol': f"{divisa}USDT"})
+            futuro_stats = executor.submit(self._make_api_request, endpoint_stats, {'symbol': f"{divisa}USDT"})
+            price_data = futuro_price.result()
+            stats_data = futuro_stats.result()
         
-        if not stats_data:
+        if not price_data or not stats_data:
             return None
         
         # Combinar datos de ambos endpoints
@@ -482,10 +690,10 @@ class Extractor:
             url = f"https://api.coingecko.com/api/v3/coins/{divisa.lower()}"
             params = {'localization': 'false', 'tickers': 'false', 'community_data': 'false', 'developer_data': 'false'}
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
-            data = response.json()
+            data = _leer_json(response)
             
             return {
                 'symbol': divisa,
@@ -514,51 +722,75 @@ class Extractor:
             'timestamp': int(datetime.now().timestamp())
         }
 
-    def guardar_datos(self, df, ruta_archivo):
+    @staticmethod
+    def _formato_archivo(ruta_archivo, formato=None):
+        """
+        Formato de almacenamiento: el indicado, o el deducido de la extensión (CSV por defecto)
         """
-        Guarda los datos en un archivo CSV
+        if formato:
+            return formato
+        extension = os.path.splitext(str(ruta_archivo))[1].lower().lstrip('.')
+        return extension if extension in ('parquet', 'feather') else 'csv'
+    
+    def guardar_datos(self, df, ruta_archivo, formato=None):
+        """
+        Guarda los datos en Parquet, Feather o CSV
         
         Args:
             df (pd.DataFrame): DataFrame con los datos
             ruta_archivo (str): Ruta donde guardar el archivo
+            formato (str, optional): 'parquet', 'feather' o 'csv'; por defecto según la extensión
         """
         # Asegurarse de que el directorio existe
         os.makedirs(os.path.dirname(ruta_archivo), exist_ok=True)
         
         try:
             # Guardar el DataFrame
-            df.to_csv(ruta_archivo)
+            formato = self._formato_archivo(ruta_archivo, formato)
+            if formato == 'parquet':
+                df.to_parquet(ruta_archivo, engine='pyarrow', compression='zstd')
+            elif formato == 'feather':
+                # Feather no admite índices no triviales: la fecha se guarda como columna
+                df.reset_index().to_feather(ruta_archivo)
+            else:
+                df.to_csv(ruta_archivo)
             self.logger.info(f"Datos guardados en {ruta_archivo}")
         except Exception as e:
             self.logger.error(f"Error al guardar datos en {ruta_archivo}: {str(e)}")
             raise
 
-    def cargar_datos(self, ruta_archivo):
+    def cargar_datos(self, ruta_archivo, formato=None):
         """
-        Carga datos desde un archivo CSV
+        Carga datos desde un archivo Parquet, Feather o CSV
         
         Args:
             ruta_archivo (str): Ruta del archivo a cargar
+            formato (str, optional): 'parquet', 'feather' o 'csv'; por defecto según la extensión
             
         Returns:
             pd.DataFrame: DataFrame con los datos cargados
         """
-        if not os.path.exists(ruta_archivo):
-            self.logger.error(f"El archivo {ruta_archivo} no existe")
-            raise FileNotFoundError(f"El archivo {ruta_archivo} no existe")
-        
         try:
             self.logger.info(f"Cargando datos desde {ruta_archivo}")
+            formato = self._formato_archivo(ruta_archivo, formato)
+            if formato == 'parquet':
+                # Parquet conserva tipos e índice: no hace falta reconvertir nada
+                return pd.read_parquet(ruta_archivo, engine='pyarrow')
+            if formato == 'feather':
+                df = pd.read_feather(ruta_archivo)
+                return df.set_index('fecha') if 'fecha' in df.columns else df
+            
             df = pd.read_csv(ruta_archivo)
             
             # Si hay una columna fecha, convertirla a datetime y establecerla como índice
             if 'fecha' in df.columns:
                 df['fecha'] = pd.to_datetime(df['fecha'])
                 df = df.set_index('fecha')
-            elif df.index.name == 'fecha':
-                df.index = pd.to_datetime(df.index)
                 
             return df
+        except FileNotFoundError:
+            self.logger.error(f"El archivo {ruta_archivo} no existe")
+            raise
         except Exception as e:
             self.logger.error(f"Error al cargar datos desde {ruta_archivo}: {str(e)}")
             raise
@@ -4,15 +4,24 @@ Modulo para la interfaz grafica del sistema de mineria de datos para trading
 
 import os
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.lines import Line2D
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+try:
+    import tksheet
+except ImportError:  # tksheet es opcional, se usa ttk.Treeview como respaldo
+    tksheet = None
+
 # Importar configuracion
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -25,7 +34,63 @@ from src.modelos.clustering import ModeloClustering
 from src.modelos.anomalias import ModeloAnomalias
 from src.modelos.reglas_asociacion import MineroReglas
 from src.evaluacion.evaluador import Evaluador
+from src.pipeline.modeling import n_jobs_por_etapa
 from src.utils.utilidades import Utilidades
+from src.utils.json_utils import format_eval_results
+
+# Simplificar y trocear las polilíneas largas antes de rasterizarlas con Agg
+matplotlib.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
+
+def _formatear_columna(df, columna, formato):
+    """
+    Formatea una columna numérica completa como texto
+    
+    Args:
+        df (pd.DataFrame): DataFrame con los datos
+        columna (str): Columna a formatear
+        formato (str): Formato estilo printf
+        
+    Returns:
+        np.ndarray: Textos formateados ("N/A" si la columna no existe)
+    """
+    if columna not in df.columns:
+        return np.full(len(df), "N/A")
+    return np.char.mod(formato, df[columna].to_numpy(dtype=np.float64))
+
+def _precalcular_anomalias(df):
+    """
+    Precalcula lo que usan la tabla y el gráfico de anomalías: la máscara de anomalías
+    y las filas de la tabla ya ordenadas por probabilidad y formateadas
+    
+    Args:
+        df (pd.DataFrame): Datos con la columna 'anomalia_pred' (y opcionalmente 'prob_anomalia')
+        
+    Returns:
+        tuple: (máscara de anomalías, filas [fecha, precio, retorno, probabilidad])
+    """
+    mascara = df['anomalia_pred'].to_numpy() == 1
+    anomalias = df[mascara]
+    if len(anomalias) == 0:
+        return mascara, []
+    
+    # Ordenar por probabilidad descendente
+    if 'prob_anomalia' in anomalias.columns:
+        prob_pct = anomalias['prob_anomalia'].to_numpy(dtype=np.float64) * 100.0
+        orden = np.argsort(-prob_pct, kind='stable')
+        anomalias = anomalias.iloc[orden]
+        probs = np.char.mod('%.2f%%', prob_pct[orden])
+    else:
+        probs = np.full(len(anomalias), "N/A")
+    
+    # Formatear columnas completas de una vez en lugar de fila a fila
+    fechas = anomalias.index.strftime('%Y-%m-%d').to_numpy()
+    precios = _formatear_columna(anomalias, 'close', '%.2f')
+    retornos = _formatear_columna(anomalias, 'retorno', '%.2f')
+    return mascara, np.column_stack([fechas, precios, retornos, probs]).tolist()
 
 class InterfazTrading:
     """
@@ -43,6 +108,17 @@ class InterfazTrading:
         self.logger = logging.getLogger(__name__)
         self.master = master
         self.datos = datos or {}
+        
+        # Hilos de trabajo para las tareas largas; la interfaz solo se toca desde master.after
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self._etapas_pendientes = set()
+        self._errores_etapas = []
+        self._tareas_reporte = set()
+        self._errores_reporte = []
+        
+        # Texto del reporte memorizado por id de los resultados (se vacía al reejecutar modelos)
+        self._texto_reporte = functools.lru_cache(maxsize=4)(self._construir_reporte)
+        
         self.configurar_ventana()
         self.crear_widgets()
         self.inicializar_datos()
@@ -145,13 +221,14 @@ class InterfazTrading:
         self.opciones_frame.grid(row=0, column=4, padx=10, pady=5, sticky="e")
         
         self.modo_visualizacion = tk.StringVar(value="precios")
+        self._redraw_pending = None
         
         self.rb_precios = ttk.Radiobutton(
             self.opciones_frame, 
             text="Precios", 
             variable=self.modo_visualizacion, 
             value="precios",
-            command=self.actualizar_grafico
+            command=self._schedule_redraw
         )
         self.rb_precios.grid(row=0, column=0, padx=5, pady=2, sticky="w")
         
@@ -160,7 +237,7 @@ class InterfazTrading:
             text="Clusters", 
             variable=self.modo_visualizacion, 
             value="clusters",
-            command=self.actualizar_grafico
+            command=self._schedule_redraw
         )
         self.rb_clusters.grid(row=0, column=1, padx=5, pady=2, sticky="w")
         
@@ -169,7 +246,7 @@ class InterfazTrading:
             text="Anomalías", 
             variable=self.modo_visualizacion, 
             value="anomalias",
-            command=self.actualizar_grafico
+            command=self._schedule_redraw
         )
         self.rb_anomalias.grid(row=0, column=2, padx=5, pady=2, sticky="w")
         
@@ -180,11 +257,33 @@ class InterfazTrading:
         self.grafico_frame.rowconfigure(0, weight=1)
         
         # Figura inicial
-        self.fig, self.ax = plt.subplots(figsize=(10, 6))
+        # Figura independiente de pyplot (el canvas TkAgg se crea explícitamente) y con menos
+        # píxeles que componer que con el dpi por defecto
+        self.fig = Figure(figsize=(10, 6), dpi=90)
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.grafico_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.grid(row=0, column=0, sticky="nsew")
         
+        # Artistas persistentes por modo y fondos capturados para el blitting
+        self._artistas = {}
+        self._fondos = {}
+        self._modo_dibujado = None
+        self._lttb_cache = {}
+        self._arrs = {}
+        
+        # Eje secundario del volumen creado una sola vez; sus barras se reutilizan entre
+        # reconstrucciones mientras el eje X no cambie
+        self._ax_volumen = self.ax.twinx()
+        self._ax_volumen.set_ylabel('Volumen', color='gray')
+        self._ax_volumen.tick_params(axis='y', labelcolor='gray')
+        self._ax_volumen.set_visible(False)
+        self._barras_volumen = None
+        self._x_volumen = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('resize_event', self._on_resize)
+        self.canvas.draw()
+        
         # Panel inferior - Pestañas para diferentes vistas
         self.tabs = ttk.Notebook(self.main_frame)
         self.tabs.grid(row=2, column=0, sticky="ew", pady=5)
@@ -205,17 +304,25 @@ class InterfazTrading:
         self.anomalias_frame = ttk.Frame(self.tab_anomalias)
         self.anomalias_frame.pack(fill="both", expand=True, padx=5, pady=5)
         
-        self.anomalias_tree = ttk.Treeview(self.anomalias_frame, columns=("fecha", "precio", "retorno", "prob"))
-        self.anomalias_tree.heading("fecha", text="Fecha")
-        self.anomalias_tree.heading("precio", text="Precio")
-        self.anomalias_tree.heading("retorno", text="Retorno %")
-        self.anomalias_tree.heading("prob", text="Probabilidad")
-        self.anomalias_tree.column("#0", width=0, stretch=tk.NO)
-        self.anomalias_tree.column("fecha", width=150, anchor=tk.CENTER)
-        self.anomalias_tree.column("precio", width=150, anchor=tk.CENTER)
-        self.anomalias_tree.column("retorno", width=150, anchor=tk.CENTER)
-        self.anomalias_tree.column("prob", width=150, anchor=tk.CENTER)
-        self.anomalias_tree.pack(fill="both", expand=True)
+        # tksheet solo dibuja las filas visibles, así que el coste no depende del número de anomalías
+        self.anomalias_sheet = None
+        self.anomalias_tree = None
+        if tksheet is not None:
+            self.anomalias_sheet = tksheet.Sheet(self.anomalias_frame,
+                                                 headers=["Fecha", "Precio", "Retorno %", "Probabilidad"])
+            self.anomalias_sheet.pack(fill="both", expand=True)
+        else:
+            self.anomalias_tree = ttk.Treeview(self.anomalias_frame, columns=("fecha", "precio", "retorno", "prob"))
+            self.anomalias_tree.heading("fecha", text="Fecha")
+            self.anomalias_tree.heading("precio", text="Precio")
+            self.anomalias_tree.heading("retorno", text="Retorno %")
+            self.anomalias_tree.heading("prob", text="Probabilidad")
+            self.anomalias_tree.column("#0", width=0, stretch=tk.NO)
+            self.anomalias_tree.column("fecha", width=150, anchor=tk.CENTER)
+            self.anomalias_tree.column("precio", width=150, anchor=tk.CENTER)
+            self.anomalias_tree.column("retorno", width=150, anchor=tk.CENTER)
+            self.anomalias_tree.column("prob", width=150, anchor=tk.CENTER)
+            self.anomalias_tree.pack(fill="both", expand=True)
         
         # Pestaña de Evaluación
         self.tab_evaluacion = ttk.Frame(self.tabs)
@@ -270,9 +377,11 @@ class InterfazTrading:
             if respuesta == "yes":  # Cargar existentes
                 # Verificar si existe el archivo de datos crudos
                 if os.path.exists(config.DATOS_CRUDOS):
+                    # Leer en un hilo de trabajo para no congelar la interfaz con archivos grandes
                     extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT)
-                    self.datos['df_raw'] = extractor.cargar_datos(config.DATOS_CRUDOS)
-                    self.mostrar_datos_cargados()
+                    self._bloquear_controles(True)
+                    futuro = self._executor.submit(extractor.cargar_datos, config.DATOS_CRUDOS)
+                    futuro.add_done_callback(lambda f: self.master.after(0, self._on_raw_loaded, f))
                 else:
                     messagebox.showerror(
                         "Error", 
@@ -290,13 +399,34 @@ class InterfazTrading:
             messagebox.showerror("Error", f"Error al cargar datos: {str(e)}")
             self.actualizar_estado("Error al cargar datos")
     
+    def _on_raw_loaded(self, futuro):
+        """
+        Recibe en el hilo de la interfaz los datos crudos leídos en segundo plano
+        
+        Args:
+            futuro (Future): Futuro de la lectura del archivo
+        """
+        self._bloquear_controles(False)
+        
+        error = futuro.exception()
+        if error is not None:
+            self.logger.error(f"Error al cargar datos: {str(error)}")
+            messagebox.showerror("Error", f"Error al cargar datos: {str(error)}")
+            self.actualizar_estado("Error al cargar datos")
+            return
+        
+        self.datos['df_raw'] = futuro.result()
+        self.mostrar_datos_cargados()
+    
     def extraer_nuevos_datos(self):
         """Extrae nuevos datos de la API"""
         try:
-            extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT)
+            extractor = Extractor(config.API_KEY, config.API_URL, config.API_RATE_LIMIT,
+                                  cache_dir=config.CACHE_KLINES_DIR, cache_ttl_dias=config.CACHE_KLINES_TTL_DIAS)
             
             # Diálogo para confirmar extracción
-            mensaje = f"Se extraerán datos de Bitcoin desde {config.FECHA_INICIO.strftime('%d/%m/%Y')} hasta {config.FECHA_FIN.strftime('%d/%m/%Y')}. Este proceso puede tardar varios minutos. ¿Desea continuar?"
+            fecha_inicio, fecha_fin = config.get_fecha_inicio(), config.get_fecha_fin()
+            mensaje = f"Se extraerán datos de Bitcoin desde {fecha_inicio.strftime('%d/%m/%Y')} hasta {fecha_fin.strftime('%d/%m/%Y')}. Este proceso puede tardar varios minutos. ¿Desea continuar?"
             confirmar = messagebox.askyesno("Extraer datos", mensaje)
             
             if not confirmar:
@@ -306,8 +436,8 @@ class InterfazTrading:
             # Extraer datos
             self.actualizar_estado("Extrayendo datos de la API... (puede tardar varios minutos)")
             self.datos['df_raw'] = extractor.extraer_datos_historicos(
-                config.FECHA_INICIO, 
-                config.FECHA_FIN
+                fecha_inicio, 
+                fecha_fin
             )
             
             # Guardar datos
@@ -329,10 +459,38 @@ class InterfazTrading:
         df = self.datos['df_raw']
         
         # Actualizar el gráfico
-        self.actualizar_grafico()
+        self.actualizar_grafico(recrear=True)
         
         # Actualizar estado
-        self.actualizar_estado(f"Datos cargados: {len(df)} registros desde {df.index.min().strftime('%d/%m/%Y')} hasta {df.index.max().strftime('%d/%m/%Y')}")
+        n_registros, inicio, fin = self._rango_datos_crudos(df)
+        self.actualizar_estado(f"Datos cargados: {n_registros} registros desde {inicio.strftime('%d/%m/%Y')} hasta {fin.strftime('%d/%m/%Y')}")
+    
+    def _rango_datos_crudos(self, df):
+        """
+        Devuelve el número de registros y el rango de fechas de los datos crudos
+        
+        El resultado se guarda en self.datos['_raw_stats'] asociado al DataFrame para no
+        recorrer el índice en cada actualización de la barra de estado.
+        
+        Args:
+            df (pd.DataFrame): Datos crudos
+            
+        Returns:
+            tuple: (número de registros, fecha inicial, fecha final)
+        """
+        stats = self.datos.get('_raw_stats')
+        if stats is not None and stats[0] is df:
+            return stats[1:]
+        
+        # Los datos OHLC suelen venir ordenados: primer y último elemento sin recorrer el índice
+        idx = df.index
+        if idx.is_monotonic_increasing:
+            inicio, fin = idx[0], idx[-1]
+        else:
+            inicio, fin = idx.min(), idx.max()
+        
+        self.datos['_raw_stats'] = (df, len(df), inicio, fin)
+        return len(df), inicio, fin
     
     def procesar_datos(self):
         """Procesa los datos cargados"""
@@ -357,7 +515,7 @@ class InterfazTrading:
             self.actualizar_estado("Datos procesados correctamente")
             
             # Actualizar gráfico
-            self.actualizar_grafico()
+            self.actualizar_grafico(recrear=True)
             
             messagebox.showinfo("Éxito", "Datos procesados correctamente")
             
@@ -367,8 +525,14 @@ class InterfazTrading:
             self.actualizar_estado("Error al procesar datos")
     
     def ejecutar_modelos(self):
-        """Ejecuta todos los modelos de minería de datos"""
+        """
+        Ejecuta todos los modelos de minería de datos
+        
+        Clustering, anomalías y reglas solo leen los datos procesados, así que se lanzan
+        en paralelo en el pool de hilos; la evaluación se lanza cuando terminan los tres.
+        """
         self.actualizar_estado("Ejecutando modelos...")
+        self._texto_reporte.cache_clear()
         
         try:
             # Verificar que hay datos procesados
@@ -381,45 +545,146 @@ class InterfazTrading:
                 else:
                     messagebox.showerror("Error", "No hay datos procesados. Procese los datos primero.")
                     return
-            
-            # 1. Clustering
-            self.actualizar_estado("Aplicando clustering...")
-            modelo_clustering = ModeloClustering(
-                n_clusters=config.PARAMETROS['clustering_num_clusters'],
-                random_state=config.PARAMETROS['clustering_random_state']
-            )
-            self.datos['df_clusters'] = modelo_clustering.entrenar_y_predecir(self.datos['df_procesado'])
-            modelo_clustering.guardar_modelo(config.MODELO_CLUSTERING)
-            
-            # 2. Detección de anomalías
-            self.actualizar_estado("Detectando anomalías...")
-            modelo_anomalias = ModeloAnomalias(
-                n_estimators=config.PARAMETROS['rf_num_arboles'],
-                max_depth=config.PARAMETROS['rf_max_depth'],
-                random_state=config.PARAMETROS['rf_random_state']
-            )
-            self.datos['df_anomalias'] = modelo_anomalias.entrenar_y_predecir(self.datos['df_procesado'])
-            modelo_anomalias.guardar_modelo(config.MODELO_ANOMALIAS)
-            
-            # 3. Reglas de asociación
-            self.actualizar_estado("Extrayendo reglas de asociación...")
-            minero_reglas = MineroReglas(
-                soporte_min=config.PARAMETROS['reglas_soporte_min'],
-                confianza_min=config.PARAMETROS['reglas_confianza_min'],
-                lift_min=config.PARAMETROS['reglas_lift_min']
-            )
-            self.datos['reglas'] = minero_reglas.extraer_reglas(self.datos['df_discretizado'])
-            minero_reglas.guardar_reglas(self.datos['reglas'], config.REGLAS_ASOCIACION)
-            
-            # 4. Evaluación de modelos
-            self.actualizar_estado("Evaluando modelos...")
-            evaluador = Evaluador(config.PARAMETROS)
-            self.datos['resultados'] = evaluador.evaluar_modelos(
-                self.datos['df_procesado'], 
-                self.datos['df_clusters'], 
-                self.datos['df_anomalias'], 
-                self.datos['reglas']
+                    
+        except Exception as e:
+            self._error_modelos(e)
+            return
+        
+        self._bloquear_controles(True)
+        self._errores_etapas = []
+        
+        etapas = {
+            'df_clusters': (self._aplicar_clustering, self.datos['df_procesado']),
+            'df_anomalias': (self._detectar_anomalias, self.datos['df_procesado']),
+            'reglas': (self._extraer_reglas, self.datos['df_discretizado']),
+        }
+        self._etapas_pendientes = set(etapas)
+        
+        for nombre, (funcion, df) in etapas.items():
+            futuro = self._executor.submit(funcion, df)
+            futuro.add_done_callback(
+                lambda f, nombre=nombre: self.master.after(0, self._on_stage_done, nombre, f)
             )
+    
+    def _aplicar_clustering(self, df_procesado):
+        """
+        Entrena y guarda el modelo de clustering (se ejecuta en un hilo de trabajo)
+        
+        Args:
+            df_procesado (pd.DataFrame): Datos procesados
+            
+        Returns:
+            dict: Resultados a añadir a self.datos (datos con la columna de cluster)
+        """
+        self._estado_desde_hilo("Aplicando clustering...")
+        modelo_clustering = ModeloClustering(
+            n_clusters=config.PARAMETROS['clustering_num_clusters'],
+            random_state=config.PARAMETROS['clustering_random_state']
+        )
+        df_clusters = modelo_clustering.entrenar_y_predecir(df_procesado)
+        modelo_clustering.guardar_modelo(config.MODELO_CLUSTERING)
+        return {'df_clusters': df_clusters}
+    
+    def _detectar_anomalias(self, df_procesado):
+        """
+        Entrena y guarda el modelo de anomalías (se ejecuta en un hilo de trabajo)
+        
+        Args:
+            df_procesado (pd.DataFrame): Datos procesados
+            
+        Returns:
+            dict: Resultados a añadir a self.datos (predicciones de anomalías y sus columnas
+                precalculadas para la tabla y el gráfico)
+        """
+        self._estado_desde_hilo("Detectando anomalías...")
+        modelo_anomalias = ModeloAnomalias(
+            n_estimators=config.PARAMETROS['rf_num_arboles'],
+            max_depth=config.PARAMETROS['rf_max_depth'],
+            random_state=config.PARAMETROS['rf_random_state'],
+            n_jobs=n_jobs_por_etapa(),
+            compilar_treelite=config.PARAMETROS['rf_compilar_treelite']
+        )
+        df_anomalias = modelo_anomalias.entrenar_y_predecir(df_procesado)
+        modelo_anomalias.guardar_modelo(config.MODELO_ANOMALIAS)
+        return {
+            'df_anomalias': df_anomalias,
+            '_anom_precomp': (df_anomalias, *_precalcular_anomalias(df_anomalias)),
+        }
+    
+    def _extraer_reglas(self, df_discretizado):
+        """
+        Extrae y guarda las reglas de asociación (se ejecuta en un hilo de trabajo)
+        
+        Args:
+            df_discretizado (pd.DataFrame): Datos discretizados
+            
+        Returns:
+            dict: Resultados a añadir a self.datos (reglas de asociación)
+        """
+        self._estado_desde_hilo("Extrayendo reglas de asociación...")
+        minero_reglas = MineroReglas(
+            soporte_min=config.PARAMETROS['reglas_soporte_min'],
+            confianza_min=config.PARAMETROS['reglas_confianza_min'],
+            lift_min=config.PARAMETROS['reglas_lift_min']
+        )
+        reglas = minero_reglas.extraer_reglas(df_discretizado)
+        minero_reglas.guardar_reglas(reglas, config.REGLAS_ASOCIACION)
+        return {'reglas': reglas}
+    
+    def _evaluar_modelos(self, df_procesado, df_clusters, df_anomalias, reglas):
+        """
+        Evalúa los modelos entrenados (se ejecuta en un hilo de trabajo)
+        
+        Returns:
+            dict: Resultados de la evaluación
+        """
+        self._estado_desde_hilo("Evaluando modelos...")
+        evaluador = Evaluador(config.PARAMETROS)
+        return evaluador.evaluar_modelos(df_procesado, df_clusters, df_anomalias, reglas)
+    
+    def _on_stage_done(self, nombre, futuro):
+        """
+        Recoge el resultado de una etapa en el hilo de la interfaz
+        
+        Args:
+            nombre (str): Nombre de la etapa (clave principal de su resultado en self.datos)
+            futuro (Future): Futuro de la etapa terminada
+        """
+        self._etapas_pendientes.discard(nombre)
+        
+        error = futuro.exception()
+        if error is not None:
+            self._errores_etapas.append(error)
+        else:
+            self.datos.update(futuro.result())
+        
+        if self._etapas_pendientes:
+            return
+        
+        if self._errores_etapas:
+            self._error_modelos(self._errores_etapas[0])
+            self._bloquear_controles(False)
+            return
+        
+        # Las tres etapas han terminado: evaluar en segundo plano
+        futuro = self._executor.submit(
+            self._evaluar_modelos,
+            self.datos['df_procesado'],
+            self.datos['df_clusters'],
+            self.datos['df_anomalias'],
+            self.datos['reglas']
+        )
+        futuro.add_done_callback(lambda f: self.master.after(0, self._on_evaluacion_done, f))
+    
+    def _on_evaluacion_done(self, futuro):
+        """
+        Muestra los resultados de la evaluación en el hilo de la interfaz
+        
+        Args:
+            futuro (Future): Futuro de la evaluación
+        """
+        try:
+            self.datos['resultados'] = futuro.result()
             
             # Actualizar interfaz con resultados
             self.actualizar_interfaz_con_resultados()
@@ -430,14 +695,46 @@ class InterfazTrading:
             messagebox.showinfo("Éxito", "Todos los modelos se ejecutaron correctamente")
             
         except Exception as e:
-            self.logger.error(f"Error al ejecutar modelos: {str(e)}")
-            messagebox.showerror("Error", f"Error al ejecutar modelos: {str(e)}")
-            self.actualizar_estado("Error al ejecutar modelos")
+            self._error_modelos(e)
+        finally:
+            self._bloquear_controles(False)
+    
+    def _error_modelos(self, e):
+        """
+        Informa de un error durante la ejecución de los modelos
+        
+        Args:
+            e (Exception): Excepción producida
+        """
+        self.logger.error(f"Error al ejecutar modelos: {str(e)}")
+        messagebox.showerror("Error", f"Error al ejecutar modelos: {str(e)}")
+        self.actualizar_estado("Error al ejecutar modelos")
+    
+    def _estado_desde_hilo(self, mensaje):
+        """
+        Actualiza la barra de estado desde un hilo de trabajo
+        
+        Args:
+            mensaje (str): Mensaje a mostrar
+        """
+        self.master.after(0, self.actualizar_estado, mensaje)
+    
+    def _bloquear_controles(self, bloquear):
+        """
+        Deshabilita o habilita los botones principales mientras hay trabajo en curso
+        
+        Args:
+            bloquear (bool): True para deshabilitar los botones
+        """
+        estado = ["disabled"] if bloquear else ["!disabled"]
+        for boton in (self.btn_cargar_datos, self.btn_procesar_datos,
+                      self.btn_ejecutar_modelos, self.btn_generar_reporte):
+            boton.state(estado)
     
     def actualizar_interfaz_con_resultados(self):
         """Actualiza la interfaz con los resultados de los modelos"""
         # Actualizar gráfico según el modo seleccionado
-        self.actualizar_grafico()
+        self.actualizar_grafico(recrear=True)
         
         # Actualizar lista de anomalías
         self.mostrar_anomalias()
@@ -454,26 +751,53 @@ class InterfazTrading:
             return
         
         # Limpiar tabla
-        for row in self.anomalias_tree.get_children():
-            self.anomalias_tree.delete(row)
+        self._llenar_tabla_anomalias([])
         
-        # Filtrar solo anomalías
-        if 'anomalia_pred' in self.datos['df_anomalias'].columns:
-            anomalias = self.datos['df_anomalias'][self.datos['df_anomalias']['anomalia_pred'] == 1]
+        # Filtrar solo anomalías (filas ya ordenadas y formateadas en el hilo de trabajo)
+        df = self.datos['df_anomalias']
+        if 'anomalia_pred' in df.columns:
+            _, filas = self._anomalias_precalculadas(df)
+            if filas:
+                self._llenar_tabla_anomalias(filas)
+    
+    def _llenar_tabla_anomalias(self, filas):
+        """
+        Sustituye el contenido de la tabla de anomalías
+        
+        Args:
+            filas (list): Filas [fecha, precio, retorno, probabilidad] ya formateadas
+        """
+        if self.anomalias_sheet is not None:
+            self.anomalias_sheet.set_sheet_data(filas, reset_col_positions=False, redraw=False)
+            self.anomalias_sheet.refresh()
+            return
+        
+        self.anomalias_tree.delete(*self.anomalias_tree.get_children())
+        if not filas:
+            return
+        
+        # Ocultar las columnas mientras se insertan las filas para no recalcular la geometría
+        self.anomalias_tree.configure(displaycolumns=())
+        for valores in filas:
+            self.anomalias_tree.insert('', 'end', values=valores)
+        self.anomalias_tree.configure(displaycolumns="#all")
+    
+    def _anomalias_precalculadas(self, df):
+        """
+        Devuelve la máscara de anomalías y las filas de la tabla de df, calculándolas si los
+        datos no vienen ya precalculados de ejecutar_modelos
+        
+        Args:
+            df (pd.DataFrame): Datos de anomalías
             
-            if len(anomalias) > 0:
-                # Ordenar por probabilidad descendente
-                if 'prob_anomalia' in anomalias.columns:
-                    anomalias = anomalias.sort_values('prob_anomalia', ascending=False)
-                
-                # Agregar a la tabla
-                for idx, row in anomalias.iterrows():
-                    fecha = idx.strftime('%Y-%m-%d')
-                    precio = f"{row['close']:.2f}" if 'close' in row else "N/A"
-                    retorno = f"{row['retorno']:.2f}" if 'retorno' in row else "N/A"
-                    prob = f"{row['prob_anomalia']*100:.2f}%" if 'prob_anomalia' in row else "N/A"
-                    
-                    self.anomalias_tree.insert('', 'end', values=(fecha, precio, retorno, prob))
+        Returns:
+            tuple: (máscara de anomalías, filas de la tabla)
+        """
+        precomp = self.datos.get('_anom_precomp')
+        if precomp is None or precomp[0] is not df:
+            precomp = (df, *_precalcular_anomalias(df))
+            self.datos['_anom_precomp'] = precomp
+        return precomp[1:]
     
     def mostrar_reglas(self):
         """Muestra las reglas de asociación en el área de texto"""
@@ -485,17 +809,18 @@ class InterfazTrading:
         # Mostrar primeras 20 reglas ordenadas por lift
         reglas = self.datos['reglas'].sort_values('lift', ascending=False).head(20)
         
-        texto = "TOP REGLAS DE ASOCIACIÓN (ordenadas por lift)\n"
-        texto += "="*50 + "\n\n"
+        # Acumular las líneas en una lista y unirlas al final (sin concatenaciones repetidas)
+        partes = ["TOP REGLAS DE ASOCIACIÓN (ordenadas por lift)", "="*50, ""]
         
-        for i, (_, regla) in enumerate(reglas.iterrows(), 1):
-            texto += f"Regla #{i}:\n"
-            texto += f"  SI {regla['antecedentes']}\n"
-            texto += f"  ENTONCES {regla['consecuentes']}\n"
-            texto += f"  (confianza: {regla['confianza']:.3f}, lift: {regla['lift']:.3f}, soporte: {regla['soporte']:.3f})\n\n"
+        for i, regla in enumerate(reglas.itertuples(index=False), 1):
+            partes.append(f"Regla #{i}:")
+            partes.append(f"  SI {regla.antecedentes}")
+            partes.append(f"  ENTONCES {regla.consecuentes}")
+            partes.append(f"  (confianza: {regla.confianza:.3f}, lift: {regla.lift:.3f}, soporte: {regla.soporte:.3f})")
+            partes.append("")
         
         self.reglas_text.delete(1.0, tk.END)
-        self.reglas_text.insert(tk.END, texto)
+        self.reglas_text.insert(tk.END, "\n".join(partes) + "\n")
     
     def mostrar_evaluacion(self):
         """Muestra los resultados de evaluación en el área de texto"""
@@ -504,146 +829,430 @@ class InterfazTrading:
             self.evaluacion_text.insert(tk.END, "No hay resultados de evaluación disponibles.")
             return
         
-        # Crear evaluador para generar reporte
-        evaluador = Evaluador(config.PARAMETROS)
-        reporte = evaluador.generar_reporte(self.datos['resultados'])
+        reporte = self._texto_reporte(id(self.datos['resultados']))
         
         self.evaluacion_text.delete(1.0, tk.END)
         self.evaluacion_text.insert(tk.END, reporte)
     
-    def actualizar_grafico(self):
-        """Actualiza el gráfico según el modo seleccionado"""
-        # Limpiar gráfico anterior
-        self.ax.clear()
+    def _construir_reporte(self, id_resultados):
+        """
+        Genera el texto del reporte de evaluación de los resultados actuales
+        
+        Se invoca a través de `_texto_reporte`, que lo memoriza por el id de los resultados.
+        
+        Args:
+            id_resultados (int): id() de self.datos['resultados'], usado como clave de caché
+            
+        Returns:
+            str: Reporte formateado
+        """
+        evaluador = Evaluador(config.PARAMETROS)
+        return format_eval_results(evaluador.generar_reporte(self.datos['resultados']))
+    
+    def actualizar_grafico(self, recrear=False):
+        """
+        Actualiza el gráfico según el modo seleccionado
+        
+        Los artistas de cada modo se crean una sola vez (animados) y el fondo de cada modo
+        se guarda tras su primer dibujado completo; al cambiar de modo solo se restaura ese
+        fondo y se redibujan los artistas del modo con blitting.
+        
+        Args:
+            recrear (bool): Descarta los artistas existentes porque los datos han cambiado
+        """
+        if recrear:
+            self._descartar_artistas()
         
         # Obtener modo de visualización
         modo = self.modo_visualizacion.get()
         
-        if modo == "precios":
-            self.graficar_precios()
-        elif modo == "clusters":
-            self.graficar_clusters()
-        elif modo == "anomalias":
-            self.graficar_anomalias()
+        if modo not in self._artistas:
+            constructores = {
+                "precios": self.graficar_precios,
+                "clusters": self.graficar_clusters,
+                "anomalias": self.graficar_anomalias,
+            }
+            if modo not in constructores:
+                return
+            self._artistas[modo] = constructores[modo]()
+        
+        artistas, rotulos = self._artistas[modo]
         
-        # Actualizar canvas
-        self.canvas.draw()
+        # Mostrar solo los artistas del modo seleccionado
+        for otro_modo, (otros_artistas, _) in self._artistas.items():
+            for artista in otros_artistas:
+                artista.set_visible(otro_modo == modo)
+        self._ax_volumen.set_visible(modo == "precios" and self._barras_volumen is not None)
+        
+        self._aplicar_rotulos(artistas, rotulos)
+        self._modo_dibujado = modo
+        
+        fondo = self._fondos.get(modo)
+        if fondo is None:
+            # Dibujado completo: _on_draw captura el fondo y pinta los artistas animados
+            self.canvas.draw()
+            return
+        
+        self.canvas.restore_region(fondo)
+        self._dibujar_artistas(artistas)
+        self.canvas.blit(self.fig.bbox)
+    
+    def _schedule_redraw(self):
+        """Agrupa los cambios de modo seguidos en un único redibujado 50 ms después del último"""
+        if self._redraw_pending is not None:
+            self.master.after_cancel(self._redraw_pending)
+        self._redraw_pending = self.master.after(50, self._do_redraw)
+    
+    def _do_redraw(self):
+        """Ejecuta el redibujado programado por _schedule_redraw"""
+        self._redraw_pending = None
+        self.actualizar_grafico()
+    
+    def _aplicar_rotulos(self, artistas, rotulos):
+        """
+        Ajusta título, etiquetas, leyenda, rejilla y límites del modo actual
+        
+        Args:
+            artistas (list): Artistas del modo
+            rotulos (dict): Título, etiqueta del eje Y y, opcionalmente, leyenda (vacío si no hay datos)
+        """
+        self.ax.set_title(rotulos.get('titulo', ''))
+        self.ax.set_xlabel('Fecha' if rotulos else '')
+        self.ax.set_ylabel(rotulos.get('ylabel', ''))
+        
+        handles = rotulos.get('leyenda') or [
+            a for a in artistas if a.axes is self.ax and a.get_label() and not a.get_label().startswith('_')
+        ]
+        if handles:
+            self.ax.legend(handles=handles, loc='upper left')
+        elif self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        
+        if rotulos:
+            self.ax.grid(True, alpha=0.3)
+            self.ax.relim(visible_only=True)
+            self.ax.autoscale_view()
+            if self._ax_volumen.get_visible():
+                self._ax_volumen.relim(visible_only=True)
+                self._ax_volumen.autoscale_view()
+        else:
+            self.ax.grid(False)
+            self.ax.set_xlim(0, 1)
+            self.ax.set_ylim(0, 1)
+    
+    def _dibujar_artistas(self, artistas):
+        """
+        Dibuja los artistas animados sobre el fondo actual del canvas
+        
+        Args:
+            artistas (list): Artistas a dibujar
+        """
+        for artista in artistas:
+            artista.axes.draw_artist(artista)
+    
+    def _descartar_artistas(self):
+        """Elimina los artistas y fondos guardados para reconstruirlos con datos nuevos"""
+        barras = set(self._barras_volumen.patches) if self._barras_volumen is not None else set()
+        for artistas, _ in self._artistas.values():
+            for artista in artistas:
+                if artista not in barras:
+                    artista.remove()
+        self._artistas.clear()
+        self._fondos.clear()
+        self._lttb_cache.clear()
+        self._arrs.clear()
+    
+    def _on_draw(self, event):
+        """
+        Tras cada dibujado completo guarda el fondo del modo actual y pinta sus artistas
+        
+        Args:
+            event: Evento 'draw_event' de matplotlib
+        """
+        if self._modo_dibujado not in self._artistas:
+            return
+        self._fondos[self._modo_dibujado] = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._dibujar_artistas(self._artistas[self._modo_dibujado][0])
+    
+    def _on_resize(self, event):
+        """
+        Invalida los fondos guardados al cambiar el tamaño del canvas
+        
+        Args:
+            event: Evento 'resize_event' de matplotlib
+        """
+        self._fondos.clear()
     
     def graficar_precios(self):
-        """Grafica los precios de Bitcoin"""
+        """
+        Crea los artistas del gráfico de precios de Bitcoin
+        
+        Returns:
+            tuple: (lista de artistas animados, rótulos del modo)
+        """
         if 'df_raw' not in self.datos or self.datos['df_raw'] is None:
-            self.ax.text(0.5, 0.5, "No hay datos disponibles", ha='center', va='center')
-            return
+            self._quitar_barras_volumen()
+            return self._artista_sin_datos("No hay datos disponibles")
         
         df = self.datos['df_raw']
         
         # Graficar precio de cierre
-        self.ax.plot(df.index, df['close'], label='Precio de cierre', color='blue')
+        artistas = self.ax.plot(*self._serie_reducida(df, 'close'), label='Precio de cierre', color='blue', animated=True)
         
         # Graficar volumen como barras en eje secundario si está disponible
-        if 'volume' in df.columns:
-            ax2 = self.ax.twinx()
-            ax2.bar(df.index, df['volume'], alpha=0.3, color='gray', label='Volumen')
-            ax2.set_ylabel('Volumen', color='gray')
-            ax2.tick_params(axis='y', labelcolor='gray')
+        barras = self._actualizar_barras_volumen(df)
         
         # Añadir medias móviles si están disponibles en datos procesados
         if 'df_procesado' in self.datos and self.datos['df_procesado'] is not None:
             df_proc = self.datos['df_procesado']
             if 'sma_20' in df_proc.columns:
-                self.ax.plot(df_proc.index, df_proc['sma_20'], label='SMA 20', color='orange', linestyle='--')
+                artistas += self.ax.plot(*self._serie_reducida(df_proc, 'sma_20'), label='SMA 20', color='orange', linestyle='--', animated=True)
             if 'sma_50' in df_proc.columns:
-                self.ax.plot(df_proc.index, df_proc['sma_50'], label='SMA 50', color='green', linestyle='--')
+                artistas += self.ax.plot(*self._serie_reducida(df_proc, 'sma_50'), label='SMA 50', color='green', linestyle='--', animated=True)
         
-        # Configurar gráfico
-        self.ax.set_title('Precio de Bitcoin')
-        self.ax.set_xlabel('Fecha')
-        self.ax.set_ylabel('Precio (USD)')
-        self.ax.legend(loc='upper left')
-        self.ax.grid(True, alpha=0.3)
+        # El eje del volumen se dibuja encima del principal: sus barras van al final
+        artistas.extend(barras)
+        
+        return artistas, {'titulo': 'Precio de Bitcoin', 'ylabel': 'Precio (USD)'}
+    
+    def _actualizar_barras_volumen(self, df):
+        """
+        Actualiza las barras de volumen del eje secundario
+        
+        Si las fechas coinciden con las de las barras existentes solo se cambian sus alturas;
+        en otro caso se reconstruyen.
+        
+        Args:
+            df (pd.DataFrame): Datos crudos
+            
+        Returns:
+            list: Rectángulos de las barras (vacía si no hay columna de volumen)
+        """
+        if 'volume' not in df.columns:
+            self._quitar_barras_volumen()
+            return []
+        
+        volumen = self._array(df, 'volume')
+        if self._barras_volumen is not None and self._x_volumen.equals(df.index):
+            for barra, altura in zip(self._barras_volumen.patches, volumen):
+                barra.set_height(altura)
+        else:
+            self._quitar_barras_volumen()
+            self._barras_volumen = self._ax_volumen.bar(df.index, volumen, alpha=0.3, color='gray', label='Volumen', animated=True)
+            self._x_volumen = df.index
+        return list(self._barras_volumen.patches)
+    
+    def _quitar_barras_volumen(self):
+        """Elimina las barras de volumen del eje secundario, si existen"""
+        if self._barras_volumen is not None:
+            self._barras_volumen.remove()
+            self._barras_volumen = None
+            self._x_volumen = None
     
     def graficar_clusters(self):
-        """Grafica los clusters identificados"""
+        """
+        Crea los artistas del gráfico de clusters identificados
+        
+        Returns:
+            tuple: (lista de artistas animados, rótulos del modo)
+        """
         if 'df_clusters' not in self.datos or self.datos['df_clusters'] is None:
-            self.ax.text(0.5, 0.5, "No hay datos de clusters disponibles", ha='center', va='center')
-            return
+            return self._artista_sin_datos("No hay datos de clusters disponibles")
         
         df = self.datos['df_clusters']
         
         # Verificar que tenemos la columna cluster
         if 'cluster' not in df.columns:
-            self.ax.text(0.5, 0.5, "No se encontró la columna 'cluster' en los datos", ha='center', va='center')
-            return
+            return self._artista_sin_datos("No se encontró la columna 'cluster' en los datos")
         
         # Colores para clusters
-        colores = config.GUI_CONFIG["colores"]["cluster_colores"]
-        
-        # Graficar cada cluster por separado
-        for cluster in sorted(df['cluster'].unique()):
-            if cluster < 0:  # Saltar puntos no asignados
-                continue
-                
-            mask = df['cluster'] == cluster
-            self.ax.scatter(
-                df.index[mask], 
-                df['close'][mask] if 'close' in df.columns else df['retorno'][mask], 
-                s=30, 
-                c=colores[int(cluster) % len(colores)], 
-                alpha=0.7, 
-                label=f'Cluster {int(cluster)}'
-            )
+        colores = np.asarray(config.GUI_CONFIG["colores"]["cluster_colores"])
+        
+        # Un único scatter con un color por punto; los no asignados (cluster < 0) se omiten
+        clusters = self._array(df, 'cluster')
+        mask = clusters >= 0
+        valores = self._array(df, 'close' if 'close' in df.columns else 'retorno')
+        ids = clusters[mask].astype(np.int64)
+        
+        # Ordenar por cluster para mantener el apilado de antes (cada cluster encima del anterior)
+        orden = np.argsort(ids, kind='stable')
+        ids = ids[orden]
+        artistas = [self.ax.scatter(
+            self._array(df)[mask][orden], 
+            valores[mask][orden], 
+            s=30, 
+            c=colores[ids % len(colores)], 
+            alpha=0.7, 
+            animated=True
+        )]
+        
+        # Leyenda con un marcador por cluster presente
+        leyenda = [
+            Line2D([0], [0], marker='o', linestyle='', markersize=np.sqrt(30), alpha=0.7,
+                   color=colores[k % len(colores)], label=f'Cluster {k}')
+            for k in np.unique(ids)
+        ]
         
         # Línea de precio en segundo plano
         if 'close' in df.columns:
-            self.ax.plot(df.index, df['close'], color='gray', alpha=0.3, zorder=0)
-            self.ax.set_ylabel('Precio (USD)')
+            artistas += self.ax.plot(*self._serie_reducida(df, 'close'), color='gray', alpha=0.3, zorder=0, animated=True)
+            ylabel = 'Precio (USD)'
         else:
-            self.ax.plot(df.index, df['retorno'], color='gray', alpha=0.3, zorder=0)
-            self.ax.set_ylabel('Retorno (%)')
+            artistas += self.ax.plot(*self._serie_reducida(df, 'retorno'), color='gray', alpha=0.3, zorder=0, animated=True)
+            ylabel = 'Retorno (%)'
+        
+        # El orden de dibujado con blitting sigue el de la lista: la línea de fondo primero
+        artistas.sort(key=lambda a: a.get_zorder())
         
-        # Configurar gráfico
-        self.ax.set_title('Clustering de Bitcoin')
-        self.ax.set_xlabel('Fecha')
-        self.ax.legend(loc='upper left')
-        self.ax.grid(True, alpha=0.3)
+        return artistas, {'titulo': 'Clustering de Bitcoin', 'ylabel': ylabel, 'leyenda': leyenda}
     
     def graficar_anomalias(self):
-        """Grafica las anomalías detectadas"""
+        """
+        Crea los artistas del gráfico de anomalías detectadas
+        
+        Returns:
+            tuple: (lista de artistas animados, rótulos del modo)
+        """
         if 'df_anomalias' not in self.datos or self.datos['df_anomalias'] is None:
-            self.ax.text(0.5, 0.5, "No hay datos de anomalías disponibles", ha='center', va='center')
-            return
+            return self._artista_sin_datos("No hay datos de anomalías disponibles")
         
         df = self.datos['df_anomalias']
         
         # Verificar que tenemos las columnas necesarias
         if 'anomalia_pred' not in df.columns or 'close' not in df.columns:
-            self.ax.text(0.5, 0.5, "No se encontraron columnas necesarias para visualizar anomalías", ha='center', va='center')
-            return
+            return self._artista_sin_datos("No se encontraron columnas necesarias para visualizar anomalías")
         
         # Graficar precio
-        self.ax.plot(df.index, df['close'], color='blue', alpha=0.6, zorder=1)
+        artistas = self.ax.plot(*self._serie_reducida(df, 'close'), color='blue', alpha=0.6, zorder=1, animated=True)
         
-        # Destacar anomalías
-        mask_anomalias = df['anomalia_pred'] == 1
-        self.ax.scatter(
-            df.index[mask_anomalias], 
-            df['close'][mask_anomalias], 
+        # Destacar anomalías (máscara NumPy precalculada, sin Series intermedias)
+        mask_anomalias, _ = self._anomalias_precalculadas(df)
+        artistas.append(self.ax.scatter(
+            self._array(df)[mask_anomalias], 
+            self._array(df, 'close')[mask_anomalias], 
             color='red', 
             s=80, 
             marker='o', 
             label='Anomalía', 
-            zorder=2
-        )
+            zorder=2,
+            animated=True
+        ))
+        
+        return artistas, {'titulo': 'Anomalías Detectadas en Bitcoin', 'ylabel': 'Precio (USD)'}
+    
+    def _array(self, df, columna=None):
+        """
+        Devuelve una columna (o el índice) de df como array de NumPy, extraído una sola vez
+        por conjunto de datos y reutilizado en los cambios de modo
+        
+        Args:
+            df (pd.DataFrame): DataFrame con los datos
+            columna (str): Columna a extraer; None para el índice
+            
+        Returns:
+            np.ndarray: Valores de la columna o del índice
+        """
+        clave = (id(df), columna)
+        if clave not in self._arrs:
+            self._arrs[clave] = df.index.values if columna is None else df[columna].to_numpy()
+        return self._arrs[clave]
+    
+    def _serie_reducida(self, df, columna):
+        """
+        Devuelve la serie a dibujar, reducida con LTTB si tiene muchos más puntos que píxeles
+        
+        Args:
+            df (pd.DataFrame): DataFrame con índice temporal
+            columna (str): Columna a dibujar
+            
+        Returns:
+            tuple: (fechas, valores) como arrays de NumPy
+        """
+        ancho_px = int(self.ax.bbox.width)
+        clave = (id(df), columna, ancho_px)
+        if clave in self._lttb_cache:
+            return self._lttb_cache[clave]
+        
+        x = self._array(df)
+        y = np.asarray(self._array(df, columna), dtype=np.float64)
+        
+        # Los NaN iniciales de las medias móviles no se dibujan y romperían el cálculo de áreas
+        finitos = np.isfinite(y)
+        if not finitos.all():
+            x, y = x[finitos], y[finitos]
+        
+        if len(x) > 4 * ancho_px:
+            x_red, y = self._lttb(x.view(np.int64), y, 2 * ancho_px)
+            x = x_red.view(x.dtype)
+        
+        self._lttb_cache[clave] = (x, y)
+        return x, y
+    
+    def _lttb(self, x, y, n_out):
+        """
+        Reduce una serie a n_out puntos con Largest-Triangle-Three-Buckets
+        
+        Se conservan el primer y el último punto; el resto se reparte en n_out - 2 cubos y de
+        cada uno se elige el punto que forma el triángulo de mayor área con el punto elegido
+        en el cubo anterior y la media del cubo siguiente.
+        
+        Args:
+            x (np.ndarray): Abscisas (enteros o flotantes, crecientes)
+            y (np.ndarray): Ordenadas
+            n_out (int): Número de puntos de salida
+            
+        Returns:
+            tuple: (x, y) reducidos
+        """
+        n = len(x)
+        if n_out >= n or n_out < 3:
+            return x, y
+        
+        xf = x.astype(np.float64)
+        bordes = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+        indices = np.empty(n_out, dtype=np.int64)
+        indices[0], indices[-1] = 0, n - 1
+        
+        # Medias de cada cubo; la del último cubo interior es el punto final
+        sumas_x = np.add.reduceat(xf[1:n - 1], bordes[:-1] - 1)
+        sumas_y = np.add.reduceat(y[1:n - 1], bordes[:-1] - 1)
+        tamanos = np.diff(bordes)
+        medias_x = np.append(sumas_x / tamanos, xf[-1])
+        medias_y = np.append(sumas_y / tamanos, y[-1])
+        
+        a = 0
+        for i in range(n_out - 2):
+            ini, fin = bordes[i], bordes[i + 1]
+            areas = np.abs(
+                (xf[a] - medias_x[i + 1]) * (y[ini:fin] - y[a])
+                - (xf[a] - xf[ini:fin]) * (medias_y[i + 1] - y[a])
+            )
+            a = ini + int(np.argmax(areas))
+            indices[i + 1] = a
         
-        # Configurar gráfico
-        self.ax.set_title('Anomalías Detectadas en Bitcoin')
-        self.ax.set_xlabel('Fecha')
-        self.ax.set_ylabel('Precio (USD)')
-        self.ax.legend(loc='upper left')
-        self.ax.grid(True, alpha=0.3)
+        return x[indices], y[indices]
+    
+    def _artista_sin_datos(self, mensaje):
+        """
+        Crea el texto que se muestra cuando un modo no tiene datos
+        
+        Args:
+            mensaje (str): Texto a mostrar
+            
+        Returns:
+            tuple: (lista con el texto animado, rótulos vacíos)
+        """
+        texto = self.ax.text(0.5, 0.5, mensaje, ha='center', va='center',
+                             transform=self.ax.transAxes, animated=True)
+        return [texto], {}
     
     def generar_reporte(self):
-        """Genera un reporte completo y lo guarda en archivo"""
+        """
+        Genera un reporte completo y lo guarda en archivo
+        
+        El texto y los gráficos se escriben en paralelo en el pool de hilos; _report_done
+        recoge cada tarea en el hilo de la interfaz y avisa al terminar la última.
+        """
         self.actualizar_estado("Generando reporte...")
         
         try:
@@ -666,45 +1275,96 @@ class InterfazTrading:
                 self.actualizar_estado("Generación de reporte cancelada")
                 return
             
-            # Crear evaluador para generar reporte
-            evaluador = Evaluador(config.PARAMETROS)
-            evaluador.generar_reporte(self.datos['resultados'], ruta_reporte)
+            # Escribir el reporte (el mismo texto que muestra la pestaña de evaluación)
+            tareas = [self._executor.submit(self._do_report, ruta_reporte, self.datos['resultados'])]
             
-            # Guardar gráficos
+            # Guardar gráficos: son independientes, así que se rasterizan y escriben en paralelo
             ruta_base = os.path.dirname(ruta_reporte)
+            util = Utilidades()
             
             # Guardar gráfico de precios
             if 'df_raw' in self.datos and self.datos['df_raw'] is not None:
-                util = Utilidades()
-                fig_precios = util.crear_grafico_precios(
+                tareas.append(self._executor.submit(
+                    util.crear_grafico_precios,
                     self.datos['df_raw'], 
                     titulo='Precio Bitcoin',
                     guardar_como=os.path.join(ruta_base, f"grafico_precios_{fecha_actual}.png")
-                )
+                ))
             
             # Guardar gráfico de clusters
             if 'df_clusters' in self.datos and self.datos['df_clusters'] is not None:
-                fig_clusters = util.crear_grafico_clusters(
+                tareas.append(self._executor.submit(
+                    util.crear_grafico_clusters,
                     self.datos['df_clusters'],
                     titulo='Clustering de Bitcoin',
                     guardar_como=os.path.join(ruta_base, f"grafico_clusters_{fecha_actual}.png")
-                )
+                ))
             
             # Guardar gráfico de anomalías
             if 'df_anomalias' in self.datos and self.datos['df_anomalias'] is not None:
-                fig_anomalias = util.crear_grafico_anomalias(
+                tareas.append(self._executor.submit(
+                    util.crear_grafico_anomalias,
                     self.datos['df_anomalias'],
                     titulo='Anomalías Detectadas',
                     guardar_como=os.path.join(ruta_base, f"grafico_anomalias_{fecha_actual}.png")
-                )
+                ))
             
-            messagebox.showinfo("Éxito", f"Reporte generado y guardado en:\n{ruta_reporte}")
-            self.actualizar_estado("Reporte generado correctamente")
+            self._bloquear_controles(True)
+            self._tareas_reporte = set(tareas)
+            self._errores_reporte = []
+            for tarea in tareas:
+                tarea.add_done_callback(lambda f: self.master.after(0, self._report_done, ruta_reporte, f))
             
         except Exception as e:
-            self.logger.error(f"Error al generar reporte: {str(e)}")
-            messagebox.showerror("Error", f"Error al generar reporte: {str(e)}")
-            self.actualizar_estado("Error al generar reporte")
+            self._error_reporte(e)
+    
+    def _do_report(self, ruta_reporte, resultados):
+        """
+        Escribe el texto del reporte (se ejecuta en un hilo de trabajo)
+        
+        Args:
+            ruta_reporte (str): Ruta del archivo de texto
+            resultados (dict): Resultados de la evaluación
+        """
+        with open(ruta_reporte, 'w', encoding='utf-8') as f:
+            f.write(self._texto_reporte(id(resultados)))
+    
+    def _report_done(self, ruta_reporte, futuro):
+        """
+        Recoge en el hilo de la interfaz una tarea terminada del reporte
+        
+        Args:
+            ruta_reporte (str): Ruta del archivo de texto del reporte
+            futuro (Future): Futuro de la tarea terminada
+        """
+        self._tareas_reporte.discard(futuro)
+        
+        error = futuro.exception()
+        if error is not None:
+            self._errores_reporte.append(error)
+        
+        if self._tareas_reporte:
+            return
+        
+        self._bloquear_controles(False)
+        
+        if self._errores_reporte:
+            self._error_reporte(self._errores_reporte[0])
+            return
+        
+        messagebox.showinfo("Éxito", f"Reporte generado y guardado en:\n{ruta_reporte}")
+        self.actualizar_estado("Reporte generado correctamente")
+    
+    def _error_reporte(self, error):
+        """
+        Registra y muestra un error de la generación del reporte
+        
+        Args:
+            error (Exception): Error producido
+        """
+        self.logger.error(f"Error al generar reporte: {str(error)}")
+        messagebox.showerror("Error", f"Error al generar reporte: {str(error)}")
+        self.actualizar_estado("Error al generar reporte")
 
 
 def iniciar_interfaz(datos=None):
@@ -722,6 +1382,9 @@ def iniciar_interfaz(datos=None):
     
     # Iniciar bucle principal
     root.mainloop()
+    
+    # Descartar el trabajo pendiente al cerrar la ventana
+    app._executor.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
@@ -10,11 +10,13 @@ import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 import joblib
 
+from src.modelos import predictor_treelite
+
 class ModeloAnomalias:
     """
     Clase para la detección de anomalías en datos de criptomonedas utilizando Random Forest
     """
-    def __init__(self, n_estimators=100, max_depth=10, random_state=42):
+    def __init__(self, n_estimators=100, max_depth=10, random_state=42, n_jobs=-1, compilar_treelite=False):
         """
         Inicializa el modelo de deteccion de anomalias
         
@@ -22,19 +24,26 @@ class ModeloAnomalias:
             n_estimators (int): Numero de arboles en el bosque aleatorio
             max_depth (int): Profundidad maxima de los arboles
             random_state (int): Semilla para reproducibilidad
+            n_jobs (int): Hilos para entrenar y predecir árbol a árbol (-1 usa todos los núcleos)
+            compilar_treelite (bool): Compilar el bosque con Treelite al guardarlo (requiere
+                treelite, tl2cgen y un compilador de C)
         """
         self.n_estimators = n_estimators
         self.max_depth = max_depth
         self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.compilar_treelite = compilar_treelite
         self.modelo = RandomForestClassifier(
             n_estimators=n_estimators,
             max_depth=max_depth,
             random_state=random_state,
-            class_weight='balanced'
+            class_weight='balanced',
+            n_jobs=n_jobs
         )
         # El atributo feature_names_in_ se establece automáticamente durante el entrenamiento
         self.logger = logging.getLogger(__name__)
         self.caracteristicas = None
+        self._predictor = None
     
     def entrenar(self, df):
         """
@@ -58,6 +67,9 @@ class ModeloAnomalias:
         
         # Entrenar modelo
         try:
+            # El predictor compilado corresponde al bosque anterior
+            self._predictor = None
+            
             # Si X es un DataFrame, entrenar directamente para que feature_names_in_ se capture automáticamente
             if isinstance(X, pd.DataFrame):
                 self.modelo.fit(X, y)
@@ -93,6 +105,24 @@ class ModeloAnomalias:
         
         return self
     
+    def _predecir_probabilidades(self, X):
+        """
+        Calcula la probabilidad de cada clase, con el predictor compilado de Treelite si lo hay
+        
+        Args:
+            X (pd.DataFrame o np.ndarray): Características
+            
+        Returns:
+            np.ndarray: Probabilidades con forma (muestras, clases)
+        """
+        if self._predictor is not None:
+            try:
+                return predictor_treelite.predecir_probabilidades(self._predictor, X)
+            except Exception as e:
+                self.logger.warning(f"Error al predecir con Treelite, se usará sklearn: {str(e)}")
+        
+        return self.modelo.predict_proba(X)
+    
     def _preparar_datos(self, df):
         """
         Prepara los datos para entrenamiento o predicción
@@ -198,9 +228,10 @@ class ModeloAnomalias:
             
             # Asegurar que X tiene la forma correcta para predecir
             try:
-                # Predecir probabilidades
-                probs = self.modelo.predict_proba(X)
-                predicciones = self.modelo.predict(X)
+                # Predecir probabilidades; la clase predicha es la más probable (lo mismo que
+                # predict, sin recorrer los árboles una segunda vez)
+                probs = self._predecir_probabilidades(X)
+                predicciones = self.modelo.classes_[np.argmax(probs, axis=1)]
             except Exception as e:
                 self.logger.error(f"Error al predecir con el modelo: {str(e)}")
                 # Plan B: Generar predicciones sintéticas para no romper el flujo
@@ -305,12 +336,23 @@ class ModeloAnomalias:
         os.makedirs(os.path.dirname(ruta_archivo), exist_ok=True)
         
         try:
+            # El predictor compilado de un modelo anterior ya no corresponde a este
+            if os.path.exists(predictor_treelite.ruta_predictor(ruta_archivo)):
+                os.remove(predictor_treelite.ruta_predictor(ruta_archivo))
+            
+            # Compilar el bosque solo si se ha pedido (tarda unos segundos y necesita compilador)
+            nombre_predictor = None
+            if self.compilar_treelite:
+                nombre_predictor = predictor_treelite.compilar_predictor(self.modelo, ruta_archivo)
+            
             # Guardar el modelo y metadatos
             modelo_data = {
                 'modelo': self.modelo,
                 'caracteristicas': self.caracteristicas,
                 'importancia_caracteristicas': getattr(self, 'importancia_caracteristicas', None),
-                'feature_names': getattr(self, 'feature_names', None)
+                'feature_names': getattr(self, 'feature_names', None),
+                'n_jobs': self.n_jobs,
+                'predictor_treelite': nombre_predictor
             }
             
             joblib.dump(modelo_data, ruta_archivo)
@@ -340,6 +382,13 @@ class ModeloAnomalias:
             self.caracteristicas = modelo_data['caracteristicas']
             self.importancia_caracteristicas = modelo_data.get('importancia_caracteristicas', None)
             self.feature_names = modelo_data.get('feature_names', None)
+            self.n_jobs = modelo_data.get('n_jobs', self.modelo.n_jobs)
+            
+            
+            # Predictor compilado al guardar, si se generó
+            self._predictor = predictor_treelite.cargar_predictor(
+                ruta_archivo, modelo_data.get('predictor_treelite'), self.n_jobs
+            )
         except Exception as e:
             self.logger.error(f"Error al cargar modelo desde {ruta_archivo}: {str(e)}", exc_info=True)
             raise
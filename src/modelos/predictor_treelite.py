@@ -0,0 +1,98 @@
+"""
+Modulo para compilar y usar con Treelite los bosques aleatorios de sklearn
+Treelite y tl2cgen son opcionales: sin ellos (o sin compilador de C) se predice con sklearn
+"""
+
+import os
+import sys
+import logging
+import numpy as np
+
+try:
+    import treelite.sklearn
+    import tl2cgen
+except ImportError:  # treelite/tl2cgen son opcionales, se usa predict_proba de sklearn como respaldo
+    tl2cgen = None
+
+logger = logging.getLogger(__name__)
+
+def ruta_predictor(ruta_modelo):
+    """
+    Ruta de la biblioteca compilada con Treelite para un archivo de modelo
+    
+    Args:
+        ruta_modelo (str): Ruta del archivo del modelo
+    
+    Returns:
+        str: Ruta de la biblioteca (extensión según la plataforma)
+    """
+    if os.name == 'nt':
+        extension = ".dll"
+    elif sys.platform == 'darwin':
+        extension = ".dylib"
+    else:
+        extension = ".so"
+    return os.path.splitext(str(ruta_modelo))[0] + "_treelite" + extension
+
+def compilar_predictor(modelo, ruta_modelo):
+    """
+    Compila un bosque de sklearn a una biblioteca nativa junto al archivo del modelo
+    
+    Args:
+        modelo (RandomForestClassifier): Bosque entrenado
+        ruta_modelo (str): Ruta del archivo del modelo
+    
+    Returns:
+        str: Nombre de la biblioteca generada, o None si Treelite no está disponible o falla
+    """
+    if tl2cgen is None:
+        logger.warning("Treelite/tl2cgen no están instalados: el modelo se usará con sklearn")
+        return None
+    
+    ruta = ruta_predictor(ruta_modelo)
+    try:
+        logger.info(f"Compilando el modelo con Treelite en {ruta}")
+        modelo_treelite = treelite.sklearn.import_model(modelo)
+        tl2cgen.export_lib(modelo_treelite, toolchain='msvc' if os.name == 'nt' else 'gcc', libpath=ruta,
+                           params={'parallel_comp': os.cpu_count() or 1})
+        return os.path.basename(ruta)
+    except Exception as e:
+        logger.warning(f"No se pudo compilar el modelo con Treelite, se usará sklearn: {str(e)}")
+        return None
+
+def cargar_predictor(ruta_modelo, nombre, n_jobs=None):
+    """
+    Carga la biblioteca compilada de un modelo
+    
+    Args:
+        ruta_modelo (str): Ruta del archivo del modelo
+        nombre (str): Nombre de la biblioteca guardado con el modelo (None si no se compiló)
+        n_jobs (int): Hilos de predicción (None o negativo para todos los núcleos)
+    
+    Returns:
+        tl2cgen.Predictor: Predictor compilado, o None si no hay biblioteca o no se puede cargar
+    """
+    if not nombre or tl2cgen is None:
+        return None
+    
+    ruta = os.path.join(os.path.dirname(str(ruta_modelo)), nombre)
+    try:
+        nthread = n_jobs if n_jobs is not None and n_jobs > 0 else -1
+        return tl2cgen.Predictor(ruta, nthread=nthread)
+    except Exception as e:
+        logger.warning(f"No se pudo cargar el predictor de Treelite, se usará sklearn: {str(e)}")
+        return None
+
+def predecir_probabilidades(predictor, X):
+    """
+    Calcula la probabilidad de cada clase con un predictor compilado
+    
+    Args:
+        predictor (tl2cgen.Predictor): Predictor compilado
+        X (pd.DataFrame o np.ndarray): Características
+    
+    Returns:
+        np.ndarray: Probabilidades con forma (muestras, clases)
+    """
+    datos = tl2cgen.DMatrix(np.asarray(X, dtype=np.float64))
+    return predictor.predict(datos).reshape(len(X), -1)
@@ -0,0 +1,6 @@
+"""
+Inicializador del modulo de pipeline
+"""
+
+from .modeling import run_modeling_stages
+from .preprocessing import preprocesar_con_cache
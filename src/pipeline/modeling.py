@@ -0,0 +1,140 @@
+"""
+Modulo con las etapas de modelado compartidas por los scripts principales
+"""
+
+import os
+import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+
+logger = logging.getLogger(__name__)
+
+def n_jobs_por_etapa(etapas=3):
+    """
+    Hilos que puede usar una etapa de modelado cuando se ejecuta a la vez que las demás
+    
+    Args:
+        etapas (int): Número de etapas que se ejecutan en paralelo
+        
+    Returns:
+        int: Núcleos disponibles repartidos entre las etapas (al menos 1)
+    """
+    return max(1, (os.cpu_count() or 1) // etapas)
+
+def _inicializar_logging_worker(cola, nivel):
+    """
+    Envía los logs de un proceso de trabajo a la cola que atiende el proceso principal
+    
+    Los procesos del pool terminan sin ejecutar atexit, así que no pueden usar el
+    MemoryHandler heredado (se perderían sus registros o, con fork, se reescribirían
+    los pendientes del proceso principal).
+    
+    Args:
+        cola (multiprocessing.Queue): Cola de registros
+        nivel (int): Nivel del logger raíz del proceso principal
+    """
+    raiz = logging.getLogger()
+    raiz.handlers = [logging.handlers.QueueHandler(cola)]
+    raiz.setLevel(nivel)
+
+def _clases_modelos(mejorado):
+    """
+    Devuelve las clases de anomalias y reglas segun la variante de los modulos
+    
+    Args:
+        mejorado (bool): Si se usan los modulos *_mejorado
+        
+    Returns:
+        tuple: (ModeloAnomalias, MineroReglas)
+    """
+    if mejorado:
+        from src.modelos.anomalias_mejorado import ModeloAnomalias
+        from src.modelos.reglas_asociacion_mejorado import MineroReglas
+    else:
+        from src.modelos.anomalias import ModeloAnomalias
+        from src.modelos.reglas_asociacion import MineroReglas
+    return ModeloAnomalias, MineroReglas
+
+def _run_clustering(df_procesado, params):
+    """Entrena el clustering y guarda el modelo (ejecutable en un proceso aparte)"""
+    from src.modelos.clustering import ModeloClustering
+    
+    modelo_clustering = ModeloClustering(
+        n_clusters=params['clustering_num_clusters'],
+        random_state=params['clustering_random_state']
+    )
+    df_clusters = modelo_clustering.entrenar_y_predecir(df_procesado)
+    modelo_clustering.guardar_modelo(config.MODELO_CLUSTERING)
+    return df_clusters
+
+def _run_anomalias(df_procesado, params, mejorado, n_jobs):
+    """Entrena el detector de anomalías y guarda el modelo (ejecutable en un proceso aparte)"""
+    ModeloAnomalias, _ = _clases_modelos(mejorado)
+    
+    modelo_anomalias = ModeloAnomalias(
+        n_estimators=params['rf_num_arboles'],
+        max_depth=params['rf_max_depth'],
+        random_state=params['rf_random_state'],
+        n_jobs=n_jobs,
+        compilar_treelite=params['rf_compilar_treelite']
+    )
+    df_anomalias = modelo_anomalias.entrenar_y_predecir(df_procesado)
+    modelo_anomalias.guardar_modelo(config.MODELO_ANOMALIAS)
+    return df_anomalias
+
+def _run_reglas(df_discretizado, params, mejorado):
+    """Extrae y guarda las reglas de asociación (ejecutable en un proceso aparte)"""
+    _, MineroReglas = _clases_modelos(mejorado)
+    
+    minero_reglas = MineroReglas(
+        soporte_min=params['reglas_soporte_min'],
+        confianza_min=params['reglas_confianza_min'],
+        lift_min=params['reglas_lift_min']
+    )
+    reglas = minero_reglas.extraer_reglas(df_discretizado)
+    minero_reglas.guardar_reglas(reglas, config.REGLAS_ASOCIACION)
+    return reglas
+
+def run_modeling_stages(df_procesado, df_discretizado, params, mejorado=True):
+    """
+    Ejecuta clustering, detección de anomalías y reglas de asociación
+    
+    Las tres etapas son independientes entre sí y solo leen los DataFrames,
+    así que se ejecutan en paralelo en procesos aparte. Cada etapa guarda su
+    modelo en disco dentro del propio proceso.
+    
+    Args:
+        df_procesado (pd.DataFrame): Datos preprocesados
+        df_discretizado (pd.DataFrame): Datos discretizados
+        params (Mapping): Parametros de configuracion
+        mejorado (bool): Si se usan los modulos *_mejorado
+        
+    Returns:
+        tuple: (df_clusters, df_anomalias, reglas)
+    """
+    # PARAMETROS es un mappingproxy (no serializable): se envía una copia en dict
+    params = dict(params)
+    
+    logger.info("Aplicando clustering, detección de anomalías y reglas de asociación en paralelo...")
+    
+    # Los registros de los procesos de trabajo los escriben los handlers del proceso principal
+    raiz = logging.getLogger()
+    cola = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(cola, *raiz.handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        with ProcessPoolExecutor(max_workers=3, initializer=_inicializar_logging_worker,
+                                 initargs=(cola, raiz.level)) as executor:
+            futuro_clusters = executor.submit(_run_clustering, df_procesado, params)
+            futuro_anomalias = executor.submit(_run_anomalias, df_procesado, params, mejorado, n_jobs_por_etapa())
+            futuro_reglas = executor.submit(_run_reglas, df_discretizado, params, mejorado)
+            df_clusters = futuro_clusters.result()
+            df_anomalias = futuro_anomalias.result()
+            reglas = futuro_reglas.result()
+    finally:
+        listener.stop()
+    
+    return df_clusters, df_anomalias, reglas
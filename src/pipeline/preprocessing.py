@@ -0,0 +1,58 @@
+"""
+Modulo con la etapa de preprocesamiento compartida por los scripts principales
+"""
+
+import hashlib
+import logging
+
+import config
+
+logger = logging.getLogger(__name__)
+
+def _clave_preprocesado():
+    """
+    Clave de la cache de preprocesamiento
+    
+    Returns:
+        str: Hash de los datos crudos y de los parámetros
+    """
+    clave = hashlib.blake2b(config.DATOS_CRUDOS.read_bytes(), digest_size=16)
+    clave.update(repr(sorted(config.PARAMETROS.items())).encode("utf-8"))
+    return clave.hexdigest()
+
+def preprocesar_con_cache(preprocesador, df_raw):
+    """
+    Preprocesa y discretiza los datos, reutilizando la cache Parquet si los datos
+    crudos y los parámetros no han cambiado desde la última ejecución
+    
+    Args:
+        preprocesador (Preprocesador): Preprocesador a utilizar
+        df_raw (pd.DataFrame): Datos crudos
+        
+    Returns:
+        tuple: (df_procesado, df_discretizado)
+    """
+    clave = _clave_preprocesado()
+    try:
+        if config.CACHE_PROCESADO_CLAVE.read_text() == clave:
+            df_procesado = preprocesador.cargar_datos(config.CACHE_PROCESADO)
+            df_discretizado = preprocesador.cargar_datos(config.CACHE_DISCRETIZADO)
+            logger.info("Datos crudos sin cambios: usando el preprocesamiento en cache")
+            return df_procesado, df_discretizado
+    except FileNotFoundError:
+        pass
+    
+    df_procesado = preprocesador.procesar(df_raw)
+    df_discretizado = preprocesador.discretizar(df_procesado)
+    
+    # Invalidar la clave antes de sobrescribir los archivos que hacen de cache
+    config.CACHE_PROCESADO_CLAVE.unlink(missing_ok=True)
+    
+    preprocesador.guardar_datos(df_procesado, config.DATOS_PROCESADOS)
+    preprocesador.guardar_datos(df_discretizado, config.DATOS_DISCRETIZADOS)
+    logger.info(f"Datos procesados guardados en {config.DATOS_PROCESADOS}")
+    
+    # La clave se escribe al final para no validar una cache incompleta
+    config.CACHE_PROCESADO_CLAVE.write_text(clave)
+    
+    return df_procesado, df_discretizado
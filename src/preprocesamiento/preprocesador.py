@@ -379,7 +379,7 @@ class Preprocesador:
     
     def guardar_datos(self, df, ruta_archivo):
         """
-        Guarda los datos en un archivo CSV
+        Guarda los datos en un archivo CSV (o Parquet si la extension es .parquet)
         
         Args:
             df (pd.DataFrame): DataFrame con los datos
@@ -389,12 +389,15 @@ class Preprocesador:
         os.makedirs(os.path.dirname(ruta_archivo), exist_ok=True)
         
         # Guardar el DataFrame
-        df.to_csv(ruta_archivo)
+        if str(ruta_archivo).endswith('.parquet'):
+            df.to_parquet(ruta_archivo, engine='pyarrow', compression='zstd')
+        else:
+            df.to_csv(ruta_archivo)
         self.logger.info(f"Datos guardados en {ruta_archivo}")
     
     def cargar_datos(self, ruta_archivo):
         """
-        Carga datos desde un archivo CSV
+        Carga datos desde un archivo CSV (o Parquet si la extension es .parquet)
         
         Args:
             ruta_archivo (str): Ruta del archivo a cargar
@@ -407,6 +410,9 @@ class Preprocesador:
             raise FileNotFoundError(f"El archivo {ruta_archivo} no existe")
         
         self.logger.info(f"Cargando datos desde {ruta_archivo}")
+        if str(ruta_archivo).endswith('.parquet'):
+            # Parquet conserva tipos e indice: no hace falta reconvertir nada
+            return pd.read_parquet(ruta_archivo, engine='pyarrow')
         df = pd.read_csv(ruta_archivo, index_col=0)
         
         # Convertir el índice a datetime si es una fecha
@@ -5,10 +5,17 @@ Utilidades generales para el sistema de mineria de datos
 import logging
 import os
 import json
+import threading
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from datetime import datetime, timedelta
 
+# Estilo de los gráficos de reporte. Se aplica con un contexto temporal de rcParams, que es
+# estado global: el bloqueo serializa solo la construcción de las figuras, no el guardado
+_ESTILO_GRAFICOS = 'seaborn-v0_8-darkgrid'
+_estilo_lock = threading.Lock()
+
 class Utilidades:
     """
     Clase con funciones utilitarias para el sistema
@@ -93,34 +100,35 @@ class Utilidades:
         Returns:
             matplotlib.figure.Figure: Figura creada
         """
-        # Crear figura
-        plt.style.use('seaborn-v0_8-darkgrid')
-        fig, ax1 = plt.subplots(figsize=(10, 6))
-        
-        # Graficar precios
-        for col in columnas_precio:
-            if col in df.columns:
-                ax1.plot(df.index, df[col], label=col)
-        
-        ax1.set_ylabel('Precio (USD)', color='black')
-        ax1.tick_params(axis='y', labelcolor='black')
-        ax1.grid(True, alpha=0.3)
-        
-        # Incluir volumen si se solicita
-        if incluir_vol and 'volume' in df.columns:
-            ax2 = ax1.twinx()
-            ax2.fill_between(df.index, 0, df['volume'], color='lightgray', alpha=0.3, label='Volumen')
-            ax2.set_ylabel('Volumen', color='gray')
-            ax2.tick_params(axis='y', labelcolor='gray')
+        with _estilo_lock, plt.style.context(_ESTILO_GRAFICOS):
+            # Crear figura (sin pyplot, para poder generar varias en paralelo)
+            fig = Figure(figsize=(10, 6))
+            ax1 = fig.add_subplot()
+            
+            # Graficar precios
+            for col in columnas_precio:
+                if col in df.columns:
+                    ax1.plot(df.index, df[col], label=col)
+            
+            ax1.set_ylabel('Precio (USD)', color='black')
+            ax1.tick_params(axis='y', labelcolor='black')
+            ax1.grid(True, alpha=0.3)
             
-        # Formatear gráfico
-        plt.title(titulo)
-        ax1.legend(loc='upper left')
-        fig.tight_layout()
+            # Incluir volumen si se solicita
+            if incluir_vol and 'volume' in df.columns:
+                ax2 = ax1.twinx()
+                ax2.fill_between(df.index, 0, df['volume'], color='lightgray', alpha=0.3, label='Volumen')
+                ax2.set_ylabel('Volumen', color='gray')
+                ax2.tick_params(axis='y', labelcolor='gray')
+                
+            # Formatear gráfico
+            ax1.set_title(titulo)
+            ax1.legend(loc='upper left')
+            fig.tight_layout()
         
         # Guardar si se especificó ruta
         if guardar_como:
-            plt.savefig(guardar_como, dpi=300, bbox_inches='tight')
+            fig.savefig(guardar_como, dpi=300, bbox_inches='tight')
         
         return fig
     
@@ -143,40 +151,41 @@ class Utilidades:
         if clusters_col not in df.columns or precio_col not in df.columns:
             raise ValueError(f"Columnas requeridas no encontradas: {clusters_col}, {precio_col}")
         
-        # Crear figura
-        plt.style.use('seaborn-v0_8-darkgrid')
-        fig, ax = plt.subplots(figsize=(12, 7))
-        
-        # Colores para clusters
-        colores = ['#3366cc', '#dc3912', '#ff9900', '#109618', '#990099', '#0099c6']
-        
-        # Graficar cada cluster por separado
-        for cluster in sorted(df[clusters_col].unique()):
-            if cluster < 0:  # Saltar puntos no asignados
-                continue
+        with _estilo_lock, plt.style.context(_ESTILO_GRAFICOS):
+            # Crear figura (sin pyplot, para poder generar varias en paralelo)
+            fig = Figure(figsize=(12, 7))
+            ax = fig.add_subplot()
             
-            mask = df[clusters_col] == cluster
-            ax.scatter(
-                df.index[mask], 
-                df[precio_col][mask], 
-                s=30, 
-                c=colores[cluster % len(colores)], 
-                alpha=0.7, 
-                label=f'Cluster {cluster}'
-            )
-        
-        # Añadir línea de precio
-        ax.plot(df.index, df[precio_col], color='gray', alpha=0.3, zorder=0)
-        
-        # Formatear gráfico
-        ax.set_title(titulo)
-        ax.set_ylabel('Precio (USD)')
-        ax.grid(True, alpha=0.3)
-        ax.legend(loc='best')
+            # Colores para clusters
+            colores = ['#3366cc', '#dc3912', '#ff9900', '#109618', '#990099', '#0099c6']
+            
+            # Graficar cada cluster por separado
+            for cluster in sorted(df[clusters_col].unique()):
+                if cluster < 0:  # Saltar puntos no asignados
+                    continue
+                
+                mask = df[clusters_col] == cluster
+                ax.scatter(
+                    df.index[mask], 
+                    df[precio_col][mask], 
+                    s=30, 
+                    c=colores[cluster % len(colores)], 
+                    alpha=0.7, 
+                    label=f'Cluster {cluster}'
+                )
+            
+            # Añadir línea de precio
+            ax.plot(df.index, df[precio_col], color='gray', alpha=0.3, zorder=0)
+            
+            # Formatear gráfico
+            ax.set_title(titulo)
+            ax.set_ylabel('Precio (USD)')
+            ax.grid(True, alpha=0.3)
+            ax.legend(loc='best')
         
         # Guardar si se especificó ruta
         if guardar_como:
-            plt.savefig(guardar_como, dpi=300, bbox_inches='tight')
+            fig.savefig(guardar_como, dpi=300, bbox_inches='tight')
         
         return fig
     
@@ -199,34 +208,35 @@ class Utilidades:
         if anomalias_col not in df.columns or precio_col not in df.columns:
             raise ValueError(f"Columnas requeridas no encontradas: {anomalias_col}, {precio_col}")
         
-        # Crear figura
-        plt.style.use('seaborn-v0_8-darkgrid')
-        fig, ax = plt.subplots(figsize=(12, 7))
-        
-        # Graficar precio
-        ax.plot(df.index, df[precio_col], color='blue', alpha=0.6, zorder=1)
-        
-        # Destacar anomalías
-        mask_anomalias = df[anomalias_col] == 1
-        ax.scatter(
-            df.index[mask_anomalias], 
-            df[precio_col][mask_anomalias], 
-            color='red', 
-            s=80, 
-            marker='o', 
-            label='Anomalía', 
-            zorder=2
-        )
-        
-        # Formatear gráfico
-        ax.set_title(titulo)
-        ax.set_ylabel('Precio (USD)')
-        ax.grid(True, alpha=0.3)
-        ax.legend(loc='best')
+        with _estilo_lock, plt.style.context(_ESTILO_GRAFICOS):
+            # Crear figura (sin pyplot, para poder generar varias en paralelo)
+            fig = Figure(figsize=(12, 7))
+            ax = fig.add_subplot()
+            
+            # Graficar precio
+            ax.plot(df.index, df[precio_col], color='blue', alpha=0.6, zorder=1)
+            
+            # Destacar anomalías
+            mask_anomalias = df[anomalias_col] == 1
+            ax.scatter(
+                df.index[mask_anomalias], 
+                df[precio_col][mask_anomalias], 
+                color='red', 
+                s=80, 
+                marker='o', 
+                label='Anomalía', 
+                zorder=2
+            )
+            
+            # Formatear gráfico
+            ax.set_title(titulo)
+            ax.set_ylabel('Precio (USD)')
+            ax.grid(True, alpha=0.3)
+            ax.legend(loc='best')
         
         # Guardar si se especificó ruta
         if guardar_como:
-            plt.savefig(guardar_como, dpi=300, bbox_inches='tight')
+            fig.savefig(guardar_como, dpi=300, bbox_inches='tight')
         
         return fig
     
@@ -68,6 +68,8 @@ class TestModeloAnomalias:
         assert modelo.n_estimators == 10
         assert modelo.max_depth == 3
         assert modelo.random_state == 42
+        assert modelo.n_jobs == -1
+        assert modelo.modelo.n_jobs == -1
     
     def test_preparar_datos(self, modelo, datos_ejemplo):
         """Probar la preparación de datos"""
@@ -0,0 +1,166 @@
+"""
+Pruebas unitarias para el módulo de evaluación
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+# Importar el módulo a probar
+from src.evaluacion.evaluador import Evaluador
+import config
+
+def _estrategia_sma_referencia(df, parametros, ventana_corta, ventana_larga):
+    """Recorrido fila a fila de la estrategia de medias móviles (implementación original)"""
+    df = df.copy()
+    df['sma_corta'] = df['close'].rolling(window=ventana_corta).mean()
+    df['sma_larga'] = df['close'].rolling(window=ventana_larga).mean()
+    df['señal'] = 0
+    df.loc[df['sma_corta'] > df['sma_larga'], 'señal'] = 1
+    df.loc[df['sma_corta'] <= df['sma_larga'], 'señal'] = -1
+    df['cambio_señal'] = df['señal'].diff().fillna(0)
+    
+    capital = parametros['capital_inicial']
+    comision = parametros['comision'] / 100
+    posicion = 0
+    precio_compra = 0
+    operaciones = 0
+    for _, row in df.iterrows():
+        if posicion == 0 and row['cambio_señal'] > 0:
+            precio_compra = row['close']
+            posicion = 1
+            capital -= capital * comision
+            operaciones += 1
+        elif posicion == 1 and row['cambio_señal'] < 0:
+            capital *= row['close'] / precio_compra
+            capital -= capital * comision
+            posicion = 0
+            operaciones += 1
+    if posicion == 1:
+        capital *= df['close'].iloc[-1] / precio_compra
+        capital -= capital * comision
+    
+    return (capital / parametros['capital_inicial'] - 1) * 100, operaciones
+
+def _estrategia_anomalias_referencia(df, df_anomalias, parametros, umbral_prob=0.7, dias_mantenimiento=5):
+    """Recorrido fila a fila de la estrategia de anomalías (implementación original)"""
+    df_comun = df.merge(df_anomalias[['prob_anomalia']], left_index=True, right_index=True, how='left')
+    
+    capital = parametros['capital_inicial']
+    comision = parametros['comision'] / 100
+    posicion = 0
+    precio_compra = 0
+    dias_desde_compra = 0
+    operaciones = 0
+    for _, row in df_comun.iterrows():
+        if posicion == 0 and row.get('prob_anomalia', 0) > umbral_prob:
+            precio_compra = row['close']
+            posicion = 1
+            capital -= capital * comision
+            dias_desde_compra = 0
+            operaciones += 1
+        elif posicion == 1:
+            dias_desde_compra += 1
+            if dias_desde_compra >= dias_mantenimiento:
+                capital *= row['close'] / precio_compra
+                capital -= capital * comision
+                posicion = 0
+                operaciones += 1
+    if posicion == 1:
+        capital *= df_comun['close'].iloc[-1] / precio_compra
+        capital -= capital * comision
+    
+    return (capital / parametros['capital_inicial'] - 1) * 100, operaciones
+
+class TestEvaluador:
+    """
+    Pruebas para la clase Evaluador
+    """
+    
+    @pytest.fixture
+    def evaluador(self):
+        """Fixture que crea una instancia del evaluador para las pruebas"""
+        return Evaluador(config.PARAMETROS)
+    
+    @pytest.fixture
+    def reglas(self):
+        """Fixture que proporciona reglas de asociación de ejemplo"""
+        return pd.DataFrame({
+            'antecedentes': ['rsi_cat_alto', 'volumen_cat_alto', 'macd_cat_bajo', 'rsi_cat_bajo'],
+            'consecuentes': [
+                'proximo_retorno_cat_sube',
+                'volatilidad_cat_baja, proximo_retorno_cat_neutral',
+                'proximo_retorno_cat_baja',
+                'volatilidad_cat_alta',
+            ],
+            'soporte': [0.1, 0.2, 0.15, 0.3],
+            'confianza': [0.6, 0.7, 0.8, 0.9],
+            'lift': [1.2, 1.5, 1.1, 1.3],
+        })
+    
+    def test_evaluar_reglas(self, evaluador, reglas):
+        """Probar las estadísticas de las reglas predictivas"""
+        resultados = evaluador.evaluar_reglas(reglas)
+        
+        assert resultados['num_reglas'] == 4
+        assert resultados['num_reglas_pred'] == 3
+        assert resultados['confianza_promedio_pred'] == pytest.approx(0.7)
+        # "volatilidad_cat_baja, proximo_retorno_cat_neutral" cuenta para "baja" y "neutral"
+        assert resultados['num_reglas_sube'] == 1
+        assert resultados['num_reglas_baja'] == 2
+        assert resultados['num_reglas_neutral'] == 1
+        assert resultados['confianza_promedio_baja'] == pytest.approx(0.75)
+    
+    def test_evaluar_reglas_no_modifica_entrada(self, evaluador, reglas):
+        """Probar que evaluar las reglas no añade columnas a la tabla del llamador"""
+        original = reglas.copy()
+        
+        evaluador.evaluar_reglas(reglas)
+        
+        pd.testing.assert_frame_equal(reglas, original)
+        
+        # Con otros consecuentes las estadísticas se recalculan
+        reglas['consecuentes'] = 'proximo_retorno_cat_sube'
+        resultados = evaluador.evaluar_reglas(reglas)
+        assert resultados['num_reglas_sube'] == 4
+    
+    @pytest.fixture
+    def precios(self):
+        """Fixture con una serie de precios fija: empieza bajando (venta inicial sin posición)
+        y termina subiendo (posición abierta al final)"""
+        close = [100, 98, 96, 94, 95, 97, 99, 102, 101, 98, 95, 93, 94, 96, 99, 103, 106, 108]
+        return pd.DataFrame({'close': np.array(close, dtype=float)},
+                            index=pd.date_range('2024-01-01', periods=len(close), freq='D'))
+    
+    def test_estrategia_sma_igual_a_referencia(self, evaluador, precios):
+        """Probar que la estrategia de medias móviles vectorizada coincide con el recorrido fila a fila"""
+        rentabilidad, operaciones = evaluador._calcular_estrategia_sma(precios, ventana_corta=2, ventana_larga=4)
+        esperado, operaciones_esperadas = _estrategia_sma_referencia(precios, config.PARAMETROS, 2, 4)
+        
+        assert operaciones == operaciones_esperadas == 3
+        assert rentabilidad == pytest.approx(esperado)
+        assert list(precios.columns) == ['close']
+    
+    def test_estrategia_anomalias_igual_a_referencia(self, evaluador, precios):
+        """Probar que la simulación compilada de anomalías coincide con el recorrido fila a fila"""
+        # Señales solapadas, una señal el mismo día de la venta, fechas sin probabilidad
+        # y una compra en los últimos días (posición abierta al final)
+        prob = [0.9, 0.8, 0.1, 0.75, 0.2, 0.95, 0.1, 0.1, 0.9, 0.1, 0.1, 0.3, 0.1, 0.1, 0.99, 0.9]
+        df_anomalias = pd.DataFrame({'prob_anomalia': prob}, index=precios.index[:len(prob)])
+        
+        resultado = evaluador._calcular_estrategia_anomalias(precios, df_anomalias)
+        esperado = _estrategia_anomalias_referencia(precios, df_anomalias, config.PARAMETROS)
+        
+        assert resultado[1] == esperado[1] == 5
+        assert resultado[0] == pytest.approx(esperado[0])
+    
+    def test_estrategia_anomalias_indice_duplicado(self, evaluador, precios):
+        """Probar que las etiquetas duplicadas en las anomalías se alinean como en el merge original"""
+        df_anomalias = pd.DataFrame({'prob_anomalia': [0.9, 0.95, 0.1, 0.8]},
+                                    index=precios.index[[2, 2, 9, 12]])
+        
+        resultado = evaluador._calcular_estrategia_anomalias(precios, df_anomalias)
+        esperado = _estrategia_anomalias_referencia(precios, df_anomalias, config.PARAMETROS)
+        
+        assert resultado[1] == esperado[1]
+        assert resultado[0] == pytest.approx(esperado[0])
@@ -3,6 +3,7 @@ Pruebas unitarias para el módulo de extracción de datos
 """
 
 import os
+import json
 import pytest
 import pandas as pd
 import numpy as np
@@ -12,6 +13,14 @@ from unittest.mock import patch, MagicMock
 # Importar el módulo a probar
 from src.extraccion_datos.extractor import Extractor
 
+def _respuesta_api(payload):
+    """Crea una respuesta HTTP simulada con el cuerpo JSON indicado"""
+    respuesta = MagicMock()
+    respuesta.content = json.dumps(payload).encode()
+    respuesta.json.return_value = payload
+    respuesta.raise_for_status = MagicMock()
+    return respuesta
+
 class TestExtractor:
     """
     Pruebas para la clase Extractor
@@ -64,25 +73,23 @@ class TestExtractor:
         datos = extractor._generar_datos_sinteticos(fecha_inicio, fecha_fin)
         
         # Verificar que se generan los datos correctos
+        assert isinstance(datos, pd.DataFrame)
         assert len(datos) == 8  # 7 días + 1 (el día final)
-        for dato in datos:
-            assert all(k in dato for k in ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'market_cap'])
-            assert dato['high'] >= dato['low']  # High debe ser mayor o igual que low
+        assert all(k in datos.columns for k in ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'market_cap'])
+        assert (datos['high'] >= datos['low']).all()  # High debe ser mayor o igual que low
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_extraer_datos_historicos_api_valida(self, mock_get, extractor, fechas_test, datos_ejemplo):
         """Probar la extracción de datos históricos con API válida"""
         fecha_inicio, fecha_fin = fechas_test
         
         # Configurar el mock para simular respuesta de API exitosa
-        mock_response = MagicMock()
-        mock_response.json.return_value = [
+        mock_response = _respuesta_api([
             # [timestamp_ms, open, high, low, close, volume, close_time, ...]
             [int(d['timestamp']) * 1000, d['open'], d['high'], d['low'], d['close'], d['volume'], 
              int(d['timestamp']) * 1000 + 999999, 0, 0, 0, 0, 0] 
             for d in datos_ejemplo
-        ]
-        mock_response.raise_for_status = MagicMock()
+        ])
         mock_get.return_value = mock_response
         
         # Modificar la clave API para que no sea la predeterminada
@@ -102,6 +109,48 @@ class TestExtractor:
         assert 'close' in df.columns
         assert 'volume' in df.columns
     
+    @patch('src.extraccion_datos.extractor.orjson', None)
+    @patch('requests.Session.get')
+    def test_extraer_datos_historicos_sin_orjson(self, mock_get, extractor, fechas_test, datos_ejemplo):
+        """Probar que sin orjson se decodifica la respuesta con el JSON de requests"""
+        fecha_inicio, fecha_fin = fechas_test
+        
+        mock_response = _respuesta_api([
+            [int(d['timestamp']) * 1000, d['open'], d['high'], d['low'], d['close'], d['volume'],
+             int(d['timestamp']) * 1000 + 999999, 0, 0, 0, 0, 0]
+            for d in datos_ejemplo
+        ])
+        mock_get.return_value = mock_response
+        extractor.api_key = "valid_api_key"
+        
+        df = extractor.extraer_datos_historicos(fecha_inicio, fecha_fin, "BTC")
+        
+        mock_response.json.assert_called()
+        assert len(df) == len(datos_ejemplo)
+    
+    @patch('requests.Session.get')
+    def test_extraer_datos_historicos_cache_klines(self, mock_get, fechas_test, datos_ejemplo, tmpdir):
+        """Probar que una segunda extracción idéntica se sirve desde la caché en disco"""
+        fecha_inicio, fecha_fin = fechas_test
+        
+        # Velas ya cerradas (close_time de hace más de un día)
+        mock_response = _respuesta_api([
+            [int(d['timestamp']) * 1000, d['open'], d['high'], d['low'], d['close'], d['volume'],
+             int(d['timestamp'] - 2 * 86400) * 1000, 0, 0, 0, 0, 0]
+            for d in datos_ejemplo
+        ])
+        mock_get.return_value = mock_response
+        
+        extractor = Extractor("valid_api_key", "https://api.basescan.org", 5, cache_dir=str(tmpdir))
+        df_api = extractor.extraer_datos_historicos(fecha_inicio, fecha_fin, "BTC")
+        llamadas = mock_get.call_count
+        df_cache = extractor.extraer_datos_historicos(fecha_inicio, fecha_fin, "BTC")
+        
+        # La segunda extracción no debe tocar la red
+        assert llamadas > 0
+        assert mock_get.call_count == llamadas
+        pd.testing.assert_frame_equal(df_api, df_cache)
+    
     def test_extraer_datos_historicos_api_invalida(self, extractor, fechas_test):
         """Probar la extracción de datos históricos con API inválida"""
         fecha_inicio, fecha_fin = fechas_test
@@ -118,20 +167,13 @@ class TestExtractor:
         assert 'close' in df.columns
         assert 'volume' in df.columns
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_extraer_datos_tiempo_real(self, mock_get, extractor):
         """Probar la extracción de datos en tiempo real"""
-        # Configurar mocks para las dos llamadas a la API
-        mock_price_response = MagicMock()
-        mock_price_response.json.return_value = {"price": "42000.50"}
-        mock_price_response.raise_for_status = MagicMock()
-        
-        mock_stats_response = MagicMock()
-        mock_stats_response.json.return_value = {"volume": "12345678.90", "priceChangePercent": "2.5"}
-        mock_stats_response.raise_for_status = MagicMock()
-        
-        # Configurar el mock para que devuelva diferentes respuestas en cada llamada
-        mock_get.side_effect = [mock_price_response, mock_stats_response]
+        # Configurar el mock: /ticker/24hr ya incluye el último precio
+        mock_get.return_value = _respuesta_api([
+            {"symbol": "BTCUSDT", "lastPrice": "42000.50", "volume": "12345678.90", "priceChangePercent": "2.5"}
+        ])
         
         # Modificar la clave API para que no sea la predeterminada
         extractor.api_key = "valid_api_key"
@@ -139,8 +181,10 @@ class TestExtractor:
         # Llamar a la función
         datos = extractor.extraer_datos_tiempo_real("BTC")
         
-        # Verificar que se llamó a la API correctamente
-        assert mock_get.call_count == 2
+        # Verificar que se hizo una única llamada a la API
+        assert mock_get.call_count == 1
+        args, kwargs = mock_get.call_args
+        assert args[0].endswith("/v1/ticker/24hr")
         
         # Verificar los datos devueltos
         assert datos['symbol'] == "BTC"
@@ -148,6 +192,32 @@ class TestExtractor:
         assert datos['volume_24h'] == 12345678.90
         assert datos['change_24h'] == 2.5
         assert 'timestamp' in datos
+        
+        # Una segunda consulta dentro del TTL se sirve desde la caché en memoria
+        assert extractor.extraer_datos_tiempo_real("BTC") == datos
+        assert mock_get.call_count == 1
+    
+    @patch('requests.Session.get')
+    def test_extraer_datos_tiempo_real_batch(self, mock_get, extractor):
+        """Probar la extracción en tiempo real de varias divisas en una sola solicitud"""
+        mock_response = _respuesta_api([
+            {"symbol": "BTCUSDT", "lastPrice": "42000.50", "volume": "100.0", "priceChangePercent": "2.5"},
+            {"symbol": "ETHUSDT", "lastPrice": "2200.25", "volume": "300.0", "priceChangePercent": "-1.0"}
+        ])
+        mock_get.return_value = mock_response
+        
+        extractor.api_key = "valid_api_key"
+        
+        datos = extractor.extraer_datos_tiempo_real_batch(["BTC", "ETH"])
+        
+        # Una única solicitud para todas las divisas
+        assert mock_get.call_count == 1
+        assert datos['BTC']['price'] == 42000.50
+        assert datos['ETH']['change_24h'] == -1.0
+        
+        # Las divisas ya consultadas se sirven desde la caché
+        assert extractor.extraer_datos_tiempo_real_batch(["ETH"])['ETH'] == datos['ETH']
+        assert mock_get.call_count == 1
     
     def test_guardar_y_cargar_datos(self, extractor, fechas_test, tmpdir):
         """Probar guardar y cargar datos de archivos"""
@@ -173,6 +243,26 @@ class TestExtractor:
         assert df_cargado.shape[0] == df.shape[0]
         assert all(col in df_cargado.columns for col in df.columns)
     
+    @pytest.mark.parametrize("extension", ["parquet", "feather"])
+    def test_guardar_y_cargar_datos_binarios(self, extractor, fechas_test, tmpdir, extension):
+        """Probar que los formatos columnares conservan datos, tipos e índice"""
+        extractor.api_key = "TU_CLAVE_API_AQUI"
+        df = extractor.extraer_datos_historicos(*fechas_test)
+        
+        archivo_test = os.path.join(tmpdir, f"test_data.{extension}")
+        extractor.guardar_datos(df, archivo_test)
+        df_cargado = extractor.cargar_datos(archivo_test)
+        
+        pd.testing.assert_frame_equal(df_cargado, df)
+    
+    def test_guardar_datos_directorio_actual(self, extractor, fechas_test, tmpdir):
+        """Probar que se puede guardar en una ruta sin directorio"""
+        df = pd.DataFrame(extractor._generar_datos_sinteticos(*fechas_test))
+        
+        with tmpdir.as_cwd():
+            extractor.guardar_datos(df, "test_data.csv")
+            assert os.path.exists("test_data.csv")
+    
     def test_cargar_datos_archivo_no_existente(self, extractor):
         """Probar cargar datos de un archivo que no existe"""
         with pytest.raises(FileNotFoundError):
@@ -0,0 +1,100 @@
+"""
+Pruebas unitarias para el módulo mejorado de extracción de datos
+"""
+
+import json
+import time
+import threading
+import http.server
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+# Importar el módulo a probar
+from src.extraccion_datos.extractor_mejorado import Extractor
+
+class _Manejador429(http.server.BaseHTTPRequestHandler):
+    """Servidor de prueba que responde siempre 429 con Retry-After: 0 y cuenta las solicitudes"""
+    solicitudes = 0
+    
+    def do_GET(self):
+        type(self).solicitudes += 1
+        self.send_response(429)
+        self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, *args):
+        pass
+
+class TestExtractorMejorado:
+    """
+    Pruebas para la clase Extractor mejorada
+    """
+    
+    @pytest.fixture
+    def extractor(self):
+        """Fixture que crea una instancia de Extractor para las pruebas"""
+        return Extractor("test_key", "https://api.basescan.org", 5, max_retries=1)
+    
+    def test_make_api_request_url_invalida(self):
+        """Probar que una URL sin esquema no rompe el manejo de errores (MissingSchema deriva de ValueError)"""
+        extractor = Extractor("test_key", "api.example.com", 5)
+        
+        assert extractor._make_api_request('/v1/ticker/price', {'symbol': 'BTCUSDT'}) is None
+    
+    @patch('requests.Session.get')
+    def test_make_api_request_json_invalido(self, mock_get, extractor):
+        """Probar que una respuesta que no es JSON devuelve None sin reintentar"""
+        respuesta = MagicMock()
+        respuesta.content = b'<html>error</html>'
+        respuesta.text = '<html>error</html>'
+        respuesta.json.side_effect = json.JSONDecodeError("Expecting value", respuesta.text, 0)
+        respuesta.raise_for_status = MagicMock()
+        mock_get.return_value = respuesta
+        
+        assert extractor._make_api_request('/v1/ticker/price', {'symbol': 'BTCUSDT'}) is None
+        assert mock_get.call_count == 1
+    
+    @pytest.fixture
+    def servidor_429(self):
+        """Fixture que levanta un servidor HTTP local que siempre responde 429"""
+        _Manejador429.solicitudes = 0
+        servidor = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Manejador429)
+        hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+        hilo.start()
+        yield f"http://127.0.0.1:{servidor.server_port}"
+        servidor.shutdown()
+        servidor.server_close()
+    
+    def test_make_api_request_429_sin_reintentos_de_urllib3(self, servidor_429):
+        """Probar que los 429 solo se reintentan en el bucle de la aplicación (1 + max_retries solicitudes)"""
+        extractor = Extractor("test_key", servidor_429, 100, max_retries=3)
+        
+        assert extractor._make_api_request('/v1/ticker/price', {'symbol': 'BTCUSDT'}) is None
+        assert _Manejador429.solicitudes == 4
+    
+    @pytest.fixture
+    def zona_horaria_madrid(self, monkeypatch):
+        """Fixture que fija una zona horaria local distinta de UTC durante la prueba"""
+        if not hasattr(time, 'tzset'):
+            pytest.skip("time.tzset no está disponible en esta plataforma")
+        monkeypatch.setenv('TZ', 'Europe/Madrid')
+        time.tzset()
+        yield
+        monkeypatch.undo()
+        time.tzset()
+    
+    def test_generar_datos_sinteticos_hora_local(self, extractor, zona_horaria_madrid):
+        """Probar que los timestamps sintéticos interpretan las fechas naive como hora local"""
+        fecha_inicio = datetime(2024, 1, 1, 12)
+        fecha_fin = datetime(2024, 1, 10, 11)
+        
+        df = extractor._generar_datos_sinteticos(fecha_inicio, fecha_fin)
+        
+        esperados = [int((fecha_inicio + timedelta(days=i)).timestamp()) for i in range(9)]
+        assert df['timestamp'].tolist() == esperados
+        assert esperados[0] == 1704106800
+        pd.testing.assert_index_equal(df.index, pd.DatetimeIndex(pd.to_datetime(np.array(esperados), unit='s'), name='fecha'))
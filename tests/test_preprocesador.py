@@ -102,6 +102,18 @@ class TestPreprocesador(unittest.TestCase):
         # Verificar que las etiquetas son correctas para RSI
         rsi_labels = df_discretizado['rsi_cat'].cat.categories.tolist()
         self.assertTrue(all(label in rsi_labels for label in ['bajo', 'medio', 'alto']))
+    
+    def test_guardar_cargar_parquet(self):
+        """Prueba que el formato Parquet conserva índice y categorías"""
+        import tempfile
+        df_discretizado = self.preprocesador.discretizar(self.preprocesador.procesar(self.df_test))
+        
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'discretizado.parquet')
+            self.preprocesador.guardar_datos(df_discretizado, ruta)
+            df_cargado = self.preprocesador.cargar_datos(ruta)
+        
+        pd.testing.assert_frame_equal(df_cargado, df_discretizado)
 
 if __name__ == '__main__':
     unittest.main()